@@ -0,0 +1 @@
+# Yönetim komutları (python -m app.commands.<komut> ile çalıştırılır)
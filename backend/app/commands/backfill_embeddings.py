@@ -0,0 +1,77 @@
+"""Etkin modelle üretilmemiş CV ve ilan embedding'lerini yeniden hesapla
+
+EMBEDDING_MODEL_NAME / EMBEDDING_MODEL_REVISION değiştirildikten sonra eski vektörler
+eşleştirmede kullanılmaz (STALE_EMBEDDING_POLICY). Bu komut onları id sırasıyla parça parça
+günceller; ilerleme her parçadan sonra kontrol noktasına yazılır ve yarıda kalırsa aynı komutla
+devam eder. Çalışan API süreçleri güncellenen kayıtları INDEX_REFRESH_INTERVAL içinde
+indekslerine alır; yeniden başlatma gerekmez.
+
+Kullanım:
+    python -m app.commands.backfill_embeddings [--table job cv] [--batch-size 64] [--max-rate 20] [--restart]
+"""
+import argparse
+import json
+import os
+
+from app.database import SessionLocal
+from app.services.embedding_backfill import TABLES, embedding_backfill
+from app.services.nlp_engine import nlp_engine
+
+
+def read_checkpoint(path: str) -> dict:
+    """Tablo → son id; başka bir model için yazılmış kontrol noktası yok sayılır"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    return data["last_ids"] if data.get("model_version") == nlp_engine.model_version else {}
+
+
+def write_checkpoint(path: str, last_ids: dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"model_version": nlp_engine.model_version, "last_ids": last_ids}, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eski embedding'leri etkin modelle yeniden hesapla")
+    parser.add_argument("--table", choices=TABLES, nargs="+", default=list(TABLES))
+    parser.add_argument("--batch-size", type=int, default=64, help="Transaction başına kayıt sayısı")
+    parser.add_argument("--max-rate", type=float, default=0.0, help="Saniyede en fazla kayıt (0 = sınırsız)")
+    parser.add_argument("--checkpoint", default="cache/backfill_embeddings.json")
+    parser.add_argument("--restart", action="store_true", help="Kontrol noktasını yok say, baştan başla")
+    args = parser.parse_args()
+
+    last_ids = {} if args.restart else read_checkpoint(args.checkpoint)
+    embedding_backfill.batch_size = args.batch_size
+    embedding_backfill.max_rows_per_second = args.max_rate
+    print(f"Etkin model: {nlp_engine.model_version}")
+
+    def on_batch(report):
+        last_ids[report.table] = report.last_id
+        write_checkpoint(args.checkpoint, last_ids)
+        print(f"{report.table}: {report.updated} kayıt güncellendi (id {report.last_id}), {report.rows_per_second:.1f} kayıt/sn")
+
+    db = SessionLocal()
+    try:
+        for table in args.table:
+            after_id = last_ids.get(table, 0)
+            stale = embedding_backfill.count_stale(db, table)
+            print(f"{table}: {stale} eski embedding" + (f", id {after_id} sonrasından devam ediliyor" if after_id else ""))
+            report = embedding_backfill.run(db, table, after_id=after_id, on_batch=on_batch)
+            print(f"{table}: {report.updated} kayıt, {report.elapsed:.1f} sn ({report.rows_per_second:.1f} kayıt/sn)")
+    except Exception as e:
+        print(f"Backfill durdu: {e}")
+        print("Aynı komutu tekrar çalıştırarak devam edebilirsiniz")
+        raise SystemExit(1)
+    finally:
+        db.close()
+
+    if os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()
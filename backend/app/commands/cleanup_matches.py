@@ -0,0 +1,28 @@
+"""Eski eşleştirme sonuçlarını sil
+
+Kullanım:
+    python -m app.commands.cleanup_matches [--days 30]
+"""
+import argparse
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.match_store import match_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eski eşleştirme sonuçlarını sil")
+    parser.add_argument("--days", type=int, default=settings.MATCH_RETENTION_DAYS,
+                        help="Bu kadar günden uzun süredir güncellenmemiş eşleşmeler silinir")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        deleted = match_store.cleanup(db, args.days)
+    finally:
+        db.close()
+    print(f"{deleted} eski eşleşme silindi ({args.days} günden eski)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Embedding worker sunucusunu başlat
+
+API süreçleri `EMBEDDING_SERVER_ADDRESS` ile bu sunucuya bağlanır; model her API
+sürecinde ayrı ayrı yüklenmez.
+
+Kullanım:
+    python -m app.commands.embedding_server [--workers 2] [--threads 1] [--address /tmp/cv-job-matcher-embed.sock]
+"""
+import argparse
+
+from app.config import settings
+from app.services.embedding_pool import EmbeddingWorkerPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding worker sunucusunu başlat")
+    parser.add_argument("--workers", type=int, default=settings.EMBEDDING_WORKERS)
+    parser.add_argument("--threads", type=int, default=settings.EMBEDDING_WORKER_THREADS,
+                        help="Worker başına torch thread sayısı (workers x threads <= çekirdek sayısı)")
+    parser.add_argument("--address", default=settings.EMBEDDING_SERVER_ADDRESS or "/tmp/cv-job-matcher-embed.sock")
+    args = parser.parse_args()
+
+    pool = EmbeddingWorkerPool(workers=args.workers, threads=args.threads)
+    pool.start()
+    try:
+        pool.serve(args.address)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""CV PDF'lerini bir dizinden veya zip/tar arşivinden toplu içe aktar
+
+PDF'ler süreç havuzunda parse edilir, embedding'ler batch'ler halinde hesaplanır ve her batch
+tek transaction'da yazılır. İşlenen dosyalar kontrol noktası dosyasına eklenir; komut yarıda
+kalırsa aynı komutla kaldığı yerden devam eder.
+
+Kullanım:
+    python -m app.commands.import_cvs cvler/ --user-email partner@ornek.com [--workers 4] [--batch-size 32] [--restart]
+"""
+import argparse
+import os
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.cv_import import cv_importer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CV PDF'lerini toplu içe aktar")
+    parser.add_argument("path", help="PDF dizini veya zip/tar arşivi")
+    owner = parser.add_mutually_exclusive_group(required=True)
+    owner.add_argument("--user-id", type=int, help="CV'lerin sahibi kullanıcı id'si")
+    owner.add_argument("--user-email", help="CV'lerin sahibi kullanıcının e-postası")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="PDF parse süreç sayısı")
+    parser.add_argument("--batch-size", type=int, default=32, help="Transaction başına CV sayısı")
+    parser.add_argument("--checkpoint", default=None, help="Varsayılan: <yol>.checkpoint")
+    parser.add_argument("--restart", action="store_true", help="Kontrol noktasını yok say, baştan başla")
+    args = parser.parse_args()
+
+    checkpoint = args.checkpoint or f"{args.path.rstrip(os.sep)}.checkpoint"
+    if args.restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    def on_batch(report):
+        print(
+            f"{report.imported} CV eklendi, {report.failed} hatalı, "
+            f"{report.cvs_per_second:.1f} CV/sn, {report.pages_per_second:.1f} sayfa/sn"
+        )
+
+    cv_importer.workers = args.workers
+    cv_importer.batch_size = args.batch_size
+    db = SessionLocal()
+    try:
+        query = db.query(User)
+        user = query.filter(User.id == args.user_id).first() if args.user_id else \
+            query.filter(User.email == args.user_email).first()
+        if not user:
+            print("Kullanıcı bulunamadı")
+            raise SystemExit(1)
+        report = cv_importer.run(db, args.path, user.id, checkpoint=checkpoint, on_batch=on_batch)
+    except (OSError, ValueError) as e:
+        print(f"İçe aktarma durdu: {e}")
+        print("Aynı komutu tekrar çalıştırarak devam edebilirsiniz")
+        raise SystemExit(1)
+    finally:
+        db.close()
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    if report.skipped:
+        print(f"Kontrol noktasından devam edildi: {report.skipped} dosya atlandı")
+    print(
+        f"Tamamlandı: {report.imported} CV eklendi, {report.failed} hatalı PDF, {report.pages} sayfa, "
+        f"{report.elapsed:.1f} sn ({report.cvs_per_second:.1f} CV/sn, {report.pages_per_second:.1f} sayfa/sn)"
+    )
+    for error in report.errors[:20]:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""İş ilanlarını JSONL veya CSV dosyasından toplu içe aktar
+
+Her satır/kayıt title, description ve isteğe bağlı company, location, requirements alanlarını
+içerir. İlerleme her parçadan sonra kontrol noktası dosyasına yazılır; komut yarıda kalırsa
+aynı komutla kaldığı yerden devam eder.
+
+Kullanım:
+    python -m app.commands.ingest_jobs ilanlar.jsonl [--format jsonl|csv] [--chunk-size 512] [--restart]
+"""
+import argparse
+import json
+import os
+
+from app.database import SessionLocal
+from app.services.job_ingest import JobIngestor, IngestError, iter_job_records
+
+
+def read_checkpoint(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return json.load(f)["offset"]
+
+
+def write_checkpoint(path: str, report):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"offset": report.offset, "inserted": report.inserted}, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İş ilanlarını toplu içe aktar")
+    parser.add_argument("path", help="JSONL veya CSV dosyası")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Varsayılan: dosya uzantısı")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Transaction başına ilan sayısı")
+    parser.add_argument("--embed-batch-size", type=int, default=32)
+    parser.add_argument("--checkpoint", default=None, help="Varsayılan: <dosya>.checkpoint")
+    parser.add_argument("--restart", action="store_true", help="Kontrol noktasını yok say, baştan başla")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    checkpoint = args.checkpoint or f"{args.path}.checkpoint"
+    skip = 0 if args.restart else read_checkpoint(checkpoint)
+    if skip:
+        print(f"Kontrol noktasından devam ediliyor: {skip} kayıt atlanıyor")
+
+    def on_chunk(report):
+        write_checkpoint(checkpoint, report)
+        print(f"{report.offset} kayıt işlendi, {report.inserted} ilan eklendi, {report.jobs_per_second:.1f} ilan/sn")
+
+    ingestor = JobIngestor(chunk_size=args.chunk_size, embed_batch_size=args.embed_batch_size)
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            report = ingestor.ingest(db, iter_job_records(stream, fmt), skip=skip, on_chunk=on_chunk)
+    except IngestError as e:
+        print(f"İçe aktarma {e.report.offset}. kayıttan sonra durdu: {e}")
+        print("Aynı komutu tekrar çalıştırarak devam edebilirsiniz")
+        raise SystemExit(1)
+    finally:
+        db.close()
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    print(
+        f"Tamamlandı: {report.inserted} ilan eklendi, {report.invalid} geçersiz kayıt, "
+        f"{report.elapsed:.1f} sn ({report.jobs_per_second:.1f} ilan/sn)"
+    )
+    for error in report.errors[:20]:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings
 
 
@@ -13,6 +15,75 @@ class Settings(BaseSettings):
     # Uygulama ayarları
     APP_NAME: str = "CV Job Matcher"
     DEBUG: bool = True
+    
+    # Eşleştirme sonuçlarının saklanması
+    MATCH_PERSIST_TOP_K: int = 100  # CV başına saklanan en iyi sonuç sayısı (0 = skorlanan tümü)
+    MATCH_RETENTION_DAYS: int = 30  # Bu süreden eski eşleşmeler temizlik komutuyla silinir
+    
+    # CV başına önbelleğe alınan öneriler
+    RECOMMENDATION_TOP_K: int = 100
+    RECOMMENDATION_CACHE_SIZE: int = 10000  # Bellekte tutulan CV sayısı (LRU)
+    
+    # CV işleme kuyruğu
+    CV_PIPELINE_WORKERS: int = 2
+    CV_PIPELINE_QUEUE_SIZE: int = 100  # Kuyruk doluysa yükleme 503 ile reddedilir
+    CV_PROCESSING_TIMEOUT: int = 600  # Bu süreden (saniye) uzun PROCESSING kalan CV açılışta yeniden kuyruğa alınır
+    
+    # CV yükleme sınırları; kuyruktaki CV'ler byte'larıyla bekler (bellek ~ kuyruk boyu x boyut sınırı)
+    CV_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    CV_MAX_PAGES: int = 100
+    CV_PARSE_PAGES_PER_TASK: int = 8  # Büyük PDF'ler bu kadar sayfalık aralıklarla parse worker'larına bölünür
+    
+    # CPU yoğun aşamalar için executor boyutları
+    PARSE_WORKERS: int = 2  # PDF parse süreç sayısı (0 = süreç havuzu kullanma)
+    EMBED_THREADS: int = 1  # Aynı anda çalışabilecek BERT çıkarımı sayısı
+    
+    # Embedding önbelleği (boş dizin = disk katmanı kapalı, 0 = bellek katmanı kapalı)
+    EMBEDDING_CACHE_DIR: str = "cache/embeddings"
+    EMBEDDING_CACHE_MEMORY_SIZE: int = 10000
+    
+    # Embedding modeli (Hugging Face adı veya yerel dizin) ve sabitlenecek sürüm (commit/etiket, boş = varsayılan dal)
+    EMBEDDING_MODEL_NAME: str = "dbmdz/bert-base-turkish-cased"
+    EMBEDDING_MODEL_REVISION: str = ""
+    # Etkin modelle üretilmemiş embedding'ler eşleştirmede: "fallback" = yalnızca yetenek skoruyla
+    # sıralanır (benzerlik 0), "ignore" = hiç aday olmaz. Güncellemek için: app.commands.backfill_embeddings
+    STALE_EMBEDDING_POLICY: str = "fallback"
+    
+    # Çıkarım backend'i: "fp32" ya da "int8" (Linear katmanları dinamik INT8 kuantize, yalnızca CPU)
+    EMBEDDING_BACKEND: str = "fp32"
+    QUANTIZED_MODEL_DIR: str = "cache/quantized"  # Kuantize ağırlıkların disk önbelleği
+    
+    # Ayrı embedding sunucusu (boş = çıkarım API sürecinde yapılır)
+    EMBEDDING_SERVER_ADDRESS: str = ""  # Unix soket yolu, ör. /tmp/cv-job-matcher-embed.sock
+    EMBEDDING_SERVER_AUTHKEY: str = ""  # Sunucu ile API süreçleri arasındaki paylaşılan anahtar (boş = SECRET_KEY)
+    EMBEDDING_WORKERS: int = 2  # Sunucudaki worker süreç sayısı
+    EMBEDDING_WORKER_THREADS: int = 1  # Worker başına torch thread sayısı
+    
+    # Model açılışta yüklenip ısıtılsın mı (/ready bu bitince hazır döner)
+    MODEL_PRELOAD: bool = False
+    MODEL_WARMUP_LENGTHS: List[int] = [32, 128, 512]  # Isınma geçişlerinin token uzunlukları
+    
+    # Uzun metinler için parçalı embedding ("truncate" = ilk 512 token, "chunked" = tüm metin)
+    EMBEDDING_MODE: str = "truncate"
+    EMBEDDING_CHUNK_OVERLAP: int = 64  # Ardışık pencereler arasındaki ortak token sayısı
+    EMBEDDING_CHUNK_BATCH_TOKENS: int = 4096  # Tek ileri geçişteki en fazla token (tepe belleği sınırlar)
+    EMBEDDING_MAX_CHUNKS: int = 64  # Belge başına en fazla pencere (fazlası belgeye eşit aralıkla yayılır)
+    EMBEDDING_POOLING: str = "mean"  # mean | max | section
+    EMBEDDING_SECTION_WEIGHTS: Dict[str, float] = {
+        'experience': 2.0, 'skills': 2.0, 'projects': 1.5, 'summary': 1.0,
+        'education': 1.0, 'certificates': 1.0, 'languages': 0.5
+    }  # "section" havuzlamada bölüm ağırlıkları (bölüm dışı metin = 1.0)
+    
+    # Yaklaşık en yakın komşu (IVF) indeks ayarları
+    ANN_ENABLED: bool = True
+    ANN_MIN_SIZE: int = 50000  # Bu sayıdan az ilan varsa tam tarama yapılır
+    ANN_NLIST: int = 0  # Küme sayısı (0 = otomatik, 4 * sqrt(N))
+    ANN_NPROBE: int = 16  # Sorguda taranan küme sayısı (yüksek = daha iyi recall, daha yavaş)
+    ANN_RETRAIN_FACTOR: float = 4.0  # İndeks eğitim anındaki boyutun bu katına ulaşınca yeniden eğit
+    
+    # Bellek içi indekslerin diğer süreçlerin (worker'lar, CLI komutları) değişikliklerini kontrol etme
+    # aralığı (saniye, 0 = her aramadan önce); başka süreçte eklenen/silinen kayıtlar en geç bu kadar gecikir
+    INDEX_REFRESH_INTERVAL: float = 2.0
 
     class Config:
         env_file = ".env"
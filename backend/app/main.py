@@ -1,8 +1,19 @@
-from fastapi import FastAPI
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, Base, SessionLocal
+from app.services.embedding_index import load_job_index, load_cv_index
+from app.services.embedding_cache import embedding_cache
+from app.services.cv_pipeline import cv_pipeline
+from app.services.executors import executors
+from app.services.nlp_engine import nlp_engine
+from app.services.embedding_pool import connect_remote
+from app.services.skill_dictionary import skill_dictionary
+from app.services.metrics import metrics
 
 # Modelleri import et (tabloların oluşması için gerekli)
 from app.models.user import User
@@ -17,11 +28,43 @@ from app.routers.job import router as jobs_router
 # Tabloları oluştur
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Parse süreçleri model ve worker thread'leri yüklenmeden önce oluşturulur
+    executors.start()
+    # Ayarlıysa BERT çıkarımı ayrı embedding sunucusunda yapılır
+    connect_remote()
+    
+    # İş ilanı ve CV embedding indekslerini açılışta bir kez yükle
+    db = SessionLocal()
+    try:
+        load_job_index(db)
+        load_cv_index(db)
+        skill_dictionary.warm(db)
+        # CV işleme worker'larını başlat, yarım kalan CV'leri kuyruğa geri al
+        cv_pipeline.start()
+        cv_pipeline.recover(db)
+    finally:
+        db.close()
+    
+    # Model isteğe bağlı olarak arka planda yüklenip ısıtılır; bitene kadar /ready 503 döner
+    if settings.MODEL_PRELOAD:
+        threading.Thread(
+            target=nlp_engine.preload, args=(settings.MODEL_WARMUP_LENGTHS,), name="model-preload", daemon=True
+        ).start()
+    yield
+    cv_pipeline.stop()
+    executors.shutdown()
+    embedding_cache.flush()
+
+
 # FastAPI uygulaması
 app = FastAPI(
     title=settings.APP_NAME,
     description="CV ve İş İlanı Eşleştirme API'si",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS ayarları (React frontend için)
@@ -44,10 +87,27 @@ def root():
     return {
         "message": "CV Job Matcher API'sine Hoş Geldiniz!",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/ready",
+        "metrics": "/metrics"
     }
 
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+def readiness_check():
+    """Trafik alınabilir mi: MODEL_PRELOAD açıksa model yüklenip ısınana kadar 503 döner"""
+    if settings.MODEL_PRELOAD and not nlp_engine.is_warm:
+        content = {"status": "failed", "error": nlp_engine.load_error} if nlp_engine.load_error else {"status": "starting"}
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=content)
+    return {"status": "ready"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Aşama süreleri ve sayaçlar (Prometheus metin formatı)"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1 @@
+# Veritabanı migration'ları (python -m app.migrations.<modül> ile çalıştırılır)
@@ -0,0 +1,92 @@
+"""CV.embedding / Job.embedding sütunlarını JSON metinden ham float32 byte'lara dönüştür
+
+Kullanım:
+    python -m app.migrations.m001_binary_embeddings
+"""
+import json
+from sqlalchemy import inspect, text, LargeBinary, bindparam
+
+from app.database import engine
+from app.utils.embedding import encode_embedding
+
+# Mevcut satırları üreten model (önceden NLPEngine içinde sabit)
+LEGACY_MODEL_NAME = "dbmdz/bert-base-turkish-cased"
+BATCH_SIZE = 500
+
+
+def _load_json_vector(value):
+    """JSON sütunundaki değeri float listesine çevir (eski kayıtlar json.dumps ile iki kez kodlanmış)"""
+    while isinstance(value, (str, bytes)):
+        value = json.loads(value)
+    return value or None
+
+
+def migrate_table(table: str):
+    """Tek tablonun embedding sütununu binary formata taşı"""
+    inspector = inspect(engine)
+    if not inspector.has_table(table):
+        print(f"{table}: tablo yok, atlandı")
+        return
+    columns = {col['name']: col for col in inspector.get_columns(table)}
+    binary_type = LargeBinary().compile(dialect=engine.dialect)
+
+    with engine.begin() as conn:
+        if 'embedding_dim' not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN embedding_dim INTEGER"))
+        if 'embedding_model' not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN embedding_model VARCHAR(255)"))
+
+        if 'embedding_json' not in columns:
+            if isinstance(columns['embedding']['type'], LargeBinary):
+                print(f"{table}: zaten binary formatta")
+                return
+            conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN embedding TO embedding_json"))
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN embedding {binary_type}"))
+
+    update = text(
+        f"UPDATE {table} SET embedding = :embedding, embedding_dim = :dim, embedding_model = :model "
+        f"WHERE id = :id"
+    ).bindparams(bindparam('embedding', type_=LargeBinary))
+
+    converted = 0
+    last_id = 0
+    while True:
+        # Her parti ayrı transaction: yarıda kesilirse kaldığı yerden devam eder
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT id, embedding_json FROM {table} "
+                    f"WHERE id > :last_id AND embedding IS NULL ORDER BY id LIMIT :limit"
+                ),
+                {'last_id': last_id, 'limit': BATCH_SIZE}
+            ).fetchall()
+            if not rows:
+                break
+
+            params = []
+            for row_id, raw in rows:
+                vector = _load_json_vector(raw)
+                if vector:
+                    params.append({
+                        'id': row_id,
+                        'embedding': encode_embedding(vector),
+                        'dim': len(vector),
+                        'model': LEGACY_MODEL_NAME
+                    })
+            if params:
+                conn.execute(update, params)
+            converted += len(params)
+            last_id = rows[-1][0]
+
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table} DROP COLUMN embedding_json"))
+    print(f"{table}: {converted} embedding dönüştürüldü")
+
+
+def main():
+    for table in ("cvs", "jobs"):
+        migrate_table(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""cvs tablosuna işleme durumu (status) ve hata mesajı (processing_error) sütunlarını ekle
+
+Kullanım:
+    python -m app.migrations.m002_cv_status
+"""
+from sqlalchemy import inspect, text
+
+from app.database import engine
+from app.models.cv import CV
+
+
+def main():
+    inspector = inspect(engine)
+    if not inspector.has_table("cvs"):
+        print("cvs: tablo yok, atlandı")
+        return
+    columns = {col['name'] for col in inspector.get_columns("cvs")}
+
+    with engine.begin() as conn:
+        if 'status' not in columns:
+            status_type = CV.__table__.c.status.type
+            # PostgreSQL'de enum tipi ayrıca oluşturulmalı
+            if engine.dialect.name == "postgresql":
+                status_type.create(conn, checkfirst=True)
+            conn.execute(text(f"ALTER TABLE cvs ADD COLUMN status {status_type.compile(dialect=engine.dialect)}"))
+            # Mevcut CV'ler senkron işlenmişti, hepsi hazır
+            conn.execute(text("UPDATE cvs SET status = 'READY'"))
+        if 'processing_error' not in columns:
+            conn.execute(text("ALTER TABLE cvs ADD COLUMN processing_error TEXT"))
+    print("cvs: status sütunları hazır")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""matches tablosunda (cv_id, job_id) tekilliğini sağla ve updated_at sütununu ekle
+
+Önceki sürüm her eşleştirmede yeni satır eklediği için her çift için yalnızca en son
+satır tutulur.
+
+Kullanım:
+    python -m app.migrations.m003_match_unique
+"""
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+
+def main():
+    inspector = inspect(engine)
+    if not inspector.has_table("matches"):
+        print("matches: tablo yok, atlandı")
+        return
+    columns = {col['name'] for col in inspector.get_columns("matches")}
+    indexes = {idx['name'] for idx in inspector.get_indexes("matches")}
+    constraints = {uc['name'] for uc in inspector.get_unique_constraints("matches")}
+
+    with engine.begin() as conn:
+        if 'updated_at' not in columns:
+            conn.execute(text("ALTER TABLE matches ADD COLUMN updated_at TIMESTAMP"))
+            conn.execute(text("UPDATE matches SET updated_at = created_at"))
+
+        if 'uq_matches_cv_job' not in indexes | constraints:
+            deleted = conn.execute(text(
+                "DELETE FROM matches WHERE id NOT IN "
+                "(SELECT MAX(id) FROM matches GROUP BY cv_id, job_id)"
+            )).rowcount
+            conn.execute(text("CREATE UNIQUE INDEX uq_matches_cv_job ON matches (cv_id, job_id)"))
+            print(f"matches: {deleted} tekrarlanan satır silindi")
+    print("matches: (cv_id, job_id) tekil")
+
+
+if __name__ == "__main__":
+    main()
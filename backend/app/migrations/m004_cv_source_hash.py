@@ -0,0 +1,32 @@
+"""cvs tablosuna source_hash sütununu ve (user_id, source_hash) tekilliğini ekle
+
+Toplu CV içe aktarma, yarıda kalıp devam ettirildiğinde aynı dosyayı ikinci kez
+eklememek için bu sütunu kullanır. API ile yüklenen CV'lerde sütun boş kalır.
+
+Kullanım:
+    python -m app.migrations.m004_cv_source_hash
+"""
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+
+def main():
+    inspector = inspect(engine)
+    if not inspector.has_table("cvs"):
+        print("cvs: tablo yok, atlandı")
+        return
+    columns = {col['name'] for col in inspector.get_columns("cvs")}
+    indexes = {idx['name'] for idx in inspector.get_indexes("cvs")}
+    constraints = {uc['name'] for uc in inspector.get_unique_constraints("cvs")}
+
+    with engine.begin() as conn:
+        if 'source_hash' not in columns:
+            conn.execute(text("ALTER TABLE cvs ADD COLUMN source_hash VARCHAR(64)"))
+        if 'uq_cvs_user_source' not in indexes | constraints:
+            conn.execute(text("CREATE UNIQUE INDEX uq_cvs_user_source ON cvs (user_id, source_hash)"))
+    print("cvs: (user_id, source_hash) tekil")
+
+
+if __name__ == "__main__":
+    main()
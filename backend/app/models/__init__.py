@@ -1,3 +1,3 @@
 from app.models.user import User
-from app.models.cv import CV
+from app.models.cv import CV, CVStatus
 from app.models.job import Job, Skill, CVSkill, JobSkill, Match
\ No newline at end of file
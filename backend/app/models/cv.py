@@ -1,12 +1,23 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, LargeBinary, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import enum
 
 from app.database import Base
 
 
+class CVStatus(enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class CV(Base):
     __tablename__ = "cvs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "source_hash", name="uq_cvs_user_source"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -14,7 +25,12 @@ class CV(Base):
     file_name = Column(String(255))
     raw_text = Column(Text)
     parsed_data = Column(JSON)
-    embedding = Column(JSON)  # BERT embedding vektörü
+    embedding = Column(LargeBinary)  # BERT embedding vektörü (ham float32 byte'ları)
+    embedding_dim = Column(Integer)
+    embedding_model = Column(String(255))  # Embedding'i üreten model
+    status = Column(Enum(CVStatus), default=CVStatus.READY, nullable=False)
+    processing_error = Column(Text)
+    source_hash = Column(String(64))  # Toplu içe aktarılan dosyanın SHA-256'sı (aynı dosya iki kez eklenmez)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
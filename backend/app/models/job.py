@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -14,7 +14,9 @@ class Job(Base):
     location = Column(String(255))
     description = Column(Text)
     requirements = Column(Text)
-    embedding = Column(JSON)  # BERT embedding vektörü
+    embedding = Column(LargeBinary)  # BERT embedding vektörü (ham float32 byte'ları)
+    embedding_dim = Column(Integer)
+    embedding_model = Column(String(255))  # Embedding'i üreten model
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -64,6 +66,9 @@ class JobSkill(Base):
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        UniqueConstraint("cv_id", "job_id", name="uq_matches_cv_job"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cv_id = Column(Integer, ForeignKey("cvs.id"), nullable=False)
@@ -71,6 +76,7 @@ class Match(Base):
     similarity_score = Column(Float, nullable=False)
     skill_match_score = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # İlişkiler
     cv = relationship("CV", back_populates="matches")
@@ -1,17 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 import os
-import json
+import queue
+import uuid
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
-from app.models.cv import CV
+from app.models.cv import CV, CVStatus
 from app.models.job import Skill, CVSkill
-from app.schemas.cv import CVResponse, CVDetail
+from app.schemas.cv import CVResponse, CVDetail, CVStatusResponse
 from app.utils.auth import get_current_user
-from app.services.cv_parser import cv_parser
-from app.services.nlp_engine import nlp_engine
+from app.services.cv_pipeline import cv_pipeline
+from app.services.recommendation_cache import recommendation_cache
+from app.services.embedding_index import cv_index
+from app.services.metrics import stage_seconds
 
 router = APIRouter(prefix="/api/cv", tags=["CV"])
 
@@ -20,13 +25,38 @@ UPLOAD_DIR = "uploads/cvs"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
-@router.post("/upload", response_model=CVResponse)
+def _store_upload(db: Session, user_id: int, file_name: str, file_path: str, content: bytes) -> CV:
+    """Dosyayı diske yaz ve CV kaydını "pending" olarak oluştur (işleme arka planda yapılır)"""
+    with open(file_path, "wb") as f:
+        f.write(content)
+    
+    new_cv = CV(
+        user_id=user_id,
+        file_path=file_path,
+        file_name=file_name,
+        status=CVStatus.PENDING
+    )
+    db.add(new_cv)
+    db.commit()
+    db.refresh(new_cv)
+    return new_cv
+
+
+def _discard_upload(db: Session, cv: CV):
+    """Kuyruğa alınamayan yüklemeyi geri al"""
+    db.delete(cv)
+    db.commit()
+    if os.path.exists(cv.file_path):
+        os.remove(cv.file_path)
+
+
+@router.post("/upload", response_model=CVResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_cv(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """CV dosyası yükle ve analiz et"""
+    """CV dosyası yükle ve analiz için kuyruğa al"""
     # Dosya uzantısı kontrolü
     allowed_extensions = [".pdf"]
     file_ext = os.path.splitext(file.filename)[1].lower()
@@ -36,63 +66,30 @@ async def upload_cv(
             detail="Şu anda sadece PDF dosyaları kabul edilmektedir"
         )
     
-    # Dosyayı kaydet
-    file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{file.filename}")
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
-    # CV'yi parse et
-    try:
-        parsed_data = cv_parser.parse_cv(file_path)
-    except Exception as e:
-        os.remove(file_path)
+    # Dosyayı kaydet (aynı isimli bekleyen yüklemeler birbirini ezmesin)
+    file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{uuid.uuid4().hex}_{file.filename}")
+    with stage_seconds.time(operation="upload_cv", stage="read_upload"):
+        content = await file.read(settings.CV_MAX_UPLOAD_BYTES + 1)
+    if len(content) > settings.CV_MAX_UPLOAD_BYTES:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"CV işlenirken hata oluştu: {str(e)}"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Dosya boyutu en fazla {settings.CV_MAX_UPLOAD_BYTES // (1024 * 1024)} MB olabilir"
         )
     
-    # Yetenekleri çıkar
-    skills = nlp_engine.extract_skills(parsed_data['raw_text'])
+    # Disk ve veritabanı işlemleri event loop'u bloklamasın diye thread havuzunda çalışır
+    # (parse, yetenek, embedding ve kayıt aşamaları işleme hattında ölçülür)
+    with stage_seconds.time(operation="upload_cv", stage="store"):
+        new_cv = await run_in_threadpool(_store_upload, db, current_user.id, file.filename, file_path, content)
     
-    # BERT embedding oluştur
     try:
-        embedding = nlp_engine.get_embedding(parsed_data['raw_text'])
-    except Exception as e:
-        embedding = []
-    
-    # Veritabanına kaydet
-    new_cv = CV(
-        user_id=current_user.id,
-        file_path=file_path,
-        file_name=file.filename,
-        raw_text=parsed_data['raw_text'],
-        parsed_data=json.dumps(parsed_data, ensure_ascii=False),
-        embedding=json.dumps(embedding)
-    )
-    db.add(new_cv)
-    db.commit()
-    db.refresh(new_cv)
-    
-    # Yetenekleri kaydet
-    for skill_data in skills:
-        # Skill var mı kontrol et
-        skill = db.query(Skill).filter(Skill.name == skill_data['name']).first()
-        if not skill:
-            skill = Skill(name=skill_data['name'], normalized_name=skill_data['name'].lower())
-            db.add(skill)
-            db.commit()
-            db.refresh(skill)
-        
-        # CV-Skill ilişkisi
-        cv_skill = CVSkill(
-            cv_id=new_cv.id,
-            skill_id=skill.id,
-            confidence_score=skill_data['confidence']
+        # Parse işlemi diske yazılan dosyayı yeniden okumaz, bellekteki byte'ları kullanır
+        cv_pipeline.submit(new_cv.id, content)
+    except queue.Full:
+        await run_in_threadpool(_discard_upload, db, new_cv)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="CV işleme kuyruğu dolu, lütfen daha sonra tekrar deneyin"
         )
-        db.add(cv_skill)
-    
-    db.commit()
     
     return new_cv
 
@@ -123,6 +120,22 @@ def get_cv_detail(
     return cv
 
 
+@router.get("/{cv_id}/status", response_model=CVStatusResponse)
+def get_cv_status(
+    cv_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """CV'nin işlenme durumunu getir"""
+    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
+    if not cv:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV bulunamadı"
+        )
+    return {'cv_id': cv.id, 'status': cv.status, 'error': cv.processing_error}
+
+
 @router.get("/{cv_id}/skills")
 def get_cv_skills(
     cv_id: int,
@@ -137,12 +150,11 @@ def get_cv_skills(
             detail="CV bulunamadı"
         )
     
-    skills = []
-    for cv_skill in cv.skills:
-        skills.append({
-            'name': cv_skill.skill.name,
-            'confidence': cv_skill.confidence_score
-        })
+    # Yetenek adları tek JOIN sorgusuyla
+    rows = db.query(Skill.name, CVSkill.confidence_score).join(
+        CVSkill, CVSkill.skill_id == Skill.id
+    ).filter(CVSkill.cv_id == cv_id).all()
+    skills = [{'name': name, 'confidence': confidence} for name, confidence in rows]
     
     return {'cv_id': cv_id, 'skills': skills}
 
@@ -169,4 +181,7 @@ def delete_cv(
     db.delete(cv)
     db.commit()
     
+    cv_index.remove(cv_id)
+    recommendation_cache.invalidate(cv_id)
+    
     return {"message": "CV başarıyla silindi"}
\ No newline at end of file
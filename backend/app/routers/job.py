@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import List
-import json
+from typing import List, Optional
 
 from app.database import get_db
-from app.models.user import User
-from app.models.cv import CV
-from app.models.job import Job, Skill, JobSkill, Match
+from app.models.user import User, UserRole
+from app.models.cv import CV, CVStatus
+from app.config import settings
+from app.models.job import Job, Skill, CVSkill, JobSkill
 from app.schemas.job import JobCreate, JobResponse, JobDetail
-from app.utils.auth import get_current_user
+from app.utils.auth import get_current_user, require_roles
+from app.utils.embedding import encode_embedding, decode_embedding
 from app.services.nlp_engine import nlp_engine
-from app.services.matcher import matcher
+from app.services.embedding_index import job_index, cv_index, job_index_sync, cv_index_sync
+from app.services.executors import executors
+from app.services.match_store import match_store
+from app.services.metrics import stage_seconds
+from app.services.skill_dictionary import skill_dictionary
+from app.services.recommendation_cache import recommendation_cache
+from app.services.job_ingest import job_ingestor, iter_job_records, IngestError
 
 router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
 
+# Tek IN listesindeki en fazla ilan id'si (SQLite bağlı değişken sınırı, Postgres plan maliyeti)
+JOB_LOAD_CHUNK = 1000
+
 
 @router.post("/", response_model=JobResponse)
 def create_job(
@@ -24,45 +34,77 @@ def create_job(
     """Yeni iş ilanı oluştur"""
     job_text = f"{job_data.title} {job_data.description} {job_data.requirements or ''}"
     
-    skills = nlp_engine.extract_skills(job_text)
+    with stage_seconds.time(operation="create_job", stage="skills"):
+        skills = nlp_engine.extract_skills(job_text)
     
     try:
-        embedding = nlp_engine.get_embedding(job_text)
+        with stage_seconds.time(operation="create_job", stage="embedding"):
+            embedding = executors.embed(nlp_engine.get_embedding, job_text)
     except Exception as e:
-        embedding = []
-    
-    new_job = Job(
-        title=job_data.title,
-        company=job_data.company,
-        location=job_data.location,
-        description=job_data.description,
-        requirements=job_data.requirements,
-        embedding=json.dumps(embedding)
-    )
-    db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
-    
-    for skill_data in skills:
-        skill = db.query(Skill).filter(Skill.name == skill_data['name']).first()
-        if not skill:
-            skill = Skill(name=skill_data['name'], normalized_name=skill_data['name'].lower())
-            db.add(skill)
-            db.commit()
-            db.refresh(skill)
-        
-        job_skill = JobSkill(
-            job_id=new_job.id,
-            skill_id=skill.id,
-            importance=skill_data['confidence']
+        embedding = None
+    
+    with stage_seconds.time(operation="create_job", stage="db_write"):
+        new_job = Job(
+            title=job_data.title,
+            company=job_data.company,
+            location=job_data.location,
+            description=job_data.description,
+            requirements=job_data.requirements,
+            embedding=encode_embedding(embedding),
+            embedding_dim=len(embedding) if embedding is not None else None,
+            embedding_model=nlp_engine.model_version if embedding is not None else None
         )
-        db.add(job_skill)
+        db.add(new_job)
+        db.flush()
+        
+        # İlan ve yetenek ilişkileri tek transaction içinde
+        skill_ids = skill_dictionary.add_job_skills(db, new_job.id, skills)
+        db.commit()
+        db.refresh(new_job)
     
-    db.commit()
+    # Eşleştirme indeksini güncelle
+    with stage_seconds.time(operation="create_job", stage="index"):
+        job_index.add(new_job.id, embedding, skill_ids)
     
     return new_job
 
 
+@router.post("/bulk")
+def bulk_create_jobs(
+    file: UploadFile = File(...),
+    skip: int = 0,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """JSONL veya CSV dosyasından toplu iş ilanı içe aktar (`skip` ile yarıda kalan aktarıma devam edilir)"""
+    name = (file.filename or "").lower()
+    if name.endswith(".csv"):
+        fmt = "csv"
+    elif name.endswith((".jsonl", ".ndjson", ".json")):
+        fmt = "jsonl"
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Yalnızca JSONL ve CSV dosyaları kabul edilmektedir"
+        )
+    
+    # Embedding batch'leri diğer isteklerle aynı sınırlı havuzda hesaplanır
+    try:
+        report = job_ingestor.ingest(
+            db,
+            iter_job_records(file.file, fmt),
+            skip=skip,
+            embed=lambda texts: executors.embed(nlp_engine.embed_texts, texts, job_ingestor.embed_batch_size)
+        )
+    except IngestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"İçe aktarma durdu, skip={e.report.offset} ile devam edebilirsiniz: {str(e)}"
+        )
+    
+    return report.to_dict()
+
+
 @router.get("/", response_model=List[JobResponse])
 def get_all_jobs(
     skip: int = 0,
@@ -102,77 +144,234 @@ def get_job_skills(
             detail="İş ilanı bulunamadı"
         )
     
-    skills = []
-    for job_skill in job.skills:
-        skills.append({
-            'name': job_skill.skill.name,
-            'importance': job_skill.importance
-        })
+    # Yetenek adları tek JOIN sorgusuyla
+    rows = db.query(Skill.name, JobSkill.importance).join(
+        JobSkill, JobSkill.skill_id == Skill.id
+    ).filter(JobSkill.job_id == job_id).all()
+    skills = [{'name': name, 'importance': importance} for name, importance in rows]
     
     return {'job_id': job_id, 'skills': skills}
 
 
-@router.post("/{cv_id}/match")
-def match_cv_with_jobs(
-    cv_id: int,
+@router.get("/{job_id}/candidates")
+def get_job_candidates(
+    job_id: int,
+    k: int = 10,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles(UserRole.EMPLOYER, UserRole.ADMIN))
 ):
-    """CV'yi tüm iş ilanlarıyla eşleştir"""
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
+    """İş ilanı için en uygun CV'leri getir (ters eşleştirme; yalnızca işveren ve yöneticiler)"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="İş ilanı bulunamadı"
+        )
+    
+    job_embedding = _current_embedding(
+        job, f"{job.title} {job.description} {job.requirements or ''}" if job.embedding is not None else None
+    )
+    if job_embedding is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="İş ilanı henüz işlenmemiş"
+        )
+    job_skills = dict(db.query(Skill.id, Skill.name).join(
+        JobSkill, JobSkill.skill_id == Skill.id
+    ).filter(JobSkill.job_id == job_id).all())
+    
+    # CV'leri bellek içi indeks üzerinden tek seferde skorla (diğer süreçlerin değişiklikleri önce alınır)
+    cv_index_sync.refresh(db)
+    try:
+        cv_ids, final_scores, similarities, skill_scores = cv_index.search(job_embedding, list(job_skills), k)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="İlan embedding boyutu CV'lerle uyumsuz"
+        )
+    
+    top_ids = [int(cv_id) for cv_id in cv_ids]
+    cvs_by_id = {cv.id: cv for cv in db.query(CV).filter(CV.id.in_(top_ids)).all()} if top_ids else {}
+    
+    candidates = []
+    for i in range(len(top_ids)):
+        cv = cvs_by_id.get(top_ids[i])
+        if cv is None:
+            continue
+        candidates.append({
+            'cv_id': cv.id,
+            'user_id': cv.user_id,
+            'file_name': cv.file_name,
+            'final_score': round(float(final_scores[i]) * 100, 2),
+            'embedding_similarity': round(float(similarities[i]) * 100, 2),
+            'skill_match': round(float(skill_scores[i]) * 100, 2),
+            'matched_skills': [job_skills[s] for s in cv_index.get_skill_ids(cv.id) if s in job_skills]
+        })
+    
+    return {
+        'job_id': job_id,
+        'total_cvs': len(cv_index),
+        'candidates': candidates
+    }
+
+
+def _get_ready_cv(db: Session, cv_id: int, user_id: int) -> CV:
+    """Kullanıcının eşleştirmeye hazır CV'sini getir"""
+    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == user_id).first()
     if not cv:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="CV bulunamadı"
         )
     
-    cv_embedding = json.loads(cv.embedding) if cv.embedding else []
-    cv_skills = [cs.skill.name for cs in cv.skills]
-    
-    if not cv_embedding:
+    if cv.status != CVStatus.READY:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="CV işlemesi henüz tamamlanmadı" if cv.status != CVStatus.FAILED else "CV işlenemedi"
+        )
+    return cv
+
+
+def _current_embedding(record, text: Optional[str]):
+    """Kayıtlı embedding etkin modelle üretildiyse onu, değilse metinden yeniden hesaplananı döndür"""
+    if nlp_engine.is_current(record.embedding_model):
+        return decode_embedding(record.embedding)
+    if not text:
+        return None
+    try:
+        # Eski model vektörü indeksle karşılaştırılamaz; sorgu tarafı istek anında yeniden embed edilir
+        return executors.embed(nlp_engine.get_embedding, text)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Embedding modeli şu anda kullanılamıyor, lütfen daha sonra tekrar deneyin"
+        )
+
+
+def _load_cv_features(db: Session, cv: CV):
+    """CV embedding'ini ve yeteneklerini ({Skill.id: ad}) getir"""
+    cv_embedding = _current_embedding(cv, cv.raw_text if cv.embedding is not None else None)
+    if cv_embedding is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="CV henüz işlenmemiş"
         )
-    
-    jobs = db.query(Job).all()
+    cv_skills = dict(db.query(Skill.id, Skill.name).join(
+        CVSkill, CVSkill.skill_id == Skill.id
+    ).filter(CVSkill.cv_id == cv.id).all())
+    return cv_embedding, cv_skills
+
+
+def _build_match_results(db: Session, cv_skills, job_ids, final_scores, similarities, skill_scores):
+    """Skorlanmış ilan id'lerinden yanıt listesini oluştur (ilanlar sabit boyutlu id parçalarıyla okunur)"""
+    top_ids = [int(job_id) for job_id in job_ids]
+    jobs_by_id = {}
+    for start in range(0, len(top_ids), JOB_LOAD_CHUNK):
+        chunk = top_ids[start:start + JOB_LOAD_CHUNK]
+        # Yanıtta gereken sütunlar yeterli; embedding blob'ları okunmaz
+        jobs_by_id.update((job.id, job) for job in db.query(
+            Job.id, Job.title, Job.company, Job.location
+        ).filter(Job.id.in_(chunk)))
     
     results = []
-    for job in jobs:
-        job_embedding = json.loads(job.embedding) if job.embedding else []
-        job_skills = [js.skill.name for js in job.skills]
-        
-        if job_embedding:
-            scores = matcher.calculate_match_score(
-                cv_embedding, job_embedding, cv_skills, job_skills
-            )
-            
-            match_record = Match(
-                cv_id=cv.id,
-                job_id=job.id,
-                similarity_score=scores['final_score'],
-                skill_match_score=scores['skill_match']
-            )
-            db.add(match_record)
-            
-            results.append({
-                'job_id': job.id,
-                'job_title': job.title,
-                'company': job.company,
-                'location': job.location,
-                'final_score': scores['final_score'],
-                'embedding_similarity': scores['embedding_similarity'],
-                'skill_match': scores['skill_match'],
-                'matched_skills': [s for s in cv_skills if s.lower() in [js.lower() for js in job_skills]]
-            })
+    for i in range(len(top_ids)):
+        job = jobs_by_id.get(top_ids[i])
+        if job is None:
+            continue
+        results.append({
+            'job_id': job.id,
+            'job_title': job.title,
+            'company': job.company,
+            'location': job.location,
+            'final_score': round(float(final_scores[i]) * 100, 2),
+            'embedding_similarity': round(float(similarities[i]) * 100, 2),
+            'skill_match': round(float(skill_scores[i]) * 100, 2),
+            'matched_skills': [cv_skills[s] for s in job_index.get_skill_ids(job.id) if s in cv_skills]
+        })
+    return results
+
+
+@router.post("/{cv_id}/match")
+def match_cv_with_jobs(
+    cv_id: int,
+    top_k: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """CV'yi tüm iş ilanlarıyla eşleştir"""
+    with stage_seconds.time(operation="match_cv_with_jobs", stage="load_cv"):
+        cv = _get_ready_cv(db, cv_id, current_user.id)
+        cv_embedding, cv_skills = _load_cv_features(db, cv)
     
-    db.commit()
+    # Saklanacak en iyi k sonuç yanıttan fazlaysa indeksten o kadarını iste
+    persist_k = settings.MATCH_PERSIST_TOP_K
+    search_k = max(top_k, persist_k) if top_k is not None and persist_k > 0 else top_k
     
-    results.sort(key=lambda x: x['final_score'], reverse=True)
+    # İlanları bellek içi indeks üzerinden tek seferde skorla (diğer süreçlerin değişiklikleri önce alınır)
+    try:
+        with stage_seconds.time(operation="match_cv_with_jobs", stage="score"):
+            job_index_sync.refresh(db)
+            job_ids, final_scores, similarities, skill_scores = job_index.search(cv_embedding, list(cv_skills), search_k)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CV embedding boyutu iş ilanlarıyla uyumsuz"
+        )
+    
+    # Sonuçları (cv_id, job_id) anahtarıyla toplu upsert et; yalnızca saklanacak ilk k için satır kurulur
+    with stage_seconds.time(operation="match_cv_with_jobs", stage="db_write"):
+        save_k = min(persist_k, len(job_ids)) if persist_k > 0 else len(job_ids)
+        match_store.save(db, cv.id, [{
+            'job_id': int(job_ids[i]),
+            'final_score': round(float(final_scores[i]) * 100, 2),
+            'skill_match': round(float(skill_scores[i]) * 100, 2)
+        } for i in range(save_k)])
+    
+    if top_k is not None:
+        job_ids = job_ids[:top_k]
+    
+    with stage_seconds.time(operation="match_cv_with_jobs", stage="build_results"):
+        results = _build_match_results(db, cv_skills, job_ids, final_scores, similarities, skill_scores)
+    
+    return {
+        'cv_id': cv_id,
+        'total_jobs': len(job_index),
+        'matches': results
+    }
+
+
+@router.get("/{cv_id}/recommendations")
+def get_recommendations(
+    cv_id: int,
+    skip: int = 0,
+    limit: int = 20,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """CV için önbelleğe alınmış en iyi ilanları sayfa sayfa getir"""
+    cv = _get_ready_cv(db, cv_id, current_user.id)
+    
+    # Önbellekte yoksa (veya ilanlar değiştiyse) hesaplanır, aksi halde doğrudan okunur
+    job_index_sync.refresh(db)
+    try:
+        recs = recommendation_cache.get(cv.id, lambda: _load_cv_features(db, cv))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CV embedding boyutu iş ilanlarıyla uyumsuz"
+        )
+    
+    page = slice(skip, skip + limit)
+    results = _build_match_results(
+        db, recs.cv_skills, recs.ids[page], recs.final_scores[page],
+        recs.similarities[page], recs.skill_scores[page]
+    )
     
     return {
         'cv_id': cv_id,
-        'total_jobs': len(results),
+        'total': len(recs.ids),
+        'skip': skip,
+        'limit': limit,
         'matches': results
     }
 
@@ -194,4 +393,6 @@ def delete_job(
     db.delete(job)
     db.commit()
     
+    job_index.remove(job_id)
+    
     return {"message": "İş ilanı başarıyla silindi"}
\ No newline at end of file
@@ -1,3 +1,3 @@
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
-from app.schemas.cv import CVCreate, CVResponse, CVDetail
+from app.schemas.cv import CVCreate, CVResponse, CVDetail, CVStatusResponse
 from app.schemas.job import JobCreate, JobResponse, JobDetail, MatchResponse
\ No newline at end of file
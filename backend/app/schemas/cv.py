@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional, List, Any
 
+from app.models.cv import CVStatus
+
 
 class CVCreate(BaseModel):
     file_name: str
@@ -18,6 +20,7 @@ class SkillInfo(BaseModel):
 class CVResponse(BaseModel):
     id: int
     file_name: Optional[str] = None
+    status: Optional[CVStatus] = None
     created_at: datetime
 
     class Config:
@@ -30,7 +33,14 @@ class CVDetail(BaseModel):
     raw_text: Optional[str] = None
     parsed_data: Optional[Any] = None
     skills: List[SkillInfo] = []
+    status: Optional[CVStatus] = None
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class CVStatusResponse(BaseModel):
+    cv_id: int
+    status: CVStatus
+    error: Optional[str] = None
\ No newline at end of file
@@ -1,3 +1,4 @@
 from app.services.cv_parser import cv_parser
 from app.services.nlp_engine import nlp_engine
-from app.services.matcher import matcher
\ No newline at end of file
+from app.services.matcher import matcher
+from app.services.embedding_index import job_index, cv_index
\ No newline at end of file
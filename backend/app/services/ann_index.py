@@ -0,0 +1,146 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+
+class IVFIndex:
+    """NumPy tabanlı IVF (inverted file) yaklaşık en yakın komşu indeksi
+
+    Vektörler k-means merkezlerine (coarse quantizer) atanır; sorguda yalnızca en yakın
+    `nprobe` kümenin elemanları aday olarak döner. Vektörlerin L2 normalize edilmiş
+    olduğu varsayılır (iç çarpım = cosine similarity).
+    """
+
+    def __init__(
+        self,
+        nlist: int = 0,
+        nprobe: int = 16,
+        kmeans_iterations: int = 10,
+        max_train_points: int = 100000,
+        seed: int = 42
+    ):
+        self.nlist = nlist  # 0 ise eğitimde otomatik (4 * sqrt(N)) seçilir
+        self.nprobe = nprobe
+        self.kmeans_iterations = kmeans_iterations
+        self.max_train_points = max_train_points
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self._lists: List[List[int]] = []
+        self._assignment: Dict[int, int] = {}  # item_id -> küme
+        self._position: Dict[int, int] = {}  # item_id -> küme listesindeki sıra
+
+    def clone_empty(self) -> "IVFIndex":
+        """Aynı ayarlarla eğitilmemiş yeni bir indeks (arka planda eğitim için)"""
+        return IVFIndex(self.nlist, self.nprobe, self.kmeans_iterations, self.max_train_points, self.seed)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def __len__(self) -> int:
+        return len(self._assignment)
+
+    def reset(self):
+        """Eğitimi ve tüm küme listelerini temizle"""
+        self.centroids = None
+        self.trained_size = 0
+        self._lists = []
+        self._assignment = {}
+        self._position = {}
+
+    def _nearest_centroids(self, vectors: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+        """Her vektör için en yakın merkezi bul (bellek için parça parça)"""
+        labels = np.empty(vectors.shape[0], dtype=np.int64)
+        for start in range(0, vectors.shape[0], chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            labels[start:start + chunk_size] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
+
+    def train(self, vectors: np.ndarray):
+        """Küresel k-means ile kaba quantizer merkezlerini eğit"""
+        n = vectors.shape[0]
+        if n == 0:
+            return
+        rng = np.random.default_rng(self.seed)
+        nlist = self.nlist or int(4 * np.sqrt(n))
+        nlist = max(1, min(nlist, n))
+
+        sample = vectors
+        if n > self.max_train_points:
+            sample = vectors[rng.choice(n, self.max_train_points, replace=False)]
+
+        self.centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            labels = self._nearest_centroids(sample)
+            counts = np.bincount(labels, minlength=nlist)
+
+            # Küme toplamları: etiketlere göre sıralayıp segment bazında topla
+            sums = np.zeros_like(self.centroids)
+            nonempty = np.flatnonzero(counts)
+            starts = (np.cumsum(counts) - counts)[nonempty]
+            order = np.argsort(labels, kind="stable")
+            sums[nonempty] = np.add.reduceat(sample[order], starts, axis=0)
+
+            # Boş kalan kümeleri rastgele noktalarla yeniden başlat
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample.shape[0], int(empty.sum()), replace=False)]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self.centroids = (sums / norms).astype(np.float32)
+
+        self.trained_size = n
+        self._lists = [[] for _ in range(nlist)]
+        self._assignment = {}
+        self._position = {}
+
+    def add_many(self, item_ids: Sequence[int], vectors: np.ndarray):
+        """Birden çok vektörü en yakın kümelere ekle"""
+        if not self.is_trained or len(item_ids) == 0:
+            return
+        labels = self._nearest_centroids(vectors)
+        for item_id, label in zip(item_ids, labels):
+            self._insert(int(item_id), int(label))
+
+    def add(self, item_id: int, vector: np.ndarray):
+        """Tek vektör ekle (mevcutsa yeniden ata)"""
+        if not self.is_trained:
+            return
+        self.remove(item_id)
+        self._insert(item_id, int(np.argmax(self.centroids @ vector)))
+
+    def _insert(self, item_id: int, label: int):
+        bucket = self._lists[label]
+        self._assignment[item_id] = label
+        self._position[item_id] = len(bucket)
+        bucket.append(item_id)
+
+    def remove(self, item_id: int) -> bool:
+        """Vektörü kümesinden çıkar (listenin son elemanıyla yer değiştirerek)"""
+        label = self._assignment.pop(item_id, None)
+        if label is None:
+            return False
+        bucket = self._lists[label]
+        pos = self._position.pop(item_id)
+        last_id = bucket.pop()
+        if last_id != item_id:
+            bucket[pos] = last_id
+            self._position[last_id] = pos
+        return True
+
+    def search(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Sorguya en yakın `nprobe` kümedeki aday item id'lerini döndür"""
+        if not self.is_trained:
+            return np.empty(0, dtype=np.int64)
+        nprobe = max(1, min(nprobe or self.nprobe, len(self._lists)))
+        centroid_scores = self.centroids @ query
+        if nprobe < len(self._lists):
+            probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            probes = np.arange(len(self._lists))
+
+        candidates = [self._lists[p] for p in probes if self._lists[p]]
+        if not candidates:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.asarray(c, dtype=np.int64) for c in candidates])
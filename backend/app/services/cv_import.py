@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.cv import CV, CVStatus
+from app.services.cv_parser import cv_parser
+from app.services.nlp_engine import nlp_engine
+from app.services.skill_dictionary import skill_dictionary
+from app.utils.db import dialect_insert
+from app.utils.embedding import encode_embedding
+
+
+@dataclass
+class ImportReport:
+    """Toplu CV içe aktarma sonucu"""
+    imported: int = 0
+    failed: int = 0
+    skipped: int = 0  # Önceki çalıştırmada işlenmiş (kontrol noktası ya da veritabanında aynı dosya)
+    pages: int = 0
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def cvs_per_second(self) -> float:
+        return self.imported / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def iter_pdf_sources(source: str) -> Iterator[Tuple[str, Callable[[str], None]]]:
+    """Dizin veya arşivdeki (zip, tar, tar.gz) PDF'leri (anahtar, hedefe_yaz) olarak sırayla döndür"""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, source), lambda dest, path=path: shutil.copyfile(path, dest)
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                    yield info.filename, lambda dest, info=info: _write_member(archive.open(info), dest)
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(".pdf"):
+                    yield member.name, lambda dest, member=member: _write_member(archive.extractfile(member), dest)
+    else:
+        raise ValueError(f"Dizin ya da zip/tar arşivi bekleniyordu: {source}")
+
+
+def _write_member(stream, dest: str):
+    with stream, open(dest, "wb") as f:
+        shutil.copyfileobj(stream, f)
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parse(file_path: str):
+    """Worker süreçte çalışır: CV'yi parse et, hatayı değer olarak döndür"""
+    try:
+        return cv_parser.parse_cv(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+class CVImporter:
+    """PDF'leri süreç havuzunda parse edip toplu embedding ve toplu INSERT ile içe aktarır
+
+    Bir batch parse edilirken önceki batch'in embedding'i hesaplanır. Her batch kendi
+    transaction'ında yazılır ve işlenen dosyalar kontrol noktası dosyasına eklenir; çöken bir
+    içe aktarma aynı kontrol noktasıyla yeniden başlatıldığında kaldığı yerden devam eder.
+    Commit ile kontrol noktası yazımı arasında çökülürse o batch yeniden işlenir; her CV dosya
+    içeriğinin hash'iyle saklandığından ((user_id, source_hash) tekil) ikinci kez eklenmez.
+    Bellek içi CV indeksi doğrudan güncellenmez; çalışan API süreçleri yeni CV'leri
+    `cv_index_sync` yenilemesiyle görür.
+    """
+
+    def __init__(self, upload_dir: str, workers: int = 4, batch_size: int = 32):
+        self.upload_dir = upload_dir
+        self.workers = workers
+        self.batch_size = batch_size
+
+    def run(
+        self,
+        db: Session,
+        source: str,
+        user_id: int,
+        checkpoint: Optional[str] = None,
+        on_batch: Optional[Callable[[ImportReport], None]] = None
+    ) -> ImportReport:
+        os.makedirs(self.upload_dir, exist_ok=True)
+        done = self._read_checkpoint(checkpoint)
+        report = ImportReport()
+        start = time.perf_counter()
+        unfinished: List[List[Dict]] = []  # Dosyaları kopyalanmış, kaydı henüz commit edilmemiş batch'ler
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                pending = None
+                for batch in self._batches(source, user_id, done, report):
+                    unfinished.append(batch)
+                    # Bu batch parse edilirken bir öncekinin embedding'i ve kaydı yapılır
+                    futures = [pool.submit(_parse, item['file_path']) for item in batch]
+                    if pending is not None:
+                        self._finish(db, *pending, user_id, report)
+                        self._write_checkpoint(checkpoint, [item['key'] for item in unfinished.pop(0)])
+                        self._progress(report, start, on_batch)
+                    pending = (batch, futures)
+                if pending is not None:
+                    self._finish(db, *pending, user_id, report)
+                    self._write_checkpoint(checkpoint, [item['key'] for item in unfinished.pop(0)])
+                    self._progress(report, start, on_batch)
+        except Exception:
+            # Geri alınan ya da hiç yazılmayan batch'lerin kopyaları yükleme dizininde kalmasın
+            for batch in unfinished:
+                self._remove_files(batch)
+            raise
+        finally:
+            report.elapsed = time.perf_counter() - start
+        return report
+
+    def _progress(self, report: ImportReport, start: float, on_batch):
+        report.elapsed = time.perf_counter() - start
+        if on_batch:
+            on_batch(report)
+
+    def _batches(self, source: str, user_id: int, done: Set[str], report: ImportReport) -> Iterator[List[Dict]]:
+        """Kaynaktaki yeni PDF'leri yükleme dizinine kopyalayıp batch'ler halinde döndür"""
+        batch = []
+        try:
+            for key, write in iter_pdf_sources(source):
+                if key in done:
+                    report.skipped += 1
+                    continue
+                file_name = os.path.basename(key)
+                file_path = os.path.join(self.upload_dir, f"{user_id}_{uuid.uuid4().hex}_{file_name}")
+                item = {'key': key, 'file_name': file_name, 'file_path': file_path}
+                batch.append(item)
+                write(file_path)
+                item['source_hash'] = _file_hash(file_path)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        except Exception:
+            # Henüz döndürülmemiş batch'in (yarım yazılmış dosya dahil) kopyalarını sil
+            self._remove_files(batch)
+            raise
+        if batch:
+            yield batch
+
+    def _finish(self, db: Session, batch: List[Dict], futures, user_id: int, report: ImportReport):
+        """Parse sonuçlarını topla, toplu embed et ve CV/CVSkill satırlarını tek transaction'da yaz"""
+        parsed_items = []
+        for item, future in zip(batch, futures):
+            parsed_data, error = future.result()
+            if parsed_data is None:
+                report.failed += 1
+                if len(report.errors) < 100:
+                    report.errors.append(f"{item['key']}: {error}")
+                self._remove_files([item])
+                continue
+            parsed_items.append((item, parsed_data))
+
+        parsed_items = self._skip_imported(db, user_id, parsed_items, report)
+        if parsed_items:
+            texts = [parsed_data['raw_text'] for _, parsed_data in parsed_items]
+            skills = [nlp_engine.extract_skills(text) for text in texts]
+            embeddings = nlp_engine.embed_texts(texts)
+
+            rows = [{
+                'user_id': user_id,
+                'file_name': item['file_name'],
+                'file_path': item['file_path'],
+                'raw_text': parsed_data['raw_text'],
+                'parsed_data': json.dumps(parsed_data, ensure_ascii=False),
+                'embedding': encode_embedding(embedding),
+                'embedding_dim': len(embedding),
+                'embedding_model': nlp_engine.model_version,
+                'status': CVStatus.READY,
+                'source_hash': item['source_hash']
+            } for (item, parsed_data), embedding in zip(parsed_items, embeddings)]
+
+            try:
+                # Eşzamanlı bir içe aktarma aynı dosyayı az önce eklediyse satır sessizce atlanır
+                stmt = dialect_insert(db, CV.__table__).on_conflict_do_nothing(
+                    index_elements=['user_id', 'source_hash']
+                ).returning(CV.__table__.c.id, CV.__table__.c.source_hash)
+                cv_ids = {source_hash: cv_id for cv_id, source_hash in db.execute(stmt, rows)}
+                inserted = [
+                    (item, parsed_data, item_skills)
+                    for (item, parsed_data), item_skills in zip(parsed_items, skills)
+                    if item['source_hash'] in cv_ids
+                ]
+                skill_dictionary.add_cvs_skills(
+                    db, [(cv_ids[item['source_hash']], item_skills) for item, _, item_skills in inserted]
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            for item, _ in parsed_items:
+                if item['source_hash'] not in cv_ids:
+                    report.skipped += 1
+                    self._remove_files([item])
+            report.imported += len(inserted)
+            report.pages += sum(parsed_data.get('page_count', 0) for _, parsed_data, _ in inserted)
+
+    def _skip_imported(self, db: Session, user_id: int, parsed_items, report: ImportReport):
+        """Kullanıcıya daha önce eklenmiş (ya da batch içinde tekrarlanan) dosyaları ayıkla"""
+        hashes = [item['source_hash'] for item, _ in parsed_items]
+        seen = {source_hash for (source_hash,) in db.query(CV.source_hash).filter(
+            CV.user_id == user_id, CV.source_hash.in_(hashes)
+        )} if hashes else set()
+        kept = []
+        for item, parsed_data in parsed_items:
+            if item['source_hash'] in seen:
+                report.skipped += 1
+                self._remove_files([item])
+                continue
+            seen.add(item['source_hash'])
+            kept.append((item, parsed_data))
+        return kept
+
+    @staticmethod
+    def _remove_files(batch: List[Dict]):
+        for item in batch:
+            if os.path.exists(item['file_path']):
+                os.remove(item['file_path'])
+
+    @staticmethod
+    def _read_checkpoint(checkpoint: Optional[str]) -> Set[str]:
+        if not checkpoint or not os.path.exists(checkpoint):
+            return set()
+        with open(checkpoint, encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+
+    @staticmethod
+    def _write_checkpoint(checkpoint: Optional[str], keys: List[str]):
+        """İşlenen dosyaları kontrol noktasına ekle (commit sonrası; satır başına bir anahtar)"""
+        if not checkpoint:
+            return
+        with open(checkpoint, "a", encoding="utf-8") as f:
+            f.writelines(key + "\n" for key in keys)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# Global instance (upload_cv ile aynı yükleme dizini)
+cv_importer = CVImporter(upload_dir="uploads/cvs")
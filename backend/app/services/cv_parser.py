@@ -1,6 +1,11 @@
 import fitz  # PyMuPDF
 import re
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+# (fonksiyon, argüman demetleri) -> sonuçlar; ör. executors.parse_map
+PageMap = Callable[[Callable, Iterable[tuple]], Iterable]
 
 
 class CVParser:
@@ -17,18 +22,64 @@ class CVParser:
             'certificates': ['sertifikalar', 'certificates', 'certifications'],
             'summary': ['özet', 'summary', 'profil', 'profile', 'hakkımda', 'about me']
         }
+        # Her bölüm adlandırılmış bir grup; uzun başlıklar önce denenir. Desen '\n' ile başlar ki
+        # regex motoru yalnızca satır başlarını denesin (metnin başına '\n' eklenerek aranır)
+        groups = [
+            f"(?P<{name}>" + "|".join(re.escape(h) for h in sorted(headers, key=len, reverse=True)) + ")"
+            for name, headers in self.section_headers.items()
+        ]
+        self._section_pattern = re.compile(
+            r"\n[ \t]*(?:" + "|".join(groups) + r")[ \t]*(?::|(?=\n)|\Z)", re.IGNORECASE
+        )
     
     def extract_text_from_pdf(self, file_path: str) -> str:
         """PDF dosyasından metin çıkar"""
+        with open(file_path, "rb") as f:
+            return self._read_pdf(f.read())[0]
+    
+    def _open_pdf(self, content: bytes) -> "fitz.Document":
+        """PDF'i bellekteki byte'lardan aç; boyut ve sayfa sınırlarını uygula"""
+        if len(content) > settings.CV_MAX_UPLOAD_BYTES:
+            raise ValueError(f"PDF çok büyük: {len(content)} byte (en fazla {settings.CV_MAX_UPLOAD_BYTES})")
         try:
-            doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text.strip()
+            doc = fitz.open(stream=content, filetype="pdf")
         except Exception as e:
             raise Exception(f"PDF okuma hatası: {str(e)}")
+        if doc.page_count > settings.CV_MAX_PAGES:
+            page_count = doc.page_count
+            doc.close()
+            raise ValueError(f"PDF çok fazla sayfa içeriyor: {page_count} (en fazla {settings.CV_MAX_PAGES})")
+        return doc
+    
+    def extract_page_texts(self, content: bytes, start: int, stop: int) -> List[str]:
+        """[start, stop) aralığındaki sayfaların metinleri (süreç havuzunda sayfa aralığı başına çağrılır)"""
+        doc = fitz.open(stream=content, filetype="pdf")
+        try:
+            return [doc[i].get_text() for i in range(start, min(stop, doc.page_count))]
+        finally:
+            doc.close()
+    
+    def _read_pdf(self, content: bytes, page_map: Optional[PageMap] = None) -> Tuple[str, int]:
+        """PDF byte'larından (metin, sayfa sayısı) çıkar
+
+        `page_map` verilirse sayfalar CV_PARSE_PAGES_PER_TASK'lık aralıklara bölünüp onunla
+        (ör. süreç havuzunda) paralel çıkarılır; aksi halde bu süreçte sırayla okunur.
+        """
+        doc = self._open_pdf(content)
+        page_count = doc.page_count
+        if page_map is None:
+            try:
+                page_texts = [page.get_text() for page in doc]
+            except Exception as e:
+                raise Exception(f"PDF okuma hatası: {str(e)}")
+            finally:
+                doc.close()
+        else:
+            doc.close()
+            step = max(1, settings.CV_PARSE_PAGES_PER_TASK)
+            ranges = [(content, start, start + step) for start in range(0, page_count, step)]
+            page_texts = [text for texts in page_map(self.extract_page_texts, ranges) for text in texts]
+        return "".join(page_texts).strip(), page_count
     
     def extract_email(self, text: str) -> Optional[str]:
         """Metinden email adresi çıkar"""
@@ -44,26 +95,38 @@ class CVParser:
             return ''.join(match.groups()[1:])
         return None
     
+    def _section_positions(self, text: str) -> List[Tuple[int, int, str]]:
+        """Bulunan bölüm başlıklarını (başlık başı, başlık sonu, bölüm adı) olarak pozisyon sırasıyla döndür
+
+        Başlık satır başında olmalı ve ardından ':' ya da satır sonu gelmelidir; her bölümün
+        ilk başlığı alınır. Tüm başlıklar tek derlenmiş regex ile tek geçişte aranır.
+        """
+        section_positions = []
+        seen = set()
+        # Pozisyonlar eklenen '\n' kadar kaydırılır
+        for match in self._section_pattern.finditer("\n" + text):
+            section_name = match.lastgroup
+            if section_name not in seen:
+                seen.add(section_name)
+                section_positions.append((match.start(section_name) - 1, match.end() - 1, section_name))
+        return section_positions
+    
+    def section_spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """Bölümlerin metindeki (başlangıç, bitiş, bölüm adı) aralıkları, başlık dahil"""
+        section_positions = self._section_positions(text)
+        spans = []
+        for i, (pos, _, section_name) in enumerate(section_positions):
+            end = section_positions[i + 1][0] if i + 1 < len(section_positions) else len(text)
+            spans.append((pos, end, section_name))
+        return spans
+    
     def extract_sections(self, text: str) -> Dict[str, str]:
         """Metni bölümlere ayır"""
         sections = {}
-        text_lower = text.lower()
-        
-        # Her bölüm için başlangıç pozisyonunu bul
-        section_positions = []
-        for section_name, headers in self.section_headers.items():
-            for header in headers:
-                pos = text_lower.find(header)
-                if pos != -1:
-                    section_positions.append((pos, section_name, header))
-                    break
-        
-        # Pozisyona göre sırala
-        section_positions.sort(key=lambda x: x[0])
+        section_positions = self._section_positions(text)
         
         # Bölümleri çıkar
-        for i, (pos, section_name, header) in enumerate(section_positions):
-            start = pos + len(header)
+        for i, (pos, start, section_name) in enumerate(section_positions):
             if i + 1 < len(section_positions):
                 end = section_positions[i + 1][0]
             else:
@@ -74,10 +137,16 @@ class CVParser:
     
     def parse_cv(self, file_path: str) -> Dict:
         """CV'yi tam olarak ayrıştır"""
-        raw_text = self.extract_text_from_pdf(file_path)
+        with open(file_path, "rb") as f:
+            return self.parse_cv_bytes(f.read())
+    
+    def parse_cv_bytes(self, content: bytes, page_map: Optional[PageMap] = None) -> Dict:
+        """Bellekteki PDF'i (ör. yüklenen dosya) diske tekrar okumadan ayrıştır"""
+        raw_text, page_count = self._read_pdf(content, page_map)
         
         parsed_data = {
             'raw_text': raw_text,
+            'page_count': page_count,
             'email': self.extract_email(raw_text),
             'phone': self.extract_phone(raw_text),
             'sections': self.extract_sections(raw_text)
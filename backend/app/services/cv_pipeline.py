@@ -0,0 +1,199 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.cv import CV, CVStatus
+from app.models.job import CVSkill
+from app.services.cv_parser import cv_parser
+from app.services.nlp_engine import nlp_engine
+from app.services.executors import executors
+from app.services.skill_dictionary import skill_dictionary
+from app.services.recommendation_cache import recommendation_cache
+from app.services.embedding_index import cv_index
+from app.services.metrics import metrics, stage_seconds
+from app.utils.embedding import encode_embedding
+
+
+class CVPipeline:
+    """Yüklenen CV'leri arka planda işleyen sınırlı kuyruk ve worker havuzu
+
+    Aşamalar: PDF parse → yetenek çıkarma → BERT embedding → veritabanına kayıt.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 100):
+        self.workers = workers
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._backlog = False  # Kuyruğa sığmayan PENDING CV'ler var (kuyruk boşaldıkça alınır)
+
+    def start(self):
+        """Worker thread'lerini başlat"""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"cv-pipeline-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Kuyruktaki işler bittikten sonra worker'ları durdur"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, cv_id: int, content: Optional[bytes] = None):
+        """CV'yi (varsa yüklenen byte'larıyla) işleme kuyruğuna ekle (kuyruk doluysa queue.Full fırlatır)"""
+        self._queue.put_nowait((cv_id, time.perf_counter(), content))
+
+    def recover(self, db) -> int:
+        """Yarım kalmış CV'leri kuyruğa geri al (bloklamadan)
+
+        Çöken bir süreçte PROCESSING olarak kalan, CV_PROCESSING_TIMEOUT'tan uzun süredir
+        güncellenmemiş CV'ler yeniden PENDING yapılır. Kuyruğa sığmayan CV'ler PENDING kalır
+        ve kuyruk boşaldıkça alınır. Birden çok süreç aynı CV'yi kuyruğa alabilir; işlemeyi
+        yalnızca CV'yi `process` içinde sahiplenen süreç yapar.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.CV_PROCESSING_TIMEOUT)
+        db.query(CV).filter(CV.status == CVStatus.PROCESSING, CV.updated_at < cutoff).update(
+            {CV.status: CVStatus.PENDING}, synchronize_session=False
+        )
+        db.commit()
+
+        pending = db.query(CV.id).filter(CV.status == CVStatus.PENDING).order_by(CV.id).all()
+        self._backlog = False
+        queued = 0
+        for (cv_id,) in pending:
+            try:
+                self._queue.put_nowait((cv_id, time.perf_counter(), None))
+            except queue.Full:
+                self._backlog = True
+                break
+            queued += 1
+        return queued
+
+    def _refill(self):
+        """Kuyruk boşaldığında bekleyen PENDING CV'leri kuyruğa al"""
+        db = SessionLocal()
+        try:
+            self.recover(db)
+        except Exception as e:
+            print(f"Bekleyen CV'ler kuyruğa alınamadı: {str(e)}")
+        finally:
+            db.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                cv_id, enqueued_at, content = item
+                stage_seconds.observe(time.perf_counter() - enqueued_at, operation="upload_cv", stage="queue_wait")
+                with stage_seconds.time(operation="upload_cv", stage="processing_total"):
+                    self.process(cv_id, content)
+            finally:
+                self._queue.task_done()
+            if self._backlog and self._queue.empty():
+                self._refill()
+
+    def process(self, cv_id: int, content: Optional[bytes] = None):
+        """Tek bir CV'yi tüm aşamalardan geçir (byte'lar yoksa dosya diskten okunur)"""
+        db = SessionLocal()
+        try:
+            # CV'yi atomik olarak sahiplen: başka bir süreç/thread aldıysa atla
+            claimed = db.query(CV).filter(CV.id == cv_id, CV.status == CVStatus.PENDING).update(
+                {CV.status: CVStatus.PROCESSING}, synchronize_session=False
+            )
+            db.commit()
+            if claimed != 1:
+                return
+            cv = db.query(CV).filter(CV.id == cv_id).first()
+            if not cv:
+                return
+
+            # CV'yi parse et
+            try:
+                with stage_seconds.time(operation="upload_cv", stage="parse"):
+                    if content is None:
+                        with open(cv.file_path, "rb") as f:
+                            content = f.read()
+                    # Sayfa aralıkları parse süreçlerine dağıtılır
+                    parsed_data = cv_parser.parse_cv_bytes(content, page_map=executors.parse_map)
+            except Exception as e:
+                if cv.file_path and os.path.exists(cv.file_path):
+                    os.remove(cv.file_path)
+                self._fail(db, cv, f"CV işlenirken hata oluştu: {str(e)}")
+                return
+
+            # Yetenekleri çıkar
+            with stage_seconds.time(operation="upload_cv", stage="skills"):
+                skills = nlp_engine.extract_skills(parsed_data['raw_text'])
+
+            # BERT embedding oluştur
+            try:
+                with stage_seconds.time(operation="upload_cv", stage="embedding"):
+                    embedding = executors.embed(nlp_engine.get_embedding, parsed_data['raw_text'])
+            except Exception as e:
+                embedding = None
+
+            self._persist(db, cv, parsed_data, skills, embedding)
+        except Exception as e:
+            db.rollback()
+            cv = db.query(CV).filter(CV.id == cv_id).first()
+            if cv:
+                self._fail(db, cv, f"CV işlenirken hata oluştu: {str(e)}")
+        finally:
+            db.close()
+
+    def _persist(self, db, cv: CV, parsed_data, skills, embedding):
+        """Parse sonucunu, yetenekleri ve embedding'i kaydet"""
+        start = time.perf_counter()
+        cv.raw_text = parsed_data['raw_text']
+        cv.parsed_data = json.dumps(parsed_data, ensure_ascii=False)
+        cv.embedding = encode_embedding(embedding)
+        cv.embedding_dim = len(embedding) if embedding is not None else None
+        cv.embedding_model = nlp_engine.model_version if embedding is not None else None
+
+        # Yarıda kalıp yeniden işlenen CV'lerde eski yetenek kayıtlarını temizle
+        db.query(CVSkill).filter(CVSkill.cv_id == cv.id).delete()
+
+        # Yetenekleri toplu çöz ve CV-Skill ilişkilerini tek seferde ekle
+        skill_ids = skill_dictionary.add_cv_skills(db, cv.id, skills)
+
+        cv.status = CVStatus.READY
+        cv.processing_error = None
+        db.commit()
+        stage_seconds.observe(time.perf_counter() - start, operation="upload_cv", stage="db_write")
+
+        # CV değişti: aday indeksini güncelle, önbellekteki önerileri geçersiz kıl
+        with stage_seconds.time(operation="upload_cv", stage="index"):
+            if embedding is not None:
+                cv_index.add(cv.id, embedding, skill_ids)
+            else:
+                cv_index.remove(cv.id)
+            recommendation_cache.invalidate(cv.id)
+
+    def _fail(self, db, cv: CV, error: str):
+        cv.status = CVStatus.FAILED
+        cv.processing_error = error
+        db.commit()
+
+
+# Global instance
+cv_pipeline = CVPipeline(
+    workers=settings.CV_PIPELINE_WORKERS,
+    queue_size=settings.CV_PIPELINE_QUEUE_SIZE
+)
+
+metrics.gauge(
+    "cvjm_cv_pipeline_queue_size", "İşlenmeyi bekleyen CV sayısı",
+    callback=lambda: {(): cv_pipeline._queue.qsize()}
+)
@@ -0,0 +1,124 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.models.cv import CV, CVStatus
+from app.models.job import Job
+from app.services.nlp_engine import nlp_engine
+from app.utils.embedding import encode_embedding
+
+TABLES = ("job", "cv")
+
+
+@dataclass
+class BackfillReport:
+    """Yeniden embedding sonucu; `last_id` commit edilmiş son kaydın id'sidir (devam noktası)"""
+    table: str
+    last_id: int = 0
+    updated: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.updated / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class EmbeddingBackfill:
+    """Etkin modelle üretilmemiş CV/ilan embedding'lerini id sırasıyla, parça parça yeniden hesaplar
+
+    Her parça tek toplu UPDATE ile kendi transaction'ında yazılır; `max_rows_per_second` ile
+    çıkarım yükü sınırlanır, böylece backfill canlı trafikle aynı makinede çalışabilir.
+    Bellek içi indeksler doğrudan güncellenmez; çalışan API süreçleri yeni vektörleri
+    `updated_at` damgası üzerinden INDEX_REFRESH_INTERVAL içinde indekslerine alır.
+    """
+
+    def __init__(self, batch_size: int = 64, max_rows_per_second: float = 0.0):
+        self.batch_size = batch_size
+        self.max_rows_per_second = max_rows_per_second
+
+    @staticmethod
+    def stale_filter(model):
+        """Embedding'i hiç olmayan ya da başka bir modelle üretilmiş kayıtlar"""
+        return or_(model.embedding_model.is_(None), model.embedding_model.notin_(nlp_engine.compatible_versions))
+
+    def count_stale(self, db: Session, table: str) -> int:
+        return self._query(db, table, CV.id if table == "cv" else Job.id).count()
+
+    def _query(self, db: Session, table: str, *columns):
+        if table == "cv":
+            return db.query(*columns).filter(
+                self.stale_filter(CV), CV.status == CVStatus.READY, CV.raw_text.isnot(None)
+            )
+        if table == "job":
+            return db.query(*columns).filter(self.stale_filter(Job))
+        raise ValueError(f"Bilinmeyen tablo: {table}")
+
+    def run(
+        self,
+        db: Session,
+        table: str,
+        after_id: int = 0,
+        on_batch: Optional[Callable[[BackfillReport], None]] = None
+    ) -> BackfillReport:
+        if table == "cv":
+            model, columns = CV, (CV.id, CV.raw_text)
+        else:
+            model, columns = Job, (Job.id, Job.title, Job.description, Job.requirements)
+
+        report = BackfillReport(table=table, last_id=after_id)
+        start = time.perf_counter()
+        try:
+            while True:
+                rows = self._query(db, table, *columns).filter(
+                    model.id > report.last_id
+                ).order_by(model.id).limit(self.batch_size).all()
+                if not rows:
+                    break
+
+                # create_job / CV işleme hattıyla aynı metinler
+                if table == "cv":
+                    texts = [row.raw_text for row in rows]
+                else:
+                    texts = [f"{row.title} {row.description} {row.requirements or ''}" for row in rows]
+                embeddings = nlp_engine.embed_texts(texts)
+
+                # updated_at açıkça yazılır; API süreçlerindeki IndexSync değişikliği bu damgadan görür
+                now = datetime.utcnow()
+                try:
+                    db.execute(update(model), [{
+                        'id': row.id,
+                        'embedding': encode_embedding(embedding),
+                        'embedding_dim': len(embedding),
+                        'embedding_model': nlp_engine.model_version,
+                        'updated_at': now
+                    } for row, embedding in zip(rows, embeddings)])
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+
+                report.last_id = rows[-1].id
+                report.updated += len(rows)
+                report.elapsed = time.perf_counter() - start
+                if on_batch:
+                    on_batch(report)
+                self._throttle(report, start)
+        finally:
+            report.elapsed = time.perf_counter() - start
+        return report
+
+    def _throttle(self, report: BackfillReport, start: float):
+        """Ortalama hız üst sınırı aşıyorsa aradaki fark kadar bekle"""
+        if self.max_rows_per_second <= 0:
+            return
+        delay = report.updated / self.max_rows_per_second - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Global instance
+embedding_backfill = EmbeddingBackfill()
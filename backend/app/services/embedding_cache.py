@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from app.config import settings
+from app.services.metrics import metrics
+
+
+class EmbeddingCache:
+    """İçerik hash'ine göre embedding önbelleği: bellekte LRU + diskte memory-mapped dizi
+
+    Disk katmanı `entries.bin` dosyasıdır. Her kayıt sabit boyludur: 64 baytlık anahtar ve
+    ardından float32 vektör. Birden çok süreç (uvicorn worker'ları, CLI komutları) aynı dizini
+    paylaşabilir. Yazmalar `lock` dosyası üzerinde süreçler arası kilit altında yapılır ve
+    satır numarası dosya boyutundan alınır. Dosya yalnızca büyür; başka bir sürecin açık
+    memmap'i küçülmez. Okurken satırdaki anahtar doğrulanır; yarıda kalan bir yazma ıska
+    sayılır.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, memory_size: int = 10000):
+        self.cache_dir = cache_dir
+        self.memory_size = memory_size
+        self.dim: Optional[int] = None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._disk_rows: Dict[str, int] = {}
+        self._disk: Optional[np.memmap] = None
+        self._disk_count = 0  # Okunmuş (anahtarları indekse alınmış) satır sayısı
+        self._lock = threading.Lock()
+        self._opened = False
+
+    @staticmethod
+    def make_key(model_name: str, text: str, max_length: int) -> str:
+        """(model adı, normalize edilmiş metin, max_length) üçlüsünden önbellek anahtarı üret"""
+        normalized = re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+        payload = f"{model_name}\x00{max_length}\x00{normalized}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # Disk katmanı
+
+    def _paths(self):
+        return (
+            os.path.join(self.cache_dir, "entries.bin"),
+            os.path.join(self.cache_dir, "meta.json"),
+            os.path.join(self.cache_dir, "lock"),
+        )
+
+    def _record_dtype(self) -> np.dtype:
+        return np.dtype([("key", "S64"), ("vector", "<f4", (self.dim,))])
+
+    @contextmanager
+    def _file_lock(self):
+        """Disk katmanına yazan süreçleri sıraya sok"""
+        with open(self._paths()[2], "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_meta(self):
+        meta_path = self._paths()[1]
+        if self.dim is None and os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.dim = json.load(f)["dim"]
+
+    def _open(self):
+        """Disk katmanını (varsa) aç ve anahtar indeksini belleğe oku"""
+        self._opened = True
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._read_meta()
+        self._sync()
+
+    def _sync(self):
+        """Bu süreç ya da diğer süreçler tarafından eklenen satırları indekse al"""
+        if self.dim is None:
+            self._read_meta()
+            if self.dim is None:
+                return
+        entries_path = self._paths()[0]
+        record = self._record_dtype()
+        rows = os.path.getsize(entries_path) // record.itemsize if os.path.exists(entries_path) else 0
+        if rows <= self._disk_count:
+            return
+        self._disk = np.memmap(entries_path, dtype=record, mode="r", shape=(rows,))
+        for row, key in enumerate(self._disk["key"][self._disk_count:rows].tolist(), start=self._disk_count):
+            if len(key) == 64:
+                self._disk_rows[key.decode("ascii")] = row
+        self._disk_count = rows
+
+    def _disk_get(self, key: str) -> Optional[np.ndarray]:
+        row = self._disk_rows.get(key)
+        if row is None:
+            self._sync()
+            row = self._disk_rows.get(key)
+            if row is None:
+                return None
+        entry = self._disk[row]
+        if entry["key"].decode("ascii", "replace") != key:
+            del self._disk_rows[key]
+            return None
+        return np.array(entry["vector"])
+
+    def _disk_put(self, key: str, vector: np.ndarray):
+        entries_path, meta_path, _ = self._paths()
+        with self._file_lock():
+            self._read_meta()
+            if self.dim is None:
+                self.dim = vector.shape[0]
+                with open(meta_path, "w") as f:
+                    json.dump({"dim": self.dim}, f)
+            if vector.shape[0] != self.dim:
+                return
+            # Diğer süreçlerin eklediklerini gör; satır, dosyadaki tam kayıt sayısıdır
+            self._sync()
+            if key in self._disk_rows:
+                return
+            entry = np.zeros(1, dtype=self._record_dtype())
+            entry["key"] = key.encode("ascii")
+            entry["vector"] = vector
+            with open(entries_path, "r+b" if os.path.exists(entries_path) else "wb") as f:
+                # Yarıda kalmış bir kaydın artığı varsa üzerine yazılır
+                f.seek(self._disk_count * entry.itemsize)
+                f.write(entry.tobytes())
+            self._sync()
+
+    # Genel API
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Önbellekten vektörü getir (önce bellek, sonra disk)"""
+        with self._lock:
+            if not self._opened:
+                self._open()
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return vector
+            vector = self._disk_get(key) if self.cache_dir else None
+            if vector is not None:
+                self._remember(key, vector)
+                self.hits_disk += 1
+                return vector
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: np.ndarray):
+        """Vektörü her iki katmana da yaz"""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            if not self._opened:
+                self._open()
+            self._remember(key, vector)
+            if self.cache_dir and key not in self._disk_rows:
+                self._disk_put(key, vector)
+
+    def _remember(self, key: str, vector: np.ndarray):
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def flush(self):
+        """Disk katmanının memmap'ini bırak (yazmalar doğrudan dosyaya yapılır)"""
+        with self._lock:
+            self._disk = None
+            self._disk_rows = {}
+            self._disk_count = 0
+            self._opened = False
+
+    def stats(self) -> Dict[str, int]:
+        """İsabet/ıska sayaçlarını döndür"""
+        return {
+            'hits_memory': self.hits_memory,
+            'hits_disk': self.hits_disk,
+            'misses': self.misses,
+            'memory_entries': len(self._memory),
+            'disk_entries': len(self._disk_rows),
+        }
+
+
+# Global instance
+embedding_cache = EmbeddingCache(
+    cache_dir=settings.EMBEDDING_CACHE_DIR or None,
+    memory_size=settings.EMBEDDING_CACHE_MEMORY_SIZE
+)
+
+metrics.callback_counter(
+    "cvjm_embedding_cache_requests_total", "Embedding önbelleği istekleri (memory/disk isabet, miss)", ("result",),
+    lambda: {("memory",): embedding_cache.hits_memory, ("disk",): embedding_cache.hits_disk, ("miss",): embedding_cache.misses}
+)
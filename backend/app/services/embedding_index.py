@@ -0,0 +1,482 @@
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import func
+from typing import Callable, List, Dict, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.services.matcher import matcher
+from app.services.ann_index import IVFIndex
+from app.services.skill_index import SkillIncidence
+from app.services.nlp_engine import nlp_engine
+from app.services.metrics import rows_scored
+from app.utils.embedding import decode_embedding
+
+
+class EmbeddingIndex:
+    """Bellekte tutulan, L2 normalize edilmiş embedding matrisi, satır -> kayıt id eşlemesi
+    ve satırlarla hizalı seyrek yetenek (Skill.id) ilişki matrisi
+
+    Yetenek skoru her zaman "ilanın yeteneklerinin CV'de bulunan oranı"dır: ilan indeksinde
+    satırın (ilanın) yetenek sayısına, CV indeksinde (`skills_per_query=True`) sorgunun
+    (ilanın) yetenek sayısına bölünür.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 1024,
+        ann: Optional[IVFIndex] = None,
+        ann_min_size: int = 0,
+        changelog_size: int = 10000,
+        skills_per_query: bool = False,
+        name: str = ""
+    ):
+        self.name = name  # Metrik etiketi
+        self.initial_capacity = initial_capacity
+        self.skills_per_query = skills_per_query
+        self.ann = ann  # Büyük kataloglarda aday getirme için yaklaşık indeks (opsiyonel)
+        self.ann_min_size = ann_min_size
+        self._ann_thread: Optional[threading.Thread] = None
+        self._ann_thread_generation = -1
+        self._ann_generation = 0  # build() her çağrıldığında artar; eski eğitim sonuçları atılır
+        self.dim: Optional[int] = None
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._skills = SkillIncidence()
+        self._row_of: Dict[int, int] = {}
+        self._size = 0
+        self._lock = threading.RLock()
+        # Her değişiklikte artan sürüm ve son değişikliklerin (sürüm, id) günlüğü
+        self.version = 0
+        self._changes: "deque[Tuple[int, int]]" = deque(maxlen=changelog_size)
+        self._changes_floor = 0  # Bu sürümden eski değişiklikler günlükte yok
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._row_of
+
+    def ids(self) -> List[int]:
+        """İndeksteki kayıt id'leri"""
+        with self._lock:
+            return self._ids[:self._size].tolist()
+
+    def _record_change(self, item_id: int):
+        self.version += 1
+        if len(self._changes) == self._changes.maxlen:
+            self._changes_floor = self._changes[0][0]
+        self._changes.append((self.version, item_id))
+
+    def changes_since(self, version: int) -> Optional[List[int]]:
+        """Verilen sürümden sonra eklenen/güncellenen/silinen kayıt id'leri (günlük yetmezse None)"""
+        with self._lock:
+            if version < self._changes_floor:
+                return None
+            return list(dict.fromkeys(item_id for v, item_id in self._changes if v > version))
+
+    def _reserve(self, capacity: int):
+        """Matris kapasitesini (gerekirse iki katına çıkararak) büyüt"""
+        if capacity <= self._vectors.shape[0]:
+            return
+        new_capacity = max(capacity, self.initial_capacity, 2 * self._vectors.shape[0])
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        ids = np.zeros(new_capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._vectors, self._ids = vectors, ids
+
+    def build(self, items: Sequence[Tuple[int, Sequence[float], List[int]]]):
+        """İndeksi (id, embedding, yetenek id'leri) listesinden sıfırdan oluştur"""
+        items = [item for item in items if item[1] is not None and len(item[1]) > 0]
+        with self._lock:
+            self.dim = len(items[0][1]) if items else None
+            self._vectors = np.empty((0, self.dim or 0), dtype=np.float32)
+            self._ids = np.empty(0, dtype=np.int64)
+            self._skills = SkillIncidence()
+            self._row_of = {}
+            self._size = 0
+            self.version += 1
+            self._changes.clear()
+            self._changes_floor = self.version
+            self._ann_generation += 1
+            if self.ann is not None:
+                self.ann.reset()
+            if not items:
+                return
+            self._reserve(len(items))
+            matrix = np.asarray([item[1] for item in items], dtype=np.float32)
+            self._vectors[:len(items)] = matcher.normalize_rows(matrix)
+            for row, (item_id, _, skill_ids) in enumerate(items):
+                self._ids[row] = item_id
+                self._row_of[item_id] = row
+                self._skills.append_row(skill_ids)
+            self._size = len(items)
+            if self.ann is not None:
+                self._maybe_train_ann()
+
+    def add(self, item_id: int, embedding: Sequence[float], skill_ids: Optional[List[int]] = None):
+        """Kayıt ekle ya da mevcutsa güncelle"""
+        if embedding is None or len(embedding) == 0:
+            return
+        vector = matcher.normalize_rows(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            if self.dim is None:
+                self.dim = vector.shape[0]
+                self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            if vector.shape[0] != self.dim:
+                raise ValueError(f"Embedding boyutu uyumsuz: {vector.shape[0]} != {self.dim}")
+
+            row = self._row_of.get(item_id)
+            if row is None:
+                self._reserve(self._size + 1)
+                row = self._size
+                self._size += 1
+                self._row_of[item_id] = row
+                self._ids[row] = item_id
+                self._skills.append_row(skill_ids or [])
+            else:
+                self._skills.set_row(row, skill_ids or [])
+            self._vectors[row] = vector
+            self._record_change(item_id)
+            if self.ann is not None:
+                if self.ann.is_trained:
+                    self.ann.add(item_id, vector)
+                self._maybe_train_ann()
+
+    def add_many(self, items: Sequence[Tuple[int, Sequence[float], List[int]]]):
+        """Çok sayıda kaydı tek seferde ekle/güncelle (toplu içe aktarma sonrası)"""
+        items = [item for item in items if item[1] is not None and len(item[1]) > 0]
+        if not items:
+            return
+        matrix = matcher.normalize_rows(np.asarray([item[1] for item in items], dtype=np.float32))
+        with self._lock:
+            if self.dim is None:
+                self.dim = matrix.shape[1]
+                self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            if matrix.shape[1] != self.dim:
+                raise ValueError(f"Embedding boyutu uyumsuz: {matrix.shape[1]} != {self.dim}")
+
+            self._reserve(self._size + len(items))
+            for (item_id, _, skill_ids), vector in zip(items, matrix):
+                row = self._row_of.get(item_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._row_of[item_id] = row
+                    self._ids[row] = item_id
+                    self._skills.append_row(skill_ids or [])
+                else:
+                    self._skills.set_row(row, skill_ids or [])
+                    if self.ann is not None:
+                        self.ann.remove(item_id)
+                self._vectors[row] = vector
+                self._record_change(item_id)
+
+            if self.ann is not None:
+                if self.ann.is_trained:
+                    self.ann.add_many(np.asarray([item[0] for item in items], dtype=np.int64), matrix)
+                self._maybe_train_ann()
+
+    def remove(self, item_id: int) -> bool:
+        """Kaydı sil (son satırı boşalan satıra taşıyarak matrisi bitişik tut)"""
+        with self._lock:
+            row = self._row_of.pop(item_id, None)
+            if row is None:
+                return False
+            if self.ann is not None:
+                self.ann.remove(item_id)
+            last = self._size - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._vectors[row] = self._vectors[last]
+                self._ids[row] = moved_id
+                self._skills.move_row(last, row)
+                self._row_of[moved_id] = row
+            self._skills.pop_row()
+            self._size -= 1
+            self._record_change(item_id)
+            return True
+
+    def _maybe_train_ann(self):
+        """Kayıt sayısı eşiği geçtiyse (veya eğitimden beri çok büyüdüyse) ANN eğitimini arka planda başlat
+
+        Kilit altında çağrılır. k-means, matrisin bir kopyası üzerinde ayrı bir thread'de çalışır; bu
+        sırada aramalar mevcut ANN indeksiyle (ilk eğitimde tam taramayla) yanıtlanmaya devam eder.
+        """
+        if (self._ann_thread is not None and self._ann_thread.is_alive()
+                and self._ann_thread_generation == self._ann_generation):
+            return
+        if self._size < max(self.ann_min_size, 1):
+            return
+        if self.ann.is_trained and self._size < settings.ANN_RETRAIN_FACTOR * self.ann.trained_size:
+            return
+        vectors = self._vectors[:self._size].copy()
+        ids = self._ids[:self._size].copy()
+        self._ann_thread = threading.Thread(
+            target=self._train_ann, args=(vectors, ids, self.version, self._ann_generation),
+            name=f"ann-train-{self.name}", daemon=True
+        )
+        self._ann_thread_generation = self._ann_generation
+        self._ann_thread.start()
+
+    def _train_ann(self, vectors: np.ndarray, ids: np.ndarray, version: int, generation: int):
+        """Anlık görüntüden yeni IVF indeksi eğit; eğitim sırasındaki değişiklikleri uygulayıp kilit altında değiştir"""
+        ann = self.ann.clone_empty()
+        ann.train(vectors)
+        ann.add_many(ids, vectors)
+        with self._lock:
+            if generation != self._ann_generation:
+                return
+            changed = self.changes_since(version)
+            if changed is None:
+                # Günlük yetmedi: tüm kayıtlar yeni kümelere yeniden atanır
+                for item_id in ids.tolist():
+                    ann.remove(item_id)
+                ann.add_many(self._ids[:self._size], self._vectors[:self._size])
+            else:
+                for item_id in changed:
+                    row = self._row_of.get(item_id)
+                    if row is None:
+                        ann.remove(item_id)
+                    else:
+                        ann.add(item_id, self._vectors[row])
+            self.ann = ann
+
+    def wait_for_ann(self, timeout: Optional[float] = None):
+        """Süren ANN eğitimi varsa bitmesini bekle (benchmark ve testler için)"""
+        thread = self._ann_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        skill_ids: List[int],
+        top_k: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """En iyi k kaydı skorlarıyla döndür: (id'ler, final, benzerlik, yetenek) - azalan sırada, 0-1 aralığında
+
+        ANN indeksi eğitilmişse ve `top_k` verilmişse adaylar IVF'ten alınıp tam olarak yeniden
+        skorlanır; aksi halde tüm kayıtlar taranır.
+        """
+        with self._lock:
+            if self._size == 0:
+                empty = np.empty(0, dtype=np.float32)
+                return np.empty(0, dtype=np.int64), empty, empty, empty
+            if len(embedding) != self.dim:
+                raise ValueError(f"Embedding boyutu uyumsuz: {len(embedding)} != {self.dim}")
+
+            rows = None
+            if top_k is not None and self.ann is not None and self.ann.is_trained:
+                query = matcher.normalize_rows(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0]
+                candidate_ids = self.ann.search(query, nprobe=nprobe)
+                if len(candidate_ids) >= top_k:
+                    rows = np.fromiter(
+                        (self._row_of[i] for i in candidate_ids.tolist()), dtype=np.int64, count=len(candidate_ids)
+                    )
+
+            if rows is None:
+                rows = np.arange(self._size)
+                skill_scores = self._skills.skill_scores(skill_ids, per_query=self.skills_per_query)
+                final_scores, similarities = matcher.score_batch(
+                    embedding, self._vectors[:self._size], skill_scores, normalized=True
+                )
+            else:
+                skill_scores = self._skills.skill_scores(skill_ids, rows, per_query=self.skills_per_query)
+                final_scores, similarities = matcher.score_batch(
+                    embedding, self._vectors, skill_scores, normalized=True, candidate_rows=rows
+                )
+
+            order = matcher.top_k_indices(final_scores, top_k)
+            ids = self._ids[rows[order]]
+        rows_scored.inc(len(rows), index=self.name)
+        return ids, final_scores[order], similarities[order], skill_scores[order]
+
+    def score_ids(
+        self,
+        embedding: Sequence[float],
+        skill_ids: List[int],
+        item_ids: List[int]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Yalnızca verilen kayıtları skorla (indekste olmayanlar atlanır); search ile aynı biçimde döndürür"""
+        with self._lock:
+            rows = np.fromiter(
+                (self._row_of[i] for i in item_ids if i in self._row_of), dtype=np.int64
+            )
+            if rows.shape[0] == 0:
+                empty = np.empty(0, dtype=np.float32)
+                return np.empty(0, dtype=np.int64), empty, empty, empty
+            if len(embedding) != self.dim:
+                raise ValueError(f"Embedding boyutu uyumsuz: {len(embedding)} != {self.dim}")
+            skill_scores = self._skills.skill_scores(skill_ids, rows, per_query=self.skills_per_query)
+            final_scores, similarities = matcher.score_batch(
+                embedding, self._vectors, skill_scores, normalized=True, candidate_rows=rows
+            )
+            order = matcher.top_k_indices(final_scores, None)
+            ids = self._ids[rows[order]]
+        rows_scored.inc(len(rows), index=self.name)
+        return ids, final_scores[order], similarities[order], skill_scores[order]
+
+    def get_skill_ids(self, item_id: int) -> List[int]:
+        """Kaydın indekslenmiş yetenek id'lerini getir"""
+        with self._lock:
+            row = self._row_of.get(item_id)
+            return self._skills.row_skills(row).tolist() if row is not None else []
+
+
+class IndexSync:
+    """Bellek içi indeksi veritabanıyla eşitler
+
+    Her süreç (uvicorn worker'ları, CLI komutları) kendi indeksini tutar. Başka bir sürecin
+    eklediği, güncellediği veya sildiği kayıtlar, aramadan önce çağrılan `refresh` ile alınır:
+    en fazla INDEX_REFRESH_INTERVAL saniyede bir (kayıt sayısı, en son updated_at) damgası okunur.
+    Damga değiştiyse son güncellenen kayıtlar yeniden yüklenir. Sayı indeksle tutmuyorsa eksik
+    ve silinmiş kayıtlar id kümeleri karşılaştırılarak bulunur.
+
+    Etkin modelle üretilmemiş embedding'ler STALE_EMBEDDING_POLICY'ye göre dışarıda bırakılır
+    ya da sıfır vektörle (yalnızca yetenek skoruyla sıralanacak şekilde) eklenir.
+    """
+
+    # Geç commit edilen kayıtları kaçırmamak için son damganın bu kadar gerisinden okunur
+    LOOKBACK = timedelta(seconds=60)
+
+    def __init__(self, index: EmbeddingIndex, tables: Callable[[], Tuple]):
+        self.index = index
+        # () -> (model, ilişki tablosunun kayıt id sütunu, skill_id sütunu, ek filtreler);
+        # modeller ilk kullanımda import edilir
+        self._tables = tables
+        self._stamp: Optional[Tuple] = None
+        self._latest: Optional[datetime] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _conditions(self) -> List:
+        model, _, _, filters = self._tables()
+        conditions = [model.embedding.isnot(None), *filters]
+        if settings.STALE_EMBEDDING_POLICY == "ignore":
+            conditions.append(model.embedding_model.in_(nlp_engine.compatible_versions))
+        return conditions
+
+    def _read_stamp(self, db) -> Tuple:
+        model = self._tables()[0]
+        return tuple(db.query(func.count(model.id), func.max(model.updated_at)).filter(*self._conditions()).one())
+
+    def _read_items(self, db, *criteria) -> List[Tuple[int, np.ndarray, List[int]]]:
+        """Koşula uyan kayıtları (id, embedding, yetenek id'leri) olarak oku"""
+        model, link_id, link_skill_id, _ = self._tables()
+
+        # Yalnızca gereken sütunlar, parça parça okunur
+        rows = db.query(model.id, model.embedding, model.embedding_model).filter(
+            *self._conditions(), *criteria
+        ).yield_per(1000)
+        fresh, stale_ids = [], []
+        for item_id, data, version in rows:
+            if not nlp_engine.is_current(version):
+                stale_ids.append(item_id)
+                continue
+            embedding = decode_embedding(data)
+            if embedding is not None:
+                fresh.append((item_id, embedding))
+
+        # (kayıt, yetenek) çiftleri: tam yüklemede tek sorguda, kısmi yüklemede id parçalarıyla
+        ids = [item_id for item_id, _ in fresh] + stale_ids
+        skills_by_item = defaultdict(list)
+        if criteria:
+            for start in range(0, len(ids), 1000):
+                chunk = ids[start:start + 1000]
+                for item_id, skill_id in db.query(link_id, link_skill_id).filter(link_id.in_(chunk)):
+                    skills_by_item[item_id].append(skill_id)
+        elif ids:
+            for item_id, skill_id in db.query(link_id, link_skill_id):
+                skills_by_item[item_id].append(skill_id)
+
+        items = [(item_id, embedding, skills_by_item.get(item_id, [])) for item_id, embedding in fresh]
+        if stale_ids:
+            print(f"{len(stale_ids)} kayıt eski model embedding'ine sahip ({settings.STALE_EMBEDDING_POLICY})")
+            dim = self.index.dim or (len(items[0][1]) if items else nlp_engine.embedding_dim())
+            zero = np.zeros(dim, dtype=np.float32)
+            items.extend((item_id, zero, skills_by_item.get(item_id, [])) for item_id in stale_ids)
+        return items
+
+    def load(self, db) -> EmbeddingIndex:
+        """İndeksi veritabanından sıfırdan oluştur (uygulama açılışında)"""
+        with self._lock:
+            stamp = self._read_stamp(db)
+            self.index.build(self._read_items(db))
+            self._stamp, self._latest = stamp, stamp[1]
+            self._checked_at = time.monotonic()
+        return self.index
+
+    def refresh(self, db) -> bool:
+        """Veritabanı indeksin son eşitlenmesinden beri değiştiyse farkı indekse uygula"""
+        if time.monotonic() - self._checked_at < settings.INDEX_REFRESH_INTERVAL:
+            return False
+        # Başka bir thread zaten eşitliyorsa onu beklemeden mevcut indeksle devam et
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked_at = time.monotonic()
+            model = self._tables()[0]
+            stamp = self._read_stamp(db)
+            if stamp == self._stamp:
+                return False
+            count, latest = stamp
+
+            if self._latest is not None:
+                self.index.add_many(self._read_items(db, model.updated_at >= self._latest - self.LOOKBACK))
+            if len(self.index) != count or self._latest is None:
+                db_ids = {item_id for (item_id,) in db.query(model.id).filter(*self._conditions())}
+                indexed = set(self.index.ids())
+                for item_id in indexed - db_ids:
+                    self.index.remove(item_id)
+                missing = sorted(db_ids - indexed)
+                for start in range(0, len(missing), 1000):
+                    self.index.add_many(self._read_items(db, model.id.in_(missing[start:start + 1000])))
+
+            self._stamp, self._latest = stamp, latest
+            return True
+        finally:
+            self._lock.release()
+
+
+def _job_tables():
+    from app.models.job import Job, JobSkill
+
+    return Job, JobSkill.job_id, JobSkill.skill_id, []
+
+
+def _cv_tables():
+    from app.models.cv import CV, CVStatus
+    from app.models.job import CVSkill
+
+    return CV, CVSkill.cv_id, CVSkill.skill_id, [CV.status == CVStatus.READY]
+
+
+def load_job_index(db) -> EmbeddingIndex:
+    """İş ilanı indeksini veritabanından doldur (uygulama açılışında bir kez)"""
+    return job_index_sync.load(db)
+
+
+def load_cv_index(db) -> EmbeddingIndex:
+    """İşlenmiş CV'lerin indeksini veritabanından doldur (uygulama açılışında bir kez)"""
+    return cv_index_sync.load(db)
+
+
+# Global instances
+job_index = EmbeddingIndex(
+    ann=IVFIndex(nlist=settings.ANN_NLIST, nprobe=settings.ANN_NPROBE) if settings.ANN_ENABLED else None,
+    ann_min_size=settings.ANN_MIN_SIZE,
+    name="job"
+)
+cv_index = EmbeddingIndex(
+    ann=IVFIndex(nlist=settings.ANN_NLIST, nprobe=settings.ANN_NPROBE) if settings.ANN_ENABLED else None,
+    ann_min_size=settings.ANN_MIN_SIZE,
+    skills_per_query=True,
+    name="cv"
+)
+job_index_sync = IndexSync(job_index, _job_tables)
+cv_index_sync = IndexSync(cv_index, _cv_tables)
@@ -0,0 +1,156 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import Optional
+
+import torch
+
+from app.config import settings
+from app.services.nlp_engine import nlp_engine
+
+# Sunucu üzerinden çağrılabilen NLPEngine metotları
+REMOTE_METHODS = ("_compute_embeddings", "_embed_windows")
+
+
+def server_authkey() -> bytes:
+    """Soket bağlantılarının kimlik doğrulamasında kullanılan anahtar"""
+    return (settings.EMBEDDING_SERVER_AUTHKEY or settings.SECRET_KEY).encode("utf-8")
+
+
+def _worker_init(threads: int):
+    # Her worker sabit sayıda thread kullanır; N worker çekirdekleri aşırı paylaşmaz
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+
+def _worker_call(method: str, *args):
+    return getattr(nlp_engine, method)(*args)
+
+
+def _noop():
+    return os.getpid()
+
+
+class EmbeddingWorkerPool:
+    """BERT çıkarımı için ayrılmış worker süreç havuzu
+
+    Model ana süreçte bir kez yüklenir, parametreleri paylaşımlı belleğe taşınır ve worker'lar
+    ardından fork edilir; böylece N worker modelin tek bir fiziksel kopyasını paylaşır.
+    Ana süreç fork'tan önce hiç ileri geçiş yapmaz (OpenMP thread havuzu fork'a taşınmaz).
+    """
+
+    def __init__(self, workers: int = 2, threads: int = 1):
+        self.workers = workers
+        self.threads = threads
+        self.worker_pids = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        nlp_engine.remote = None
+        nlp_engine.load_model()
+        try:
+            nlp_engine.model.share_memory()
+        except Exception as e:
+            # Kuantize modüllerin paketli ağırlıkları taşınamayabilir; fork'un copy-on-write paylaşımı kalır
+            print(f"Model paylaşımlı belleğe taşınamadı: {e}")
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_worker_init,
+            initargs=(self.threads,)
+        )
+        self.worker_pids = sorted({f.result() for f in [self._pool.submit(_noop) for _ in range(self.workers)]})
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def call(self, method: str, *args):
+        """NLPEngine metodunu boşta olan bir worker'da çalıştır ve sonucunu bekle"""
+        if method not in REMOTE_METHODS:
+            raise ValueError(f"Desteklenmeyen metot: {method}")
+        return self._pool.submit(_worker_call, method, *args).result()
+
+    def serve(self, address: str, authkey: Optional[bytes] = None):
+        """Unix soketinden gelen istekleri havuza ilet (her bağlantı ayrı thread'de)
+
+        İstekler pickle ile taşındığından soket yalnızca sahibine açık oluşturulur ve her
+        bağlantı paylaşılan anahtarla doğrulanır; anahtarı bilmeyen istemci reddedilir.
+        """
+        if os.path.exists(address):
+            os.remove(address)
+        # Soket dosyası oluştuğu anda 0600 olsun (chmod'a kadar açık kalmasın)
+        old_umask = os.umask(0o077)
+        try:
+            listener = Listener(address, family="AF_UNIX", authkey=authkey or server_authkey())
+        finally:
+            os.umask(old_umask)
+        os.chmod(address, 0o600)
+        with listener:
+            print(f"Embedding sunucusu hazır: {address} ({self.workers} worker x {self.threads} thread)")
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, EOFError, OSError) as e:
+                    print(f"Embedding sunucusu bağlantıyı reddetti: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    method, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(("ok", self.call(method, *args)))
+                except Exception as e:
+                    conn.send(("error", str(e)))
+
+
+class EmbeddingClient:
+    """API süreçlerinden embedding sunucusuna yerel IPC (Unix soketi) istemcisi
+
+    Her thread kendi bağlantısını kullanır; kopan bağlantı bir kez yeniden kurulur.
+    """
+
+    def __init__(self, address: str, authkey: Optional[bytes] = None):
+        self.address = address
+        self.authkey = authkey or server_authkey()
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def call(self, method: str, *args):
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send((method, args))
+                status, result = conn.recv()
+                break
+            except (EOFError, OSError):
+                self._local.conn = None
+                if attempt:
+                    raise
+        if status != "ok":
+            raise RuntimeError(f"Embedding sunucusu hatası: {result}")
+        return result
+
+
+def connect_remote() -> bool:
+    """EMBEDDING_SERVER_ADDRESS ayarlıysa bu süreçteki çıkarımı embedding sunucusuna yönlendir"""
+    if not settings.EMBEDDING_SERVER_ADDRESS:
+        return False
+    nlp_engine.remote = EmbeddingClient(settings.EMBEDDING_SERVER_ADDRESS)
+    return True
@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from app.config import settings
+
+
+def _noop():
+    return None
+
+
+class StageExecutors:
+    """CPU yoğun aşamalar için ayrılmış executor'lar
+
+    PDF parse işlemi ayrı süreçlerde (GIL dışında), BERT çıkarımı ise boyutu sınırlı bir
+    thread havuzunda çalışır; böylece ne event loop ne de diğer istekler bloklanır.
+    """
+
+    def __init__(self, parse_workers: int = 2, embed_threads: int = 1):
+        self.parse_workers = parse_workers
+        self.embed_threads = embed_threads
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._embed_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Havuzları oluştur; parse süreçlerini model yüklenmeden ve thread'ler başlamadan önce fork et"""
+        self._parse()
+        self._embed()
+
+    def _parse(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._parse_pool is None and self.parse_workers > 0:
+                self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+                # Tüm worker süreçlerinin şimdi oluşması için havuzu ısıt
+                for future in [self._parse_pool.submit(_noop) for _ in range(self.parse_workers)]:
+                    future.result()
+            return self._parse_pool
+
+    def _embed(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._embed_pool is None:
+                self._embed_pool = ThreadPoolExecutor(
+                    max_workers=max(1, self.embed_threads), thread_name_prefix="embed"
+                )
+            return self._embed_pool
+
+    def shutdown(self):
+        with self._lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=True)
+                self._parse_pool = None
+            if self._embed_pool is not None:
+                self._embed_pool.shutdown(wait=True)
+                self._embed_pool = None
+
+    def parse(self, fn: Callable, *args):
+        """PDF parse fonksiyonunu süreç havuzunda çalıştır ve sonucunu bekle"""
+        pool = self._parse()
+        if pool is None:
+            return fn(*args)
+        return pool.submit(fn, *args).result()
+
+    def parse_map(self, fn: Callable, args_list: Iterable[tuple]) -> List:
+        """fn'i her argüman demeti için süreç havuzuna dağıt; sonuçları giriş sırasıyla döndür"""
+        pool = self._parse()
+        if pool is None:
+            return [fn(*args) for args in args_list]
+        futures = [pool.submit(fn, *args) for args in args_list]
+        return [future.result() for future in futures]
+    
+    def embed(self, fn: Callable, *args):
+        """Embedding fonksiyonunu sınırlı thread havuzunda çalıştır ve sonucunu bekle"""
+        return self._embed().submit(fn, *args).result()
+
+
+# Global instance
+executors = StageExecutors(
+    parse_workers=settings.PARSE_WORKERS,
+    embed_threads=settings.EMBED_THREADS
+)
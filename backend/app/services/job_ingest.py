@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.services.nlp_engine import nlp_engine
+from app.services.skill_dictionary import skill_dictionary
+from app.utils.embedding import encode_embedding
+
+JOB_FIELDS = ("title", "company", "location", "description", "requirements")
+
+
+@dataclass
+class IngestReport:
+    """Toplu içe aktarma sonucu; `offset` girdide işlenen (kaydedilen veya atlanan) kayıt sayısıdır"""
+    offset: int = 0
+    inserted: int = 0
+    invalid: int = 0
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.inserted / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'offset': self.offset,
+            'inserted': self.inserted,
+            'invalid': self.invalid,
+            'elapsed_seconds': round(self.elapsed, 2),
+            'jobs_per_second': round(self.jobs_per_second, 2),
+            'errors': self.errors[:20]
+        }
+
+
+class IngestError(Exception):
+    """İçe aktarma yarıda kesildi; `report.offset` devam noktasıdır"""
+
+    def __init__(self, report: IngestReport, message: str):
+        super().__init__(message)
+        self.report = report
+
+
+def iter_job_records(stream: IO[bytes], fmt: str) -> Iterator[Dict]:
+    """JSONL veya CSV girdisini satır satır oku (dosyanın tamamı belleğe alınmaz)"""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "jsonl":
+        for line in text:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield {}  # Bozuk satır geçersiz kayıt olarak sayılır
+    elif fmt == "csv":
+        yield from csv.DictReader(text)
+    else:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+
+
+class JobIngestor:
+    """İş ilanlarını parça parça içe aktarır: yetenek çıkarma, toplu embedding, toplu INSERT
+
+    Her parça kendi transaction'ında commit edilir; yarıda kalan bir içe aktarma rapordaki
+    `offset`ten (`skip`) devam ettirilebilir. Bellek içi indeksler doğrudan güncellenmez; çalışan
+    API süreçleri yeni ilanları `job_index_sync` yenilemesiyle (INDEX_REFRESH_INTERVAL) görür.
+    """
+
+    def __init__(self, chunk_size: int = 512, embed_batch_size: int = 32):
+        self.chunk_size = chunk_size
+        self.embed_batch_size = embed_batch_size
+
+    def ingest(
+        self,
+        db: Session,
+        records: Iterable[Dict],
+        skip: int = 0,
+        embed: Optional[Callable[[List[str]], np.ndarray]] = None,
+        on_chunk: Optional[Callable[[IngestReport], None]] = None
+    ) -> IngestReport:
+        embed = embed or (lambda texts: nlp_engine.embed_texts(texts, batch_size=self.embed_batch_size))
+        report = IngestReport(offset=skip)
+        start = time.perf_counter()
+
+        records = islice(records, skip, None)
+        try:
+            while True:
+                chunk = list(islice(records, self.chunk_size))
+                if not chunk:
+                    break
+                self._ingest_chunk(db, chunk, embed, report)
+                report.offset += len(chunk)
+                report.elapsed = time.perf_counter() - start
+                if on_chunk:
+                    on_chunk(report)
+        except Exception as e:
+            raise IngestError(report, str(e)) from e
+        finally:
+            report.elapsed = time.perf_counter() - start
+        return report
+
+    def _ingest_chunk(self, db: Session, chunk: List[Dict], embed, report: IngestReport):
+        rows = []
+        for i, record in enumerate(chunk):
+            row = {name: (str(record.get(name) or '').strip() or None) for name in JOB_FIELDS}
+            if not row['title'] or not row['description']:
+                report.invalid += 1
+                if len(report.errors) < 100:
+                    report.errors.append(f"Kayıt {report.offset + i + 1}: başlık ve açıklama zorunlu")
+                continue
+            rows.append(row)
+        if not rows:
+            return
+
+        # create_job ile aynı metin; embedding'ler uzunluğa göre gruplanmış büyük batch'lerle
+        texts = [f"{row['title']} {row['description']} {row['requirements'] or ''}" for row in rows]
+        skills = [nlp_engine.extract_skills(text) for text in texts]
+        embeddings = embed(texts)
+        for row, embedding in zip(rows, embeddings):
+            row['embedding'] = encode_embedding(embedding)
+            row['embedding_dim'] = len(embedding)
+            row['embedding_model'] = nlp_engine.model_version
+
+        try:
+            job_ids = db.execute(
+                insert(Job).returning(Job.id, sort_by_parameter_order=True), rows
+            ).scalars().all()
+            skill_dictionary.add_jobs_skills(db, list(zip(job_ids, skills)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        report.inserted += len(rows)
+
+
+# Global instance
+job_ingestor = JobIngestor()
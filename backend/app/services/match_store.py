@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.job import Job, Match
+from app.utils.db import dialect_insert
+
+
+class MatchStore:
+    """Eşleştirme sonuçlarını (cv_id, job_id) anahtarıyla toplu upsert eden depo"""
+
+    def __init__(self, chunk_size: int = 1000):
+        self.chunk_size = chunk_size
+
+    def save(self, db: Session, cv_id: int, results: List[Dict], top_k: int = 0) -> int:
+        """Sonuçları tek transaction içinde upsert et; `top_k` > 0 ise yalnızca ilk k sonuç saklanır
+
+        `results` final skora göre azalan sıralı olmalı ve her eleman `job_id`, `final_score`,
+        `skill_match` alanlarını içermelidir.
+        """
+        if top_k > 0:
+            results = results[:top_k]
+        # İndeks başka bir süreçte silinen ilanları henüz görmemiş olabilir (yabancı anahtar hatası vermesin)
+        job_ids = [result['job_id'] for result in results]
+        existing = set()
+        for start in range(0, len(job_ids), self.chunk_size):
+            chunk = job_ids[start:start + self.chunk_size]
+            existing.update(job_id for (job_id,) in db.query(Job.id).filter(Job.id.in_(chunk)))
+        results = [result for result in results if result['job_id'] in existing]
+        if not results:
+            return 0
+
+        now = datetime.utcnow()
+        rows = [{
+            'cv_id': cv_id,
+            'job_id': result['job_id'],
+            'similarity_score': result['final_score'],
+            'skill_match_score': result['skill_match'],
+            'created_at': now,
+            'updated_at': now
+        } for result in results]
+
+        for start in range(0, len(rows), self.chunk_size):
+            stmt = dialect_insert(db, Match.__table__).values(rows[start:start + self.chunk_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['cv_id', 'job_id'],
+                set_={
+                    'similarity_score': stmt.excluded.similarity_score,
+                    'skill_match_score': stmt.excluded.skill_match_score,
+                    'updated_at': stmt.excluded.updated_at
+                }
+            )
+            db.execute(stmt)
+        db.commit()
+        return len(rows)
+
+    def cleanup(self, db: Session, older_than_days: int = None) -> int:
+        """Belirtilen günden uzun süredir güncellenmemiş eşleşmeleri sil"""
+        days = settings.MATCH_RETENTION_DAYS if older_than_days is None else older_than_days
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        deleted = db.query(Match).filter(Match.updated_at < cutoff).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+
+# Global instance
+match_store = MatchStore()
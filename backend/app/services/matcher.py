@@ -1,6 +1,6 @@
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Sequence
 
 
 class CVJobMatcher:
@@ -49,32 +49,111 @@ class CVJobMatcher:
             'skill_match': round(skill_match * 100, 2)
         }
     
+    def normalize_rows(self, matrix: np.ndarray) -> np.ndarray:
+        """Matris satırlarını L2 normuna göre normalize et (sıfır vektörler sıfır kalır)"""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def calculate_skill_matches(self, cv_skills: List[str], jobs_skills: Sequence[List[str]]) -> np.ndarray:
+        """Bir CV'nin yeteneklerini birden çok iş ilanıyla karşılaştır (iş başına 0-1 oran)"""
+        cv_skills_set = {s.lower() for s in cv_skills}
+        scores = np.zeros(len(jobs_skills), dtype=np.float32)
+        for i, job_skills in enumerate(jobs_skills):
+            if job_skills:
+                matched = sum(1 for skill in job_skills if skill.lower() in cv_skills_set)
+                scores[i] = matched / len(job_skills)
+        return scores
+    
+    def top_k_indices(self, scores: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+        """En yüksek k skorun indekslerini azalan sırada döndür (kısmi seçim ile)"""
+        n = scores.shape[0]
+        if top_k is None or top_k >= n:
+            return np.argsort(-scores, kind="stable")
+        if top_k <= 0:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+    
+    def score_batch(
+        self,
+        cv_embedding: Sequence[float],
+        job_embeddings: np.ndarray,
+        skill_scores: Optional[np.ndarray] = None,
+        normalized: bool = False,
+        candidate_rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Tek CV vektörünü tüm iş embedding matrisiyle skorla (final, benzerlik) - 0-1 aralığında
+
+        `candidate_rows` verilirse (ör. ANN indeksinden gelen adaylar) yalnızca o satırlar
+        tam olarak skorlanır; `skill_scores` bu durumda adaylarla aynı sırada olmalıdır.
+        """
+        cv_vec = self.normalize_rows(np.asarray(cv_embedding, dtype=np.float32).reshape(1, -1))[0]
+        if candidate_rows is not None:
+            job_embeddings = job_embeddings[candidate_rows]
+        job_matrix = job_embeddings if normalized else self.normalize_rows(job_embeddings)
+        
+        # Tek matris-vektör çarpımı ile tüm cosine similarity değerleri
+        similarities = job_matrix @ cv_vec
+        if skill_scores is None:
+            skill_scores = np.zeros_like(similarities)
+        
+        # %60 embedding benzerliği + %40 yetenek eşleşmesi
+        final_scores = (0.6 * similarities) + (0.4 * skill_scores)
+        return final_scores, similarities
+    
+    def match_top_k(
+        self,
+        cv_embedding: Sequence[float],
+        job_embeddings: np.ndarray,
+        skill_scores: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None,
+        normalized: bool = False
+    ) -> List[Dict]:
+        """Toplu skorlama yapıp en iyi k iş ilanını skorlarıyla birlikte döndür"""
+        if len(job_embeddings) == 0:
+            return []
+        if skill_scores is None:
+            skill_scores = np.zeros(len(job_embeddings), dtype=np.float32)
+        final_scores, similarities = self.score_batch(
+            cv_embedding, job_embeddings, skill_scores, normalized=normalized
+        )
+        
+        results = []
+        for idx in self.top_k_indices(final_scores, top_k):
+            results.append({
+                'index': int(idx),
+                'final_score': round(float(final_scores[idx]) * 100, 2),  # Yüzde olarak
+                'embedding_similarity': round(float(similarities[idx]) * 100, 2),
+                'skill_match': round(float(skill_scores[idx]) * 100, 2)
+            })
+        return results
+    
     def rank_jobs_for_cv(
         self,
         cv_embedding: List[float],
         cv_skills: List[str],
-        jobs: List[Dict]
+        jobs: List[Dict],
+        top_k: Optional[int] = None
     ) -> List[Dict]:
         """CV için iş ilanlarını sırala"""
-        ranked_jobs = []
+        jobs = [job for job in jobs if job.get('embedding')]
+        if not jobs:
+            return []
         
-        for job in jobs:
-            job_embedding = job.get('embedding', [])
-            job_skills = job.get('skills', [])
-            
-            if job_embedding:
-                scores = self.calculate_match_score(
-                    cv_embedding, job_embedding, cv_skills, job_skills
-                )
-                ranked_jobs.append({
-                    'job_id': job['id'],
-                    'title': job['title'],
-                    'company': job.get('company', ''),
-                    'scores': scores
-                })
+        job_embeddings = np.asarray([job['embedding'] for job in jobs], dtype=np.float32)
+        skill_scores = self.calculate_skill_matches(cv_skills, [job.get('skills', []) for job in jobs])
         
-        # Final skora göre sırala
-        ranked_jobs.sort(key=lambda x: x['scores']['final_score'], reverse=True)
+        ranked_jobs = []
+        for result in self.match_top_k(cv_embedding, job_embeddings, skill_scores, top_k=top_k):
+            job = jobs[result.pop('index')]
+            ranked_jobs.append({
+                'job_id': job['id'],
+                'title': job['title'],
+                'company': job.get('company', ''),
+                'scores': result
+            })
         
         return ranked_jobs
 
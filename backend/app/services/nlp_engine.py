@@ -1,18 +1,65 @@
-from transformers import AutoTokenizer, AutoModel
+from transformers import AutoConfig, AutoTokenizer, AutoModel
 import torch
-import numpy as np
-from typing import List, Dict
+import os
 import re
+import threading
+import time
+import numpy as np
+from typing import List, Dict, Iterable, Optional
+from collections import Counter
+
+from app.config import settings
+from app.services.cv_parser import cv_parser
+from app.services.embedding_cache import embedding_cache
+from app.services.metrics import embedding_batch_size, embedding_texts, model_load_seconds
+
+
+def compile_keyword_pattern(keywords: Iterable[str]) -> "re.Pattern":
+    """Anahtar kelimelerden tek geçişte eşleşen, trie yapısında bir regex derle
+
+    Ortak önekler paylaşıldığı için maliyet sözlük boyutuyla değil metin uzunluğuyla artar.
+    Eşleşmeler kelime sınırına oturmalıdır; çakışan adaylardan en uzunu seçilir.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        if not keyword:
+            continue
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # Kelime sonu işareti
+
+    def to_regex(node: Dict) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        pattern = '(?:' + '|'.join(branches) + ')'
+        return pattern + '?' if is_end else pattern
+
+    return re.compile(r'(?<!\w)(' + to_regex(trie) + r')(?!\w)')
 
 
 class NLPEngine:
     """BERT tabanlı NLP işlemleri"""
     
-    def __init__(self):
-        self.model_name = "dbmdz/bert-base-turkish-cased"
+    BACKENDS = ("fp32", "int8")
+    
+    def __init__(self, backend: Optional[str] = None):
+        self.model_name = settings.EMBEDDING_MODEL_NAME
+        self.model_revision = settings.EMBEDDING_MODEL_REVISION or None
+        self.backend = backend or settings.EMBEDDING_BACKEND
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Bilinmeyen çıkarım backend'i: {self.backend}")
         self.tokenizer = None
         self.model = None
         self.is_loaded = False
+        self.is_warm = False
+        self.remote = None  # Ayarlıysa çıkarım embedding sunucusunda yapılır (EmbeddingClient)
+        self.load_error: Optional[str] = None
+        self._load_lock = threading.Lock()
         
         # Yaygın teknik yetenekler listesi
         self.skill_keywords = [
@@ -29,52 +76,307 @@ class NLPEngine:
             # Diğer
             'git', 'agile', 'scrum', 'rest api', 'graphql', 'microservices', 'unit test', 'jira'
         ]
+        self.set_skill_keywords(self.skill_keywords)
+    
+    def set_skill_keywords(self, keywords: List[str]):
+        """Yetenek sözlüğünü değiştir ve eşleştiriciyi bir kez derle"""
+        self.skill_keywords = list(dict.fromkeys(k.lower() for k in keywords if k))
+        self._skill_order = {skill: i for i, skill in enumerate(self.skill_keywords)}
+        self._skill_pattern = compile_keyword_pattern(self.skill_keywords)
     
     def load_model(self):
-        """BERT modelini yükle"""
-        if not self.is_loaded:
-            print("BERT modeli yükleniyor...")
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModel.from_pretrained(self.model_name)
-            self.model.eval()
-            self.is_loaded = True
-            print("Model yüklendi!")
-    
-    def get_embedding(self, text: str) -> List[float]:
-        """Metin için BERT embedding oluştur"""
+        """BERT modelini yükle (eşzamanlı ilk istekler modeli yalnızca bir kez yükler)"""
+        if self.is_loaded:
+            return
+        with self._load_lock:
+            if not self.is_loaded:
+                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, revision=self.model_revision)
+                if self.remote is not None:
+                    # Model sunucuda; bu süreçte yalnızca tokenizer gerekir
+                    self.is_loaded = True
+                    return
+                print("BERT modeli yükleniyor...")
+                start = time.perf_counter()
+                if self.backend == "int8":
+                    self.model = self._load_quantized_model()
+                else:
+                    self.model = AutoModel.from_pretrained(self.model_name, revision=self.model_revision)
+                self.model.eval()
+                self.is_loaded = True
+                model_load_seconds.set(time.perf_counter() - start)
+                print("Model yüklendi!")
+    
+    @property
+    def embedding_space(self) -> str:
+        """Vektör uzayını belirleyen model adı ve sürümü; aynı uzaydaki embedding'ler karşılaştırılabilir"""
+        return f"{self.model_name}@{self.model_revision}" if self.model_revision else self.model_name
+    
+    @property
+    def model_version(self) -> str:
+        """Embedding'leri üreten modeli ve backend'i tanımlayan ad (kayıtlarda ve önbellek anahtarlarında)"""
+        return self.embedding_space if self.backend == "fp32" else f"{self.embedding_space}#{self.backend}"
+    
+    @property
+    def compatible_versions(self) -> List[str]:
+        """Etkin modelle karşılaştırılabilir kayıtlı sürümler (backend'ler aynı uzayı üretir)"""
+        return [self.embedding_space if backend == "fp32" else f"{self.embedding_space}#{backend}"
+                for backend in self.BACKENDS]
+    
+    def is_current(self, version: Optional[str]) -> bool:
+        """Kayıtlı embedding etkin modelin vektör uzayında mı"""
+        return version is not None and version.split("#", 1)[0] == self.embedding_space
+    
+    def embedding_dim(self) -> int:
+        """Etkin modelin embedding boyutu (model yüklenmeden, yalnızca yapılandırmadan)"""
+        if self.model is not None:
+            return self.model.config.hidden_size
+        return AutoConfig.from_pretrained(self.model_name, revision=self.model_revision).hidden_size
+    
+    def _quantized_model_path(self) -> str:
+        safe_name = re.sub(r"[^\w.-]+", "_", self.embedding_space).strip("_")
+        return os.path.join(settings.QUANTIZED_MODEL_DIR, f"{safe_name}-int8-torch{torch.__version__}.pt")
+    
+    def _load_quantized_model(self):
+        """Dinamik INT8 kuantize modeli diskten yükle; yoksa fp32 modeli kuantize edip kaydet"""
+        path = self._quantized_model_path() if settings.QUANTIZED_MODEL_DIR else None
+        if path and os.path.exists(path):
+            try:
+                # Dosyayı bu uygulama yazdı; kuantize modüller yalnızca tam pickle ile yüklenebiliyor
+                return torch.load(path, weights_only=False)
+            except Exception as e:
+                print(f"Kuantize model önbelleği okunamadı, yeniden oluşturuluyor: {e}")
+        
+        model = AutoModel.from_pretrained(self.model_name, revision=self.model_revision)
+        model.eval()
+        quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            torch.save(quantized, tmp_path)
+            os.replace(tmp_path, path)
+        return quantized
+    
+    def warmup(self, lengths: Iterable[int] = (32, 128, 512)):
+        """Temsili dizi uzunluklarında ileri geçişler yaparak ilk isteğin gecikmesini önden öde"""
         self.load_model()
+        if self.remote is not None:
+            # Sunucu kendi worker'larını ısıtır; burada yalnızca erişilebilirlik doğrulanır
+            self._compute_embeddings(["ısınma"], 1, 32)
+            self.is_warm = True
+            return
+        max_length = self.model.config.max_position_embeddings
+        with torch.inference_mode():
+            for length in lengths:
+                length = max(2, min(length, max_length))
+                input_ids = torch.full((1, length), self.tokenizer.unk_token_id, dtype=torch.long)
+                input_ids[0, 0] = self.tokenizer.cls_token_id
+                input_ids[0, -1] = self.tokenizer.sep_token_id
+                self.model(input_ids=input_ids, attention_mask=torch.ones_like(input_ids))
+        self.is_warm = True
+    
+    def preload(self, lengths: Iterable[int] = (32, 128, 512)):
+        """Modeli yükle ve ısıt; hata olursa `load_error` alanına yaz (açılış thread'i için)"""
+        try:
+            self.warmup(lengths)
+        except Exception as e:
+            self.load_error = str(e)
+            print(f"Model yüklenemedi: {e}")
+    
+    def get_embeddings(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        max_length: int = 512,
+        use_cache: bool = True
+    ) -> np.ndarray:
+        """Birden çok metin için toplu BERT embedding oluştur - giriş sırasıyla (n, 768) float32 matris"""
+        if not use_cache or not texts:
+            return self._compute_embeddings(texts, batch_size, max_length)
         
-        # Metni tokenize et
-        inputs = self.tokenizer(
-            text,
-            return_tensors="pt",
+        # Önbellekte olmayan (tekil) metinleri bul, yalnızca onlar için model çalıştır
+        keys = [embedding_cache.make_key(self.model_version, text, max_length) for text in texts]
+        results = [embedding_cache.get(key) for key in keys]
+        missing: Dict[str, int] = {}
+        for i, (key, vector) in enumerate(zip(keys, results)):
+            if vector is None:
+                missing.setdefault(key, i)
+        
+        if missing:
+            computed = self._compute_embeddings([texts[i] for i in missing.values()], batch_size, max_length)
+            computed_by_key = dict(zip(missing.keys(), computed))
+            for key, vector in computed_by_key.items():
+                embedding_cache.put(key, vector)
+            results = [vector if vector is not None else computed_by_key[key] for key, vector in zip(keys, results)]
+        
+        return np.stack(results).astype(np.float32, copy=False)
+    
+    def _compute_embeddings(self, texts: List[str], batch_size: int, max_length: int) -> np.ndarray:
+        """Önbelleğe bakmadan toplu BERT çıkarımı yap"""
+        if self.remote is not None:
+            return self.remote.call("_compute_embeddings", list(texts), batch_size, max_length)
+        self.load_model()
+        
+        embeddings = np.empty((len(texts), self.model.config.hidden_size), dtype=np.float32)
+        if not texts:
+            return embeddings
+        
+        embedding_texts.inc(len(texts))
+        
+        # Tüm metinleri padding olmadan bir kez tokenize et
+        encoded = self.tokenizer(
+            list(texts),
             truncation=True,
-            max_length=512,
-            padding=True
+            max_length=max_length,
+            padding=False
         )
         
-        # Embedding oluştur
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            # [CLS] token'ının embedding'ini al
-            embedding = outputs.last_hidden_state[:, 0, :].squeeze().numpy()
+        # Token uzunluğuna göre sırala: benzer uzunluktaki metinler aynı batch'e düşer,
+        # böylece her batch yalnızca kendi en uzun metnine kadar pad edilir
+        order = sorted(range(len(texts)), key=lambda i: len(encoded['input_ids'][i]))
         
-        return embedding.tolist()
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                batch_indices = order[start:start + batch_size]
+                features = [{key: encoded[key][i] for key in encoded.keys()} for i in batch_indices]
+                inputs = self.tokenizer.pad(features, padding="longest", return_tensors="pt")
+                embedding_batch_size.observe(len(features))
+                
+                outputs = self.model(**inputs)
+                # [CLS] token'ının embedding'ini al
+                embeddings[batch_indices] = outputs.last_hidden_state[:, 0, :].float().numpy()
+        
+        return embeddings
+    
+    def get_embedding(self, text: str) -> np.ndarray:
+        """Metin için BERT embedding oluştur (768 boyutlu float32 vektör)"""
+        if settings.EMBEDDING_MODE == "chunked":
+            return self.get_document_embedding(text)
+        return self.get_embeddings([text])[0]
+    
+    def embed_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """get_embedding'in toplu karşılığı: EMBEDDING_MODE ayarına uyar"""
+        if settings.EMBEDDING_MODE == "chunked":
+            if not texts:
+                return np.empty((0, 0), dtype=np.float32)
+            return np.stack([self.get_document_embedding(text) for text in texts])
+        return self.get_embeddings(texts, batch_size=batch_size)
+    
+    def get_document_embedding(
+        self,
+        text: str,
+        pooling: Optional[str] = None,
+        window: int = 512,
+        overlap: Optional[int] = None,
+        use_cache: bool = True
+    ) -> np.ndarray:
+        """Uzun metni örtüşen token pencerelerine bölüp her pencereyi embed et ve tek vektörde birleştir
+        
+        Pencereler en fazla `EMBEDDING_CHUNK_BATCH_TOKENS` token'lık batch'lerle işlenir ve
+        yalnızca pencere başına [CLS] vektörü tutulur; tepe bellek belge uzunluğundan bağımsızdır.
+        Tek pencereye sığan metinlerde sonuç `get_embeddings` ile aynıdır.
+        """
+        pooling = pooling or settings.EMBEDDING_POOLING
+        overlap = settings.EMBEDDING_CHUNK_OVERLAP if overlap is None else overlap
+        if pooling not in ("mean", "max", "section"):
+            raise ValueError(f"Bilinmeyen havuzlama yöntemi: {pooling}")
+        
+        key = None
+        if use_cache:
+            variant = f"{self.model_version}#chunked:{overlap}:{settings.EMBEDDING_MAX_CHUNKS}:{pooling}"
+            if pooling == "section":
+                variant += ":" + ",".join(f"{k}={v}" for k, v in sorted(settings.EMBEDDING_SECTION_WEIGHTS.items()))
+            key = embedding_cache.make_key(variant, text, window)
+            cached = embedding_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        self.load_model()
+        encoded = self.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=(pooling == "section")
+        )
+        token_ids = encoded['input_ids']
+        
+        # Pencere başlangıçları: özel token'lara ([CLS], [SEP]) yer bırakılır, son pencere metnin sonuna dayanır
+        body = window - 2
+        step = max(1, body - overlap)
+        starts = list(range(0, max(len(token_ids) - body, 0) + 1, step))
+        if starts[-1] + body < len(token_ids):
+            starts.append(len(token_ids) - body)
+        if len(starts) > settings.EMBEDDING_MAX_CHUNKS:
+            picks = np.linspace(0, len(starts) - 1, settings.EMBEDDING_MAX_CHUNKS).round().astype(int)
+            starts = [starts[i] for i in picks]
+        
+        vectors = self._embed_windows(
+            [token_ids[start:start + body] for start in starts],
+            max(1, settings.EMBEDDING_CHUNK_BATCH_TOKENS // window)
+        )
+        
+        if pooling == "max":
+            embedding = vectors.max(axis=0)
+        elif pooling == "section":
+            weights = self._section_window_weights(text, encoded['offset_mapping'], starts, body)
+            embedding = (weights[:, None] * vectors).sum(axis=0) / weights.sum()
+        else:
+            embedding = vectors.mean(axis=0)
+        embedding = embedding.astype(np.float32, copy=False)
+        
+        if key is not None:
+            embedding_cache.put(key, embedding)
+        return embedding
+    
+    def _embed_windows(self, windows: List[List[int]], batch_size: int) -> np.ndarray:
+        """Token pencerelerini batch'ler halinde embed et - pencere başına [CLS] vektörü"""
+        if self.remote is not None:
+            return self.remote.call("_embed_windows", windows, batch_size)
+        vectors = np.empty((len(windows), self.model.config.hidden_size), dtype=np.float32)
+        with torch.inference_mode():
+            for start in range(0, len(windows), batch_size):
+                features = []
+                for ids in windows[start:start + batch_size]:
+                    input_ids = [self.tokenizer.cls_token_id] + ids + [self.tokenizer.sep_token_id]
+                    features.append({'input_ids': input_ids, 'attention_mask': [1] * len(input_ids)})
+                inputs = self.tokenizer.pad(features, padding="longest", return_tensors="pt")
+                embedding_batch_size.observe(len(features))
+                
+                outputs = self.model(**inputs)
+                vectors[start:start + len(features)] = outputs.last_hidden_state[:, 0, :].float().numpy()
+        return vectors
+    
+    def _section_window_weights(self, text: str, offsets, starts: List[int], body: int) -> np.ndarray:
+        """Her pencerenin ağırlığı = token'larının ait olduğu CV bölümlerinin ortalama ağırlığı"""
+        spans = cv_parser.section_spans(text)
+        token_weights = np.ones(len(offsets), dtype=np.float32)
+        if spans and len(offsets):
+            token_starts = np.fromiter((offset[0] for offset in offsets), dtype=np.int64, count=len(offsets))
+            span_starts = np.array([start for start, _, _ in spans], dtype=np.int64)
+            span_weights = np.array(
+                [settings.EMBEDDING_SECTION_WEIGHTS.get(name, 1.0) for _, _, name in spans], dtype=np.float32
+            )
+            # İlk bölümden önceki token'lar 1.0 ağırlıkta kalır
+            span_index = np.searchsorted(span_starts, token_starts, side="right") - 1
+            inside = span_index >= 0
+            token_weights[inside] = span_weights[span_index[inside]]
+        
+        weights = np.array(
+            [token_weights[start:start + body].mean() if len(offsets) else 1.0 for start in starts],
+            dtype=np.float32
+        )
+        return np.maximum(weights, 1e-6)
     
     def extract_skills(self, text: str) -> List[Dict]:
         """Metinden yetenekleri çıkar"""
-        text_lower = text.lower()
-        found_skills = []
+        # Tüm yetenekler ve geçiş sayıları metin üzerinde tek geçişte bulunur
+        counts = Counter(match.group(1) for match in self._skill_pattern.finditer(text.lower()))
         
-        for skill in self.skill_keywords:
-            if skill in text_lower:
-                # Skill'in kaç kez geçtiğini say
-                count = text_lower.count(skill)
-                confidence = min(1.0, 0.5 + (count * 0.1))
-                found_skills.append({
-                    'name': skill,
-                    'confidence': confidence
-                })
+        found_skills = []
+        for skill in sorted(counts, key=self._skill_order.__getitem__):
+            confidence = min(1.0, 0.5 + (counts[skill] * 0.1))
+            found_skills.append({
+                'name': skill,
+                'confidence': confidence
+            })
         
         # Confidence'a göre sırala
         found_skills.sort(key=lambda x: x['confidence'], reverse=True)
@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.embedding_index import EmbeddingIndex, job_index
+from app.services.metrics import recommendation_cache_requests
+
+
+@dataclass
+class Recommendations:
+    """Bir CV için hesaplanmış en iyi k ilan (azalan sırada, 0-1 aralığında skorlar)"""
+    version: int  # Hesaplandığı andaki indeks sürümü
+    embedding: np.ndarray
+    cv_skills: Dict[int, str]  # Skill.id -> ad
+    ids: np.ndarray
+    final_scores: np.ndarray
+    similarities: np.ndarray
+    skill_scores: np.ndarray
+
+
+class RecommendationCache:
+    """CV başına en iyi k ilan önbelleği (LRU)
+
+    Kayıtlar iş ilanı indeksinin sürümüyle etiketlenir. İndeks değiştiyse yalnızca o
+    sürümden beri eklenen/silinen ilanlar yeniden skorlanıp listeye işlenir; silinen
+    ilanlar listeyi k'nın altına düşürürse veya değişiklik günlüğü yetmezse liste
+    baştan hesaplanır. CV'nin kendisi değiştiğinde kayıt `invalidate` ile silinir.
+    """
+
+    def __init__(self, index: EmbeddingIndex, top_k: int = 100, max_entries: int = 10000):
+        self.index = index
+        self.top_k = top_k
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Recommendations]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cv_id: int, loader: Callable[[], Tuple[np.ndarray, Dict[int, str]]]) -> Recommendations:
+        """CV'nin önerilerini getir; önbellekte yoksa `loader`'dan (embedding, yetenekler) alıp hesapla"""
+        with self._lock:
+            entry = self._entries.get(cv_id)
+            if entry is not None:
+                self._entries.move_to_end(cv_id)
+
+        if entry is None:
+            recommendation_cache_requests.inc(result="miss")
+            embedding, cv_skills = loader()
+            entry = self._compute(embedding, cv_skills)
+        elif entry.version != self.index.version:
+            recommendation_cache_requests.inc(result="patched")
+            entry = self._refresh(entry)
+        else:
+            recommendation_cache_requests.inc(result="hit")
+            return entry
+
+        with self._lock:
+            self._entries[cv_id] = entry
+            self._entries.move_to_end(cv_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, cv_id: int):
+        """CV yeniden işlendiğinde veya silindiğinde kaydı at"""
+        with self._lock:
+            self._entries.pop(cv_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _compute(self, embedding: np.ndarray, cv_skills: Dict[int, str]) -> Recommendations:
+        # Sürüm aramadan önce okunur: arada gelen değişiklikler sonraki okumada yeniden işlenir
+        version = self.index.version
+        ids, final_scores, similarities, skill_scores = self.index.search(embedding, list(cv_skills), self.top_k)
+        return Recommendations(version, embedding, cv_skills, ids, final_scores, similarities, skill_scores)
+
+    def _refresh(self, entry: Recommendations) -> Recommendations:
+        """Son hesaplamadan beri değişen ilanları mevcut listeye işle"""
+        version = self.index.version
+        changed = self.index.changes_since(entry.version)
+        if changed is None:
+            return self._compute(entry.embedding, entry.cv_skills)
+
+        changed_ids = np.asarray(changed, dtype=np.int64)
+        keep = ~np.isin(entry.ids, changed_ids)
+        new_ids, new_final, new_sim, new_skill = self.index.score_ids(
+            entry.embedding, list(entry.cv_skills), changed
+        )
+        ids = np.concatenate([entry.ids[keep], new_ids])
+        final_scores = np.concatenate([entry.final_scores[keep], new_final])
+        similarities = np.concatenate([entry.similarities[keep], new_sim])
+        skill_scores = np.concatenate([entry.skill_scores[keep], new_skill])
+
+        # Liste doluysa dışarıda kalan ilanlar eski k. skoru geçemez; yalnızca o eşiğin
+        # üstündekiler kesin. Bunlar k'dan azsa (ör. listeden ilan silindi) baştan hesapla
+        if entry.ids.shape[0] >= self.top_k and entry.final_scores.shape[0]:
+            known = final_scores >= entry.final_scores[-1]
+            ids, final_scores = ids[known], final_scores[known]
+            similarities, skill_scores = similarities[known], skill_scores[known]
+        if ids.shape[0] < min(self.top_k, len(self.index)):
+            return self._compute(entry.embedding, entry.cv_skills)
+
+        order = np.argsort(-final_scores, kind="stable")[:self.top_k]
+        return Recommendations(
+            version, entry.embedding, entry.cv_skills,
+            ids[order], final_scores[order], similarities[order], skill_scores[order]
+        )
+
+
+# Global instance
+recommendation_cache = RecommendationCache(
+    job_index,
+    top_k=settings.RECOMMENDATION_TOP_K,
+    max_entries=settings.RECOMMENDATION_CACHE_SIZE
+)
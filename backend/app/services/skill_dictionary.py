@@ -0,0 +1,108 @@
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.job import Skill, CVSkill, JobSkill
+from app.utils.db import dialect_insert
+
+
+class SkillDictionary:
+    """Süreç içi yetenek adı → Skill.id önbelleği
+
+    Eksik yetenekler tek bir INSERT ... ON CONFLICT DO NOTHING ve ardından tek SELECT ile
+    çözülür. Yeni id'ler oturumun transaction'ı commit edilene kadar beklemede tutulur;
+    geri alınan bir transaction önbelleğe var olmayan id bırakmaz.
+    """
+
+    PENDING_KEY = "pending_skill_ids"
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def warm(self, db: Session):
+        """Tüm yetenekleri tek sorguyla önbelleğe yükle"""
+        ids = dict(db.query(Skill.name, Skill.id).all())
+        with self._lock:
+            self._ids = ids
+
+    def resolve(self, db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """Yetenek adlarını id'lere çevir; eksik olanları toplu olarak oluştur (commit etmez)"""
+        names = list(dict.fromkeys(names))
+        pending = db.info.setdefault(self.PENDING_KEY, {})
+        with self._lock:
+            resolved = {name: self._ids[name] for name in names if name in self._ids}
+        resolved.update({name: pending[name] for name in names if name not in resolved and name in pending})
+
+        missing = [name for name in names if name not in resolved]
+        if missing:
+            stmt = dialect_insert(db, Skill.__table__).values(
+                [{'name': name, 'normalized_name': name.lower()} for name in missing]
+            ).on_conflict_do_nothing(index_elements=['name'])
+            db.execute(stmt)
+            created = dict(db.query(Skill.name, Skill.id).filter(Skill.name.in_(missing)).all())
+            pending.update(created)
+            resolved.update(created)
+        return resolved
+
+    def add_cv_skills(self, db: Session, cv_id: int, skills: List[Dict]) -> List[int]:
+        """CVSkill satırlarını tek toplu INSERT ile ekle ve yetenek id'lerini döndür"""
+        return self.add_cvs_skills(db, [(cv_id, skills)])[0]
+
+    def add_cvs_skills(self, db: Session, cvs: List[Tuple[int, List[Dict]]]) -> List[List[int]]:
+        """Birden çok CV'nin CVSkill satırlarını tek çözümleme ve tek toplu INSERT ile ekle"""
+        ids = self.resolve(db, [skill['name'] for _, skills in cvs for skill in skills])
+        rows = []
+        skill_ids = []
+        for cv_id, skills in cvs:
+            skill_ids.append([ids[skill['name']] for skill in skills])
+            rows.extend({
+                'cv_id': cv_id,
+                'skill_id': ids[skill['name']],
+                'confidence_score': skill['confidence']
+            } for skill in skills)
+        if rows:
+            db.execute(insert(CVSkill), rows)
+        return skill_ids
+
+    def add_job_skills(self, db: Session, job_id: int, skills: List[Dict]) -> List[int]:
+        """JobSkill satırlarını tek toplu INSERT ile ekle ve yetenek id'lerini döndür"""
+        return self.add_jobs_skills(db, [(job_id, skills)])[0]
+
+    def add_jobs_skills(self, db: Session, jobs: List[Tuple[int, List[Dict]]]) -> List[List[int]]:
+        """Birden çok ilanın JobSkill satırlarını tek çözümleme ve tek toplu INSERT ile ekle"""
+        ids = self.resolve(db, [skill['name'] for _, skills in jobs for skill in skills])
+        rows = []
+        skill_ids = []
+        for job_id, skills in jobs:
+            skill_ids.append([ids[skill['name']] for skill in skills])
+            rows.extend({
+                'job_id': job_id,
+                'skill_id': ids[skill['name']],
+                'importance': skill['confidence']
+            } for skill in skills)
+        if rows:
+            db.execute(insert(JobSkill), rows)
+        return skill_ids
+
+    def _commit_pending(self, db: Session):
+        pending = db.info.pop(self.PENDING_KEY, None)
+        if pending:
+            with self._lock:
+                self._ids.update(pending)
+
+    def _discard_pending(self, db: Session):
+        db.info.pop(self.PENDING_KEY, None)
+
+
+# Global instance
+skill_dictionary = SkillDictionary()
+
+event.listen(SessionLocal, "after_commit", skill_dictionary._commit_pending)
+event.listen(SessionLocal, "after_rollback", skill_dictionary._discard_pending)
@@ -0,0 +1,153 @@
+import numpy as np
+from typing import Iterable, Optional
+
+
+class SkillIncidence:
+    """Satır × yetenek (Skill.id) seyrek ilişki matrisi, CSR benzeri düzende
+
+    Her satırın yetenek id'leri `_entries` dizisinde bitişik bir aralıkta tutulur
+    (`_starts`, `_lengths` = satır başına indptr). Satır eklemek sona yazar, satır silmek
+    yalnızca aralığı boşa çıkarır; boşluklar belirli bir oranı aşınca dizi sıkıştırılır.
+    Böylece güncellemeler artımlı, sorgular ise tek vektörize geçiştir.
+    """
+
+    HOLE = -1  # Silinmiş girdiler
+
+    def __init__(self, initial_capacity: int = 4096):
+        self._entries = np.full(initial_capacity, self.HOLE, dtype=np.int64)
+        self._used = 0  # _entries içinde yazılmış (canlı + boş) girdi sayısı
+        self._starts = np.zeros(0, dtype=np.int64)
+        self._lengths = np.zeros(0, dtype=np.int64)
+        self._n_rows = 0
+        self._live = 0  # Canlı girdi sayısı (nnz)
+        self._max_skill_id = 0
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    @property
+    def nnz(self) -> int:
+        return self._live
+
+    def _reserve_rows(self, n_rows: int):
+        if n_rows <= self._starts.shape[0]:
+            return
+        capacity = max(n_rows, 1024, 2 * self._starts.shape[0])
+        starts = np.zeros(capacity, dtype=np.int64)
+        lengths = np.zeros(capacity, dtype=np.int64)
+        starts[:self._n_rows] = self._starts[:self._n_rows]
+        lengths[:self._n_rows] = self._lengths[:self._n_rows]
+        self._starts, self._lengths = starts, lengths
+
+    def _reserve_entries(self, n_entries: int):
+        if n_entries <= self._entries.shape[0]:
+            return
+        entries = np.full(max(n_entries, 2 * self._entries.shape[0]), self.HOLE, dtype=np.int64)
+        entries[:self._used] = self._entries[:self._used]
+        self._entries = entries
+
+    def _write(self, row: int, skill_ids: Iterable[int]):
+        ids = np.unique(np.fromiter(skill_ids, dtype=np.int64))
+        self._reserve_entries(self._used + ids.shape[0])
+        self._entries[self._used:self._used + ids.shape[0]] = ids
+        self._starts[row] = self._used
+        self._lengths[row] = ids.shape[0]
+        self._used += ids.shape[0]
+        self._live += ids.shape[0]
+        if ids.shape[0]:
+            self._max_skill_id = max(self._max_skill_id, int(ids[-1]))
+
+    def _clear(self, row: int):
+        start, length = self._starts[row], self._lengths[row]
+        self._entries[start:start + length] = self.HOLE
+        self._live -= int(length)
+        self._lengths[row] = 0
+
+    def _maybe_compact(self):
+        """Boşluklar yazılı alanın yarısını aşınca girdileri satır sırasıyla yeniden paketle"""
+        if self._used < 4096 or self._live * 2 > self._used:
+            return
+        lengths = self._lengths[:self._n_rows]
+        self._entries = np.concatenate([
+            self._entries[self._gather_positions(np.arange(self._n_rows))],
+            np.full(max(self._live, 1024), self.HOLE, dtype=np.int64)
+        ])
+        self._starts[:self._n_rows] = np.cumsum(lengths) - lengths
+        self._used = self._live
+
+    def append_row(self, skill_ids: Iterable[int]) -> int:
+        """Sona yeni satır ekle ve satır numarasını döndür"""
+        row = self._n_rows
+        self._reserve_rows(row + 1)
+        self._n_rows += 1
+        self._write(row, skill_ids)
+        return row
+
+    def set_row(self, row: int, skill_ids: Iterable[int]):
+        """Satırın yeteneklerini değiştir (JobSkill ekleme/silme)"""
+        self._clear(row)
+        self._write(row, skill_ids)
+        self._maybe_compact()
+
+    def move_row(self, src: int, dst: int):
+        """`src` satırını `dst` konumuna taşı (`dst` satırının eski içeriği silinir)"""
+        self._clear(dst)
+        self._starts[dst] = self._starts[src]
+        self._lengths[dst] = self._lengths[src]
+        self._lengths[src] = 0
+
+    def pop_row(self):
+        """Son satırı sil"""
+        self._clear(self._n_rows - 1)
+        self._n_rows -= 1
+        self._maybe_compact()
+
+    def row_skills(self, row: int) -> np.ndarray:
+        start, length = self._starts[row], self._lengths[row]
+        return self._entries[start:start + length]
+
+    def _gather_positions(self, rows: np.ndarray) -> np.ndarray:
+        """Verilen satırların girdi pozisyonlarını (satır sırasıyla) tek dizide topla"""
+        lengths = self._lengths[rows]
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        row_offsets = np.cumsum(lengths) - lengths
+        return np.repeat(self._starts[rows] - row_offsets, lengths) + np.arange(total)
+
+    def skill_scores(
+        self,
+        skill_ids: Iterable[int],
+        rows: Optional[np.ndarray] = None,
+        per_query: bool = False
+    ) -> np.ndarray:
+        """Her satır için eşleşen yetenek oranı (seyrek matris × vektör)
+
+        Varsayılan: |satır ∩ skill_ids| / |satır|. `per_query=True` ise payda sorgudaki
+        yetenek sayısıdır (|satır ∩ skill_ids| / |skill_ids|).
+        """
+        if rows is None:
+            rows = np.arange(self._n_rows)
+        lengths = self._lengths[rows]
+        scores = np.zeros(rows.shape[0], dtype=np.float32)
+        skill_ids = set(skill_ids)
+        n_query = len(skill_ids)
+        skill_ids = [s for s in skill_ids if 0 <= s <= self._max_skill_id]
+        if not skill_ids or rows.shape[0] == 0:
+            return scores
+
+        query = np.zeros(self._max_skill_id + 1, dtype=np.float32)
+        query[skill_ids] = 1.0
+
+        positions = self._gather_positions(rows)
+        hits = query[self._entries[positions]]
+        cumulative = np.concatenate(([0.0], np.cumsum(hits, dtype=np.float64)))
+        ends = np.cumsum(lengths)
+        matched = cumulative[ends] - cumulative[ends - lengths]
+
+        if per_query:
+            scores[:] = matched / n_query
+            return scores
+        nonzero = lengths > 0
+        scores[nonzero] = matched[nonzero] / lengths[nonzero]
+        return scores
@@ -1 +1,3 @@
-from app.utils.auth import hash_password, verify_password, create_access_token, get_current_user
\ No newline at end of file
+from app.utils.auth import hash_password, verify_password, create_access_token, get_current_user
+from app.utils.embedding import encode_embedding, decode_embedding
+from app.utils.db import dialect_insert
\ No newline at end of file
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.database import get_db
-from app.models.user import User
+from app.models.user import User, UserRole
 
 # Şifre hashleme
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -57,4 +57,16 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+
+def require_roles(*roles: UserRole):
+    """Yalnızca verilen rollerdeki kullanıcılara izin veren bağımlılık (diğerleri 403 alır)"""
+    def dependency(current_user: User = Depends(get_current_user)) -> User:
+        if current_user.role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Bu işlem için yetkiniz yok"
+            )
+        return current_user
+    return dependency
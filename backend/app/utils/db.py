@@ -0,0 +1,14 @@
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, table: Table):
+    """Veritabanına uygun, ON CONFLICT destekleyen INSERT ifadesi döndür (PostgreSQL / SQLite)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT desteklenmeyen veritabanı: {dialect}")
+    return insert(table)
@@ -0,0 +1,22 @@
+import numpy as np
+from typing import Optional, Sequence
+
+# Embedding'ler veritabanında ham float32 (little-endian) byte dizisi olarak saklanır
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def encode_embedding(vector: Optional[Sequence[float]]) -> Optional[bytes]:
+    """Embedding vektörünü ham float32 byte dizisine çevir"""
+    if vector is None or len(vector) == 0:
+        return None
+    return np.ascontiguousarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def decode_embedding(data: Optional[bytes], dim: Optional[int] = None) -> Optional[np.ndarray]:
+    """Byte dizisini kopyalamadan (np.frombuffer) float32 vektöre çevir - dönen dizi salt okunurdur"""
+    if not data:
+        return None
+    vector = np.frombuffer(data, dtype=EMBEDDING_DTYPE)
+    if dim is not None and vector.shape[0] != dim:
+        raise ValueError(f"Embedding boyutu uyumsuz: {vector.shape[0]} != {dim}")
+    return vector
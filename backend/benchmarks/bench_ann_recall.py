@@ -0,0 +1,54 @@
+"""IVF indeksinin recall@k ve gecikme ölçümü (tam taramaya karşı)
+
+Kullanım:
+    python -m benchmarks.bench_ann_recall --jobs 100000 --k 20 --nprobe 8 16 32
+"""
+import argparse
+import time
+
+from app.services.ann_index import IVFIndex
+from app.services.embedding_index import EmbeddingIndex
+from benchmarks.synthetic import make_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    vectors = make_catalog(args.jobs + args.queries, args.dim, n_topics=max(16, args.jobs // 500))
+    queries, catalog = vectors[:args.queries], vectors[args.queries:]
+    items = [(i, catalog[i], []) for i in range(args.jobs)]
+
+    exact = EmbeddingIndex()
+    exact.build(items)
+
+    start = time.perf_counter()
+    approx = EmbeddingIndex(ann=IVFIndex(), ann_min_size=1)
+    approx.build(items)
+    approx.wait_for_ann()
+    print(f"IVF eğitimi: {time.perf_counter() - start:.1f}s, nlist={len(approx.ann.centroids)}")
+
+    truth = []
+    start = time.perf_counter()
+    for q in queries:
+        truth.append(set(exact.search(q, [], args.k)[0].tolist()))
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+    print(f"tam tarama: {exact_ms:.2f} ms/sorgu")
+
+    for nprobe in args.nprobe:
+        hits = 0
+        start = time.perf_counter()
+        for q, expected in zip(queries, truth):
+            found = approx.search(q, [], args.k, nprobe=nprobe)[0]
+            hits += len(expected.intersection(found.tolist()))
+        ms = (time.perf_counter() - start) * 1000 / args.queries
+        print(f"nprobe={nprobe:3d}  recall@{args.k}={hits / (args.k * args.queries):.3f}  {ms:.2f} ms/sorgu")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Kesilmiş (ilk 512 token) ve parçalı (tüm metin) embedding için gecikme ve bellek ölçümü
+
+Her ölçüm ayrı bir süreçte yapılır; RSS değeri model yüklendikten sonraki tepe artıştır.
+
+Kullanım:
+    python -m benchmarks.bench_chunked_embedding --pages 1 5 20 [--model /yerel/model/dizini]
+"""
+import argparse
+import multiprocessing
+import random
+import resource
+import time
+
+from benchmarks.synthetic import make_cv
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_case(model, mode, pooling, pages, repeat, batch_tokens, queue):
+    from app.config import settings
+    settings.EMBEDDING_CACHE_DIR = ""
+    if batch_tokens:
+        settings.EMBEDDING_CHUNK_BATCH_TOKENS = batch_tokens
+    from app.services.nlp_engine import nlp_engine
+    if model:
+        nlp_engine.model_name = model
+    nlp_engine.load_model()
+    nlp_engine.get_embeddings(["ısınma"], use_cache=False)
+
+    text = make_cv(pages, random.Random(pages))
+    n_tokens = len(nlp_engine.tokenizer(text, add_special_tokens=False)['input_ids'])
+    baseline = max_rss_mb()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if mode == "truncate":
+            nlp_engine.get_embeddings([text], use_cache=False)
+        else:
+            nlp_engine.get_document_embedding(text, pooling=pooling, use_cache=False)
+    latency = (time.perf_counter() - start) * 1000 / repeat
+    queue.put((n_tokens, latency, max_rss_mb() - baseline))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--model", default=None, help="Model adı veya yerel dizin (varsayılan: NLPEngine.model_name)")
+    parser.add_argument("--pooling", default="mean", choices=["mean", "max", "section"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-tokens", type=int, default=None, help="EMBEDDING_CHUNK_BATCH_TOKENS değerini geçersiz kıl")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'sayfa':>5} {'token':>7} {'mod':>9} {'gecikme':>12} {'tepe RSS artışı':>16}")
+    for pages in args.pages:
+        for mode in ("truncate", "chunked"):
+            queue = ctx.Queue()
+            process = ctx.Process(target=run_case, args=(args.model, mode, args.pooling, pages, args.repeat, args.batch_tokens, queue))
+            process.start()
+            n_tokens, latency, rss = queue.get()
+            process.join()
+            print(f"{pages:>5} {n_tokens:>7} {mode:>9} {latency:>9.1f} ms {rss:>13.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Embedding worker havuzunun bellek kullanımı ve 1..N worker verim ölçeklenmesi
+
+Bellek /proc/<pid>/smaps_rollup üzerinden okunur: RSS süreçte yerleşik tüm sayfalar, PSS
+paylaşılan sayfaları paylaşan süreç sayısına bölerek sayar, USS yalnızca sürece özel sayfalardır.
+
+Kullanım:
+    python -m benchmarks.bench_embedding_workers --workers 1 2 4 --threads 1 [--model /yerel/model/dizini]
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.services.embedding_pool import EmbeddingWorkerPool
+from app.services.nlp_engine import nlp_engine
+from benchmarks.synthetic import make_cv
+
+
+def memory_mb(pid: int):
+    """(RSS, PSS, USS) MB cinsinden"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1]) / 1024
+    uss = values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+    return values.get("Rss", 0), values.get("Pss", 0), uss
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--texts", type=int, default=32)
+    parser.add_argument("--model", default=None, help="Model adı veya yerel dizin (varsayılan: NLPEngine.model_name)")
+    args = parser.parse_args()
+
+    settings.EMBEDDING_CACHE_DIR = ""
+    if args.model:
+        nlp_engine.model_name = args.model
+    rng = random.Random(0)
+    texts = [make_cv(1, rng, chars_per_page=rng.randint(1500, 3000)) for _ in range(args.texts)]
+    print(f"çekirdek sayısı: {os.cpu_count()}")
+
+    baseline = None
+    for workers in args.workers:
+        pool = EmbeddingWorkerPool(workers=workers, threads=args.threads)
+        pool.start()
+        # Her worker'ı ısıt (eşzamanlı gönderim tüm worker'lara dağılır)
+        with ThreadPoolExecutor(max_workers=workers) as submitters:
+            list(submitters.map(lambda text: pool.call("_compute_embeddings", [text], 1, 512), texts[:workers * 2]))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers * 2) as submitters:
+            list(submitters.map(lambda text: pool.call("_compute_embeddings", [text], 1, 512), texts))
+        throughput = len(texts) / (time.perf_counter() - start)
+        baseline = baseline or throughput
+
+        parent = memory_mb(os.getpid())
+        children = [memory_mb(pid) for pid in pool.worker_pids]
+        total_pss = parent[1] + sum(child[1] for child in children)
+        print(
+            f"{workers} worker x {args.threads} thread: {throughput:6.2f} metin/sn ({throughput / baseline:4.2f}x)  "
+            f"worker başına RSS {children[0][0]:6.0f} MB  PSS {children[0][1]:6.0f} MB  USS {children[0][2]:6.0f} MB  "
+            f"toplam PSS {total_pss:6.0f} MB"
+        )
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""PDF parse: dosyadan okuma + `+=` birleştirme + `find` ile bölüm arama (eski yol) ile
+bellekten okuma + `join` + tek regex geçişi (yeni yol, sıralı ve sayfa aralıklarıyla paralel) karşılaştırması
+
+Kullanım:
+    python -m benchmarks.bench_pdf_parse --pages 10 50 --workers 2 [--repeat 10]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+from app.services.cv_parser import cv_parser
+from benchmarks.synthetic import make_pdf
+
+
+def legacy_read_pdf(file_path: str) -> str:
+    """Eski yol: dosyayı diskten aç, sayfa metinlerini `+=` ile birleştir"""
+    doc = fitz.open(file_path)
+    text = ""
+    for page in doc:
+        text += page.get_text()
+    doc.close()
+    return text.strip()
+
+
+def legacy_sections(text: str):
+    """Eski yol: her başlık için küçük harfli metinde ayrı `find` taraması"""
+    text_lower = text.lower()
+    positions = []
+    for section_name, headers in cv_parser.section_headers.items():
+        for header in headers:
+            pos = text_lower.find(header)
+            if pos != -1:
+                positions.append((pos, section_name, header))
+                break
+    positions.sort(key=lambda x: x[0])
+    return positions
+
+
+def legacy_parse_cv(file_path: str):
+    """Eski parse_cv: aynı e-posta/telefon çıkarımı, eski okuma ve bölüm arama ile"""
+    text = legacy_read_pdf(file_path)
+    return cv_parser.extract_email(text), cv_parser.extract_phone(text), legacy_sections(text)
+
+
+def timed(fn, repeat: int) -> float:
+    """Medyan süre (ms)"""
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times)[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = ProcessPoolExecutor(max_workers=args.workers)
+
+    def page_map(fn, args_list):
+        futures = [pool.submit(fn, *a) for a in args_list]
+        return [f.result() for f in futures]
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for pages in args.pages:
+                content = make_pdf(pages, rng)
+                path = os.path.join(tmp, f"cv_{pages}.pdf")
+                with open(path, "wb") as f:
+                    f.write(content)
+                text = legacy_read_pdf(path)
+
+                legacy = timed(lambda: legacy_parse_cv(path), args.repeat)
+                sequential = timed(lambda: cv_parser.parse_cv_bytes(content), args.repeat)
+                parallel = timed(lambda: cv_parser.parse_cv_bytes(content, page_map=page_map), args.repeat)
+                old_sections = timed(lambda: legacy_sections(text), args.repeat * 10)
+                new_sections = timed(lambda: cv_parser._section_positions(text), args.repeat * 10)
+
+                print(f"{pages} sayfa ({len(content) // 1024} KB, {len(text)} karakter)")
+                print(f"  eski (dosya, +=, find)       : {legacy:8.2f} ms  {pages * 1000 / legacy:8.1f} sayfa/sn")
+                print(f"  yeni (bellek, sıralı)        : {sequential:8.2f} ms  {pages * 1000 / sequential:8.1f} sayfa/sn")
+                print(f"  yeni (bellek, {args.workers} süreç)       : {parallel:8.2f} ms  {pages * 1000 / parallel:8.1f} sayfa/sn")
+                print(f"  bölüm arama: find {old_sections:.3f} ms, regex {new_sections:.3f} ms")
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""fp32 ve dinamik INT8 kuantize BERT çıkarımının gecikme, verim ve embedding sapması karşılaştırması
+
+Kullanım:
+    python -m benchmarks.bench_quantized_embedding --texts 64 [--model /yerel/model/dizini]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import torch
+
+from app.config import settings
+from app.services.nlp_engine import NLPEngine
+from benchmarks.synthetic import make_cv
+
+
+def make_corpus(n_texts, rng):
+    """Farklı uzunluklarda (yarım sayfa - iki sayfa) CV benzeri metinler"""
+    return [make_cv(1, rng, chars_per_page=rng.randint(1500, 6000)) for _ in range(n_texts)]
+
+
+def measure(engine, texts, batch_size, repeat):
+    """Tek metin gecikmesi (ms, medyan) ve toplu verim (metin/sn)"""
+    latencies = []
+    for text in texts[:repeat]:
+        start = time.perf_counter()
+        engine.get_embeddings([text], use_cache=False)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    embeddings = engine.get_embeddings(texts, batch_size=batch_size, use_cache=False)
+    throughput = len(texts) / (time.perf_counter() - start)
+    return float(np.median(latencies)), throughput, embeddings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=10, help="Gecikme için ölçülen tek metin sayısı")
+    parser.add_argument("--model", default=None, help="Model adı veya yerel dizin (varsayılan: NLPEngine.model_name)")
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    settings.EMBEDDING_CACHE_DIR = ""
+    texts = make_corpus(args.texts, random.Random(0))
+
+    results = {}
+    for backend in NLPEngine.BACKENDS:
+        engine = NLPEngine(backend=backend)
+        if args.model:
+            engine.model_name = args.model
+        start = time.perf_counter()
+        engine.load_model()
+        load_s = time.perf_counter() - start
+        engine.warmup()
+        latency, throughput, embeddings = measure(engine, texts, args.batch_size, args.repeat)
+        results[backend] = embeddings
+        print(f"{backend:>5}  yükleme {load_s:5.2f} s  gecikme {latency:7.1f} ms  verim {throughput:6.1f} metin/sn")
+
+    reference, quantized = results["fp32"], results["int8"]
+    cosine = np.sum(reference * quantized, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(quantized, axis=1)
+    )
+    print(f"cosine(fp32, int8)  ortalama {cosine.mean():.5f}  en düşük {cosine.min():.5f}  p5 {np.percentile(cosine, 5):.5f}")
+
+    # Sıralama etkisi: her metin için diğerleri arasında en yakın 5 komşunun örtüşmesi
+    def neighbours(matrix):
+        normalized = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        similarity = normalized @ normalized.T
+        np.fill_diagonal(similarity, -np.inf)
+        return np.argsort(-similarity, axis=1)[:, :5]
+
+    overlap = np.mean([
+        len(set(a) & set(b)) / 5 for a, b in zip(neighbours(reference), neighbours(quantized))
+    ])
+    print(f"en yakın 5 komşu örtüşmesi: {overlap:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Derlenmiş (trie regex) yetenek çıkarıcı ile eski anahtar kelime taramasının karşılaştırması
+
+Kullanım:
+    python -m benchmarks.bench_skill_extractor --terms 5000 --chars 2000 20000
+"""
+import argparse
+import random
+import time
+
+from app.services.nlp_engine import NLPEngine
+from benchmarks.synthetic import make_dictionary, make_text
+
+
+def legacy_extract_skills(skill_keywords, text):
+    """Önceki uygulama: her anahtar kelime için metnin tamamını iki kez tarar"""
+    text_lower = text.lower()
+    found_skills = []
+    for skill in skill_keywords:
+        if skill in text_lower:
+            count = text_lower.count(skill)
+            found_skills.append({'name': skill, 'confidence': min(1.0, 0.5 + (count * 0.1))})
+    found_skills.sort(key=lambda x: x['confidence'], reverse=True)
+    return found_skills
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, default=5000)
+    parser.add_argument("--chars", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    engine = NLPEngine()
+    terms = make_dictionary(engine.skill_keywords, args.terms, rng)
+
+    start = time.perf_counter()
+    engine.set_skill_keywords(terms)
+    print(f"sözlük: {len(terms)} terim, derleme {time.perf_counter() - start:.2f}s")
+
+    for n_chars in args.chars:
+        text = make_text(terms, n_chars, rng)
+        legacy_ms = timed(lambda: legacy_extract_skills(terms, text), args.repeat)
+        compiled_ms = timed(lambda: engine.extract_skills(text), args.repeat)
+        print(
+            f"{n_chars:>7} karakter  eski: {legacy_ms:8.2f} ms  derlenmiş: {compiled_ms:7.2f} ms  "
+            f"hızlanma: {legacy_ms / compiled_ms:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Ağ erişimi olmadan benchmark çalıştırmak için yerel, rastgele ağırlıklı BERT modeli
+
+Model ve tokenizer `save_pretrained` ile bir dizine yazılır ve `nlp_engine.model_name` bu dizine
+yönlendirilir; böylece tokenizasyon, batch'leme, önbellek ve havuzlama kodu gerçek yoldan geçer.
+"base" boyutu bert-base ile aynı hesap maliyetine sahiptir; "tiny" hızlı duman testleri içindir.
+Embedding değerleri anlamsızdır, yalnızca süre ölçümü için kullanılmalıdır.
+
+Kullanım:
+    python -m benchmarks.stub_model --size base [--output cache/stub_models/base]
+"""
+import argparse
+import os
+import string
+
+from benchmarks.synthetic import WORDS
+
+SIZES = {
+    "base": dict(hidden_size=768, num_hidden_layers=12, num_attention_heads=12, intermediate_size=3072),
+    "tiny": dict(hidden_size=128, num_hidden_layers=2, num_attention_heads=2, intermediate_size=512),
+}
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+
+def build_stub_model(size: str = "base", output: str = None) -> str:
+    """Stub modeli (yoksa) oluşturup dizin yolunu döndür"""
+    from transformers import BertConfig, BertModel, BertTokenizer
+
+    output = output or os.path.join("cache", "stub_models", size)
+    if os.path.exists(os.path.join(output, "config.json")):
+        return output
+    os.makedirs(output, exist_ok=True)
+
+    chars = list(string.ascii_lowercase + "çğıöşü" + string.digits + ".,+#/-@()")
+    vocab = SPECIAL_TOKENS + chars + [f"##{c}" for c in chars] + sorted(set(WORDS))
+    tokenizer = BertTokenizer(vocab={token: i for i, token in enumerate(vocab)}, do_lower_case=True)
+    tokenizer.save_pretrained(output)
+
+    config = BertConfig(vocab_size=len(vocab), max_position_embeddings=512, **SIZES[size])
+    BertModel(config).eval().save_pretrained(output)
+    return output
+
+
+def use_stub_model(engine, size: str = "base", output: str = None) -> str:
+    """NLPEngine'i stub modele yönlendir (model henüz yüklenmemiş olmalı)"""
+    engine.model_name = build_stub_model(size, output)
+    engine.model_revision = None
+    return engine.model_name
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", choices=sorted(SIZES), default="base")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    print(build_stub_model(args.size, args.output))
+
+
+if __name__ == "__main__":
+    main()
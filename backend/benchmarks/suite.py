@@ -0,0 +1,242 @@
+"""Mikro benchmark paketi: eşleştirme (CVJobMatcher / EmbeddingIndex), yetenek çıkarma, PDF parse, embedding
+
+Veriler `benchmarks.synthetic` ile deterministik üretilir; embedding ölçümleri varsayılan olarak
+ağ gerektirmeyen stub modelle yapılır. Sonuçlar commit bilgisiyle birlikte JSON olarak yazılır ve
+iki sonuç dosyası karşılaştırılarak gerilemeler yakalanır (eşik aşılırsa çıkış kodu 1).
+
+Kullanım:
+    python -m benchmarks.suite --output sonuc.json [--quick] [--only matcher skills pdf embedding]
+    python -m benchmarks.suite --model /yerel/model/dizini --only embedding
+    python -m benchmarks.suite --compare onceki.json sonraki.json [--threshold 0.10]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.synthetic import make_catalog, make_cv, make_pdf, make_skill_ids
+
+GROUPS = ("matcher", "skills", "pdf", "embedding")
+
+
+def measure(fn: Callable, repeat: int, warmup: int = 1) -> Dict:
+    """fn'i `repeat` kez çalıştırıp çağrı başına süre istatistiklerini (ms) döndür"""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    times = np.asarray(times)
+    median = float(np.median(times))
+    return {
+        'repeat': repeat,
+        'median_ms': round(median, 4),
+        'p95_ms': round(float(np.percentile(times, 95)), 4),
+        'min_ms': round(float(times.min()), 4),
+        'mean_ms': round(float(times.mean()), 4),
+        'ops_per_sec': round(1000 / median, 2) if median > 0 else None
+    }
+
+
+def bench_matcher(quick: bool) -> List[Dict]:
+    from app.services.matcher import matcher
+    from app.services.embedding_index import EmbeddingIndex
+
+    results = []
+    dim, k = 768, 20
+    for n_jobs in ((1000, 10000) if quick else (1000, 10000, 100000)):
+        catalog = make_catalog(n_jobs + 1, dim, n_topics=max(16, n_jobs // 500))
+        query, catalog = catalog[0], catalog[1:]
+        skills = make_skill_ids(n_jobs, n_skills=2000, per_item=15)
+        normalized = matcher.normalize_rows(catalog)
+        skill_scores = np.random.default_rng(0).random(n_jobs, dtype=np.float32)
+        repeat = 20 if n_jobs >= 100000 else 50
+
+        params = {'jobs': n_jobs, 'dim': dim}
+        results.append(dict(name="matcher.score_batch", params=params, **measure(
+            lambda: matcher.score_batch(query, normalized, skill_scores, normalized=True), repeat)))
+        results.append(dict(name="matcher.match_top_k", params={**params, 'k': k}, **measure(
+            lambda: matcher.match_top_k(query, normalized, skill_scores, top_k=k, normalized=True), repeat)))
+
+        index = EmbeddingIndex()
+        index.build([(i, catalog[i], skills[i]) for i in range(n_jobs)])
+        query_skills = skills[0]
+        results.append(dict(name="index.search", params={**params, 'k': k}, **measure(
+            lambda: index.search(query, query_skills, k), repeat)))
+    return results
+
+
+def bench_skills(quick: bool) -> List[Dict]:
+    from app.services.nlp_engine import nlp_engine
+
+    results = []
+    rng = random.Random(0)
+    for pages in ((1, 5) if quick else (1, 5, 20)):
+        text = make_cv(pages, rng)
+        results.append(dict(name="skills.extract", params={'pages': pages, 'chars': len(text)}, **measure(
+            lambda: nlp_engine.extract_skills(text), 50)))
+    return results
+
+
+def bench_pdf(quick: bool) -> List[Dict]:
+    from app.services.cv_parser import cv_parser
+
+    results = []
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in ((1, 10) if quick else (1, 10, 50)):
+            path = os.path.join(tmp, f"cv_{pages}.pdf")
+            with open(path, "wb") as f:
+                f.write(make_pdf(pages, rng))
+            stats = measure(lambda: cv_parser.parse_cv(path), 5 if pages >= 50 else 20)
+            stats['pages_per_sec'] = round(pages * 1000 / stats['median_ms'], 2)
+            results.append(dict(name="pdf.parse_cv", params={'pages': pages, 'bytes': os.path.getsize(path)}, **stats))
+    return results
+
+
+def bench_embedding(quick: bool) -> List[Dict]:
+    from app.services.nlp_engine import nlp_engine
+
+    nlp_engine.load_model()
+    results = []
+    rng = random.Random(0)
+    for pages in ((0.25, 1) if quick else (0.25, 1, 5)):
+        text = make_cv(1, rng, chars_per_page=int(3000 * pages))
+        n_tokens = min(len(nlp_engine.tokenizer(text)['input_ids']), 512)
+        results.append(dict(name="embedding.get_embedding", params={'tokens': n_tokens}, **measure(
+            lambda: nlp_engine.get_embedding(text), 3 if quick else 10)))
+
+    batch = [make_cv(1, rng, chars_per_page=rng.randint(1500, 3000)) for _ in range(8 if quick else 32)]
+    stats = measure(lambda: nlp_engine.get_embeddings(batch, batch_size=32, use_cache=False), 1 if quick else 3)
+    stats['texts_per_sec'] = round(len(batch) * 1000 / stats['median_ms'], 2)
+    results.append(dict(name="embedding.get_embeddings", params={'texts': len(batch)}, **stats))
+
+    text = make_cv(5, rng)
+    results.append(dict(name="embedding.document", params={'pages': 5}, **measure(
+        lambda: nlp_engine.get_document_embedding(text, use_cache=False), 1 if quick else 3)))
+    return results
+
+
+BENCHMARKS = {
+    "matcher": bench_matcher,
+    "skills": bench_skills,
+    "pdf": bench_pdf,
+    "embedding": bench_embedding,
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(groups, quick: bool, model: str, stub_size: str) -> Dict:
+    from app.config import settings
+
+    # Önbellekler kapalı: her çağrı gerçek çıkarım yapar (modüller bundan sonra import edilir)
+    settings.EMBEDDING_CACHE_DIR = ""
+    settings.EMBEDDING_CACHE_MEMORY_SIZE = 0
+    from app.services.nlp_engine import nlp_engine
+    import torch
+
+    if model == "stub":
+        from benchmarks.stub_model import use_stub_model
+        use_stub_model(nlp_engine, stub_size)
+        model = f"stub-{stub_size}"
+    else:
+        nlp_engine.model_name = model
+
+    results = []
+    for group in groups:
+        start = time.perf_counter()
+        results.extend(BENCHMARKS[group](quick))
+        print(f"{group}: {time.perf_counter() - start:.1f} sn", file=sys.stderr)
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'torch': torch.__version__,
+            'torch_threads': torch.get_num_threads(),
+            'model': model,
+            'backend': nlp_engine.backend,
+            'quick': quick
+        },
+        'results': results
+    }
+
+
+def result_key(result: Dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result['params'].items()))
+    return f"{result['name']}[{params}]"
+
+
+def compare(before_path: str, after_path: str, threshold: float) -> int:
+    """İki sonuç dosyasının medyan sürelerini karşılaştır; eşiği aşan yavaşlama sayısını döndür"""
+    with open(before_path) as f:
+        before = {result_key(r): r for r in json.load(f)['results']}
+    with open(after_path) as f:
+        after = {result_key(r): r for r in json.load(f)['results']}
+
+    regressions = 0
+    print(f"{'benchmark':<60} {'önce':>11} {'sonra':>11} {'oran':>7}")
+    for key, new in after.items():
+        old = before.get(key)
+        if old is None:
+            print(f"{key:<60} {'-':>11} {new['median_ms']:>8.3f} ms {'yeni':>7}")
+            continue
+        ratio = new['median_ms'] / old['median_ms'] if old['median_ms'] > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  YAVAŞLAMA"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  hızlanma"
+        print(f"{key:<60} {old['median_ms']:>8.3f} ms {new['median_ms']:>8.3f} ms {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--quick", action="store_true", help="Küçük boyutlar ve az tekrar (CI için)")
+    parser.add_argument("--model", default="stub", help="'stub' (ağsız, rastgele ağırlık) ya da model adı/yerel dizin")
+    parser.add_argument("--stub-size", choices=["base", "tiny"], default="base")
+    parser.add_argument("--output", default=None, help="JSON sonuç dosyası (varsayılan: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("ONCE", "SONRA"), help="İki sonuç dosyasını karşılaştır")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Gerileme sayılacak göreli yavaşlama")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        raise SystemExit(1 if regressions else 0)
+
+    report = run(args.only, args.quick, args.model, args.stub_size)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Sonuçlar yazıldı: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
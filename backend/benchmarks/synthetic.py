@@ -0,0 +1,92 @@
+"""Benchmark'lar için sentetik veri üreticileri (iş kataloğu, CV metni, çok sayfalı PDF, yetenek sözlüğü)
+
+Tüm üreticiler verilen tohumla/`random.Random` ile deterministiktir; aynı parametreler farklı
+commit'lerde aynı veriyi üretir.
+"""
+import random
+import string
+from typing import List, Sequence
+
+import numpy as np
+
+SECTIONS = ["Özet", "Deneyim", "Projeler", "Yetenekler", "Eğitim", "Sertifikalar"]
+WORDS = [
+    "python", "java", "sql", "docker", "kubernetes", "react", "proje", "ekip", "geliştirme",
+    "mimari", "performans", "müşteri", "sistem", "tasarım", "analiz", "yönetim", "ve", "ile",
+    "kullanarak", "sorumlu", "oldum", "yıl", "deneyim", "servis", "veri", "test"
+]
+FILLER = ["deneyim", "proje", "ekip", "geliştirme", "sistem", "ve", "ile", "kullanarak", "yıl"]
+
+
+def make_catalog(n: int, dim: int, n_topics: int, seed: int = 0) -> np.ndarray:
+    """Konu kümeleri etrafında gürültülü sentetik iş embedding'leri üret"""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim)).astype(np.float32)
+    labels = rng.integers(0, n_topics, size=n)
+    return topics[labels] + 0.8 * rng.normal(size=(n, dim)).astype(np.float32)
+
+
+def make_skill_ids(n: int, n_skills: int, per_item: int, seed: int = 0) -> List[List[int]]:
+    """Her kayıt için 1..per_item adet rastgele Skill.id listesi"""
+    rng = np.random.default_rng(seed)
+    return [rng.choice(n_skills, size=rng.integers(1, per_item + 1), replace=False).tolist() for _ in range(n)]
+
+
+def make_cv(pages: int, rng: random.Random, chars_per_page: int = 3000) -> str:
+    """Bölüm başlıkları içeren sentetik, çok sayfalı bir CV metni üret"""
+    parts = []
+    size = 0
+    target = pages * chars_per_page
+    while size < target:
+        header = rng.choice(SECTIONS)
+        body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+        parts.append(f"{header}\n{body}\n")
+        size += len(header) + len(body) + 2
+    return "".join(parts)
+
+
+def make_pdf(pages: int, rng: random.Random, lines_per_page: int = 45) -> bytes:
+    """Her sayfası bölüm başlıkları ve metin satırları içeren çok sayfalı bir CV PDF'i üret"""
+    import fitz
+
+    doc = fitz.open()
+    try:
+        for page_no in range(pages):
+            page = doc.new_page()
+            lines = []
+            if page_no == 0:
+                lines += ["Ad Soyad", "ornek@mail.com", "+90 555 123 45 67"]
+            while len(lines) < lines_per_page:
+                if rng.random() < 0.1:
+                    lines.append(rng.choice(SECTIONS).upper())
+                else:
+                    lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))))
+            page.insert_text((50, 50), "\n".join(lines), fontsize=9)
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+
+def make_dictionary(base_keywords: Sequence[str], n_terms: int, rng: random.Random) -> List[str]:
+    """Gerçek sözlüğü sentetik terimler ve çok kelimeli eş anlamlılarla n_terms boyutuna tamamla"""
+    terms = list(base_keywords)
+    seen = set(terms)
+    while len(terms) < n_terms:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+        if rng.random() < 0.2:
+            word += rng.choice([' framework', ' api', '.js', ' cloud', '++'])
+        if word not in seen:
+            seen.add(word)
+            terms.append(word)
+    return terms
+
+
+def make_text(terms: Sequence[str], n_chars: int, rng: random.Random) -> str:
+    """İçinde sözlükten terimler geçen rastgele bir CV metni üret"""
+    words = []
+    size = 0
+    while size < n_chars:
+        word = rng.choice(terms) if rng.random() < 0.1 else rng.choice(FILLER)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+# Testler geçici bir SQLite veritabanı kullanır; ayarlar app import edilmeden önce verilmeli
+_tmp = tempfile.mkdtemp(prefix="cvjm-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp, 'test.db')}")
+os.environ.setdefault("EMBEDDING_CACHE_DIR", "")
+os.environ.setdefault("MODEL_PRELOAD", "false")
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Verilen rolde kullanıcı oluşturup (kullanıcı, yetki başlıkları) döndüren fabrika"""
+    import uuid
+    from app.models.user import User, UserRole
+    from app.utils.auth import create_access_token
+
+    def make(role=UserRole.CANDIDATE):
+        user = User(email=f"{uuid.uuid4().hex}@test.com", password_hash="-", role=role)
+        db.add(user)
+        db.commit()
+        token = create_access_token(data={"sub": str(user.id)})
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return make
@@ -0,0 +1,71 @@
+import numpy as np
+
+from app.services.ann_index import IVFIndex
+from app.services.embedding_index import EmbeddingIndex
+from benchmarks.synthetic import make_catalog
+
+N_ITEMS = 20000
+N_QUERIES = 50
+DIM = 64
+K = 10
+N_TOPICS = 1000  # Çok sayıda küçük küme: komşuların bir kısmı IVF küme sınırlarının ötesine düşer
+RECALL_TARGET = 0.95
+
+
+def _indexes():
+    vectors = make_catalog(N_ITEMS + N_QUERIES, DIM, n_topics=N_TOPICS)
+    queries, catalog = vectors[:N_QUERIES], vectors[N_QUERIES:]
+    items = [(i, catalog[i], []) for i in range(N_ITEMS)]
+    exact = EmbeddingIndex()
+    exact.build(items)
+    approx = EmbeddingIndex(ann=IVFIndex(nprobe=16), ann_min_size=1)
+    approx.build(items)
+    approx.wait_for_ann()
+    return exact, approx, queries, catalog
+
+
+def _recall(exact, approx, queries) -> float:
+    hits = 0
+    for query in queries:
+        expected = set(exact.search(query, [], K)[0].tolist())
+        hits += len(expected.intersection(approx.search(query, [], K)[0].tolist()))
+    return hits / (K * len(queries))
+
+
+def test_recall_at_k_against_brute_force():
+    exact, approx, queries, _ = _indexes()
+    assert approx.ann.is_trained
+    assert _recall(exact, approx, queries) >= RECALL_TARGET
+
+
+def test_incremental_insert_and_delete():
+    exact, approx, queries, catalog = _indexes()
+    for item_id in range(0, N_ITEMS, 7):
+        exact.remove(item_id)
+        approx.remove(item_id)
+    new_items = [(N_ITEMS + i, query * 1.0, []) for i, query in enumerate(queries)]
+    exact.add_many(new_items)
+    approx.add_many(new_items)
+
+    assert _recall(exact, approx, queries) >= RECALL_TARGET
+    for i, query in enumerate(queries):
+        ids = approx.search(query, [], K)[0].tolist()
+        assert ids[0] == N_ITEMS + i
+        assert not any(item_id % 7 == 0 for item_id in ids if item_id < N_ITEMS)
+
+
+def test_training_does_not_block_and_replays_changes():
+    vectors = make_catalog(N_ITEMS, DIM, n_topics=N_TOPICS)
+    index = EmbeddingIndex(ann=IVFIndex(nprobe=16), ann_min_size=1)
+    index.build([(i, vectors[i], []) for i in range(N_ITEMS - 100)])
+
+    # Eğitim sürerken yapılan değişiklikler yeni IVF indeksine aktarılmalı
+    index.add_many([(i, vectors[i], []) for i in range(N_ITEMS - 100, N_ITEMS)])
+    index.remove(0)
+    index.wait_for_ann()
+
+    assert index.ann.is_trained
+    assert len(index.ann) == N_ITEMS - 1
+    found = index.search(vectors[N_ITEMS - 1], [], K)[0].tolist()
+    assert found[0] == N_ITEMS - 1
+    assert 0 not in index.search(vectors[0], [], K)[0].tolist()
@@ -0,0 +1,93 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.models.cv import CV
+from app.models.user import UserRole
+from app.services.cv_import import CVImporter
+from app.services.embedding_index import cv_index, cv_index_sync
+from app.services.nlp_engine import nlp_engine
+from app.services.skill_dictionary import skill_dictionary
+from benchmarks.synthetic import make_pdf
+
+DIM = 32
+
+
+@pytest.fixture
+def source(tmp_path):
+    rng = random.Random(0)
+    folder = tmp_path / "kaynak"
+    folder.mkdir()
+    for i in range(5):
+        (folder / f"cv_{i}.pdf").write_bytes(make_pdf(1, rng))
+    return str(folder)
+
+
+@pytest.fixture(autouse=True)
+def fake_embeddings(monkeypatch):
+    def embed_texts(texts, batch_size=32):
+        return np.random.default_rng(len(texts)).normal(size=(len(texts), DIM)).astype(np.float32)
+
+    monkeypatch.setattr(nlp_engine, "embed_texts", embed_texts)
+
+
+def test_failed_batch_removes_copied_files(client, db, make_user, source, tmp_path, monkeypatch):
+    user, _ = make_user(UserRole.ADMIN)
+    upload_dir = tmp_path / "uploads"
+    checkpoint = tmp_path / "checkpoint.txt"
+
+    def broken(db, cvs):
+        raise RuntimeError("yazma hatası")
+
+    monkeypatch.setattr(skill_dictionary, "add_cvs_skills", broken)
+    importer = CVImporter(upload_dir=str(upload_dir), workers=1, batch_size=2)
+    with pytest.raises(RuntimeError):
+        importer.run(db, source, user.id, checkpoint=str(checkpoint))
+
+    assert os.listdir(upload_dir) == []
+    assert not checkpoint.exists()
+
+
+def test_import_reaches_cv_index_via_refresh(client, db, make_user, source, tmp_path, monkeypatch):
+    user, _ = make_user(UserRole.ADMIN)
+    upload_dir = tmp_path / "uploads"
+    cv_index_sync.load(db)
+    before = set(cv_index.ids())
+
+    report = CVImporter(upload_dir=str(upload_dir), workers=1, batch_size=2).run(db, source, user.id)
+
+    assert (report.imported, report.failed) == (5, 0)
+    assert len(os.listdir(upload_dir)) == 5
+    # İçe aktarma bellek içi indekse dokunmaz; CV'ler yenilemeyle gelir
+    assert set(cv_index.ids()) == before
+    monkeypatch.setattr(settings, "INDEX_REFRESH_INTERVAL", 0.0)
+    assert cv_index_sync.refresh(db)
+    assert len(set(cv_index.ids()) - before) == 5
+
+
+def test_resume_after_crash_before_checkpoint_does_not_duplicate(client, db, make_user, source, tmp_path, monkeypatch):
+    user, _ = make_user(UserRole.ADMIN)
+    upload_dir = tmp_path / "uploads"
+    checkpoint = tmp_path / "checkpoint.txt"
+    importer = CVImporter(upload_dir=str(upload_dir), workers=1, batch_size=2)
+
+    original_write = CVImporter.__dict__["_write_checkpoint"]
+
+    # İlk batch commit edildikten sonra, kontrol noktası yazılmadan süreç "çöker"
+    def crash(checkpoint, keys):
+        raise RuntimeError("çökme")
+
+    monkeypatch.setattr(CVImporter, "_write_checkpoint", staticmethod(crash))
+    with pytest.raises(RuntimeError):
+        importer.run(db, source, user.id, checkpoint=str(checkpoint))
+    monkeypatch.setattr(CVImporter, "_write_checkpoint", original_write)
+
+    report = importer.run(db, source, user.id, checkpoint=str(checkpoint))
+
+    db.expire_all()
+    assert db.query(CV).filter(CV.user_id == user.id).count() == 5
+    assert (report.imported, report.skipped) == (3, 2)
+    assert len(os.listdir(upload_dir)) == 5
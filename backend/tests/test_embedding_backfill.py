@@ -0,0 +1,48 @@
+import numpy as np
+
+from app.config import settings
+from app.models.job import Job
+from app.services.embedding_backfill import EmbeddingBackfill
+from app.services.embedding_index import job_index, job_index_sync
+from app.services.nlp_engine import nlp_engine
+from app.utils.embedding import encode_embedding
+
+DIM = 32
+
+
+def test_backfill_reaches_index_via_refresh(client, db, monkeypatch):
+    rng = np.random.default_rng(7)
+    jobs = [
+        Job(
+            title=f"Eski ilan {i}", description="açıklama",
+            embedding=encode_embedding(rng.normal(size=DIM).astype(np.float32)), embedding_dim=DIM,
+            embedding_model="eski-model"
+        ) for i in range(3)
+    ]
+    db.add_all(jobs)
+    db.commit()
+    ids = [job.id for job in jobs]
+    new_vectors = {}
+
+    def embed_texts(texts, batch_size=32):
+        vectors = rng.normal(size=(len(texts), DIM)).astype(np.float32)
+        new_vectors.update(zip((text.split()[2] for text in texts), vectors))
+        return vectors
+
+    monkeypatch.setattr(nlp_engine, "embed_texts", embed_texts)
+    # Eski kayıtların yer tutucu vektörü için model yüklenmesin
+    monkeypatch.setattr(nlp_engine, "embedding_dim", lambda: DIM)
+    job_index_sync.load(db)
+
+    report = EmbeddingBackfill(batch_size=2).run(db, "job")
+    assert report.updated == 3
+    # Backfill bellek içi indekse dokunmaz; vektörler yenilemeyle gelir
+    _, _, similarities, _ = job_index.score_ids(new_vectors["0"], [], [ids[0]])
+    assert similarities[0] < 0.999
+
+    monkeypatch.setattr(settings, "INDEX_REFRESH_INTERVAL", 0.0)
+    assert job_index_sync.refresh(db)
+    for i, job_id in enumerate(ids):
+        # Eski modelin sıfır vektörü yerine yeni vektör indekslenmiş olmalı
+        _, _, similarities, _ = job_index.score_ids(new_vectors[str(i)], [], [job_id])
+        assert similarities[0] > 0.999
@@ -0,0 +1,57 @@
+import multiprocessing
+
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache
+
+DIM = 16
+KEYS_PER_WRITER = 200
+
+
+def _vector(key: str) -> np.ndarray:
+    return np.random.default_rng(int(key[:8], 16)).normal(size=DIM).astype(np.float32)
+
+
+def _key(writer: int, i: int) -> str:
+    return EmbeddingCache.make_key("model", f"metin {writer} {i}", 512)
+
+
+def _write(cache_dir: str, writer: int):
+    cache = EmbeddingCache(cache_dir=cache_dir, memory_size=0)
+    for i in range(KEYS_PER_WRITER):
+        key = _key(writer, i)
+        cache.put(key, _vector(key))
+        # Diğer yazarın satırları da doğru okunmalı
+        other = _key(1 - writer, i)
+        vector = cache.get(other)
+        assert vector is None or np.array_equal(vector, _vector(other))
+
+
+def test_disk_tier_shared_by_concurrent_processes(tmp_path):
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    writers = [context.Process(target=_write, args=(str(tmp_path), w)) for w in (0, 1)]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join()
+        assert process.exitcode == 0
+
+    cache = EmbeddingCache(cache_dir=str(tmp_path), memory_size=0)
+    for writer in (0, 1):
+        for i in range(KEYS_PER_WRITER):
+            key = _key(writer, i)
+            assert np.array_equal(cache.get(key), _vector(key))
+    assert cache.stats()['disk_entries'] == 2 * KEYS_PER_WRITER
+
+
+def test_reader_sees_rows_written_by_another_instance(tmp_path):
+    reader = EmbeddingCache(cache_dir=str(tmp_path), memory_size=0)
+    writer = EmbeddingCache(cache_dir=str(tmp_path), memory_size=0)
+    key = _key(0, 0)
+    assert reader.get(key) is None
+    writer.put(key, _vector(key))
+    assert np.array_equal(reader.get(key), _vector(key))
+    # Aynı anahtar ikinci kez yazılmaz
+    reader.put(key, _vector(key))
+    assert reader.stats()['disk_entries'] == 1
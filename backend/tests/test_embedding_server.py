@@ -0,0 +1,42 @@
+import os
+import stat
+import threading
+import time
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from app.services.embedding_pool import EmbeddingClient, EmbeddingWorkerPool
+
+
+@pytest.fixture
+def server(tmp_path):
+    address = str(tmp_path / "embed.sock")
+    pool = EmbeddingWorkerPool(workers=1)
+    threading.Thread(target=pool.serve, args=(address, b"dogru-anahtar"), daemon=True).start()
+    for _ in range(100):
+        if os.path.exists(address):
+            break
+        time.sleep(0.02)
+    return address
+
+
+def test_socket_is_owner_only(server):
+    assert stat.S_IMODE(os.stat(server).st_mode) == 0o600
+
+
+def test_wrong_authkey_is_rejected(server):
+    with pytest.raises(AuthenticationError):
+        EmbeddingClient(server, authkey=b"yanlis-anahtar").call("_compute_embeddings", [])
+
+
+def test_right_authkey_reaches_the_pool(server):
+    client = EmbeddingClient(server, authkey=b"dogru-anahtar")
+    # Bağlantı doğrulandı; desteklenmeyen metot sunucunun kendi hatasıyla döner
+    with pytest.raises(RuntimeError, match="Desteklenmeyen metot"):
+        client.call("load_model")
+    # Reddedilen bağlantıdan sonra sunucu yeni bağlantı kabul etmeye devam eder
+    with pytest.raises(AuthenticationError):
+        EmbeddingClient(server, authkey=b"yanlis-anahtar").call("load_model")
+    with pytest.raises(RuntimeError, match="Desteklenmeyen metot"):
+        EmbeddingClient(server, authkey=b"dogru-anahtar").call("load_model")
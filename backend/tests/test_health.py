@@ -0,0 +1,83 @@
+import random
+import threading
+import time
+
+import numpy as np
+
+from app.models.cv import CV, CVStatus
+from app.routers import cv as cv_router
+from app.services.nlp_engine import nlp_engine
+from benchmarks.synthetic import make_pdf
+
+DIM = 32
+UPLOAD_THREADS = 4
+PDF_PAGES = 5
+STUB_EMBED_SECONDS = 0.05
+# Yük altındaki /health p95'i boştaki p95'in en fazla bu katı olabilir; boştaki p95
+# milisaniyenin altında kalabildiğinden taban olarak en az HEALTH_BASELINE_FLOOR_MS alınır.
+# Tek çekirdekte ölçülen: yüklemeler thread/süreç havuzlarında ~25 ms, event loop'ta
+# yapılırsa ~400 ms.
+HEALTH_P95_MULTIPLE = 10
+HEALTH_BASELINE_FLOOR_MS = 5
+
+
+def _health_p95_ms(client, n: int = 60) -> float:
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        assert client.get("/health").status_code == 200
+        times.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.005)
+    return float(np.percentile(times, 95))
+
+
+def test_health_latency_stays_bounded_during_uploads(client, db, make_user, monkeypatch, tmp_path):
+    def stub_embedding(text):
+        # Model yerine: çıkarım süresi kadar bekleyip deterministik bir vektör döndür
+        time.sleep(STUB_EMBED_SECONDS)
+        return np.random.default_rng(len(text)).normal(size=DIM).astype(np.float32)
+
+    monkeypatch.setattr(nlp_engine, "get_embedding", stub_embedding)
+    monkeypatch.setattr(cv_router, "UPLOAD_DIR", str(tmp_path))
+    user, headers = make_user()
+    pdf = make_pdf(PDF_PAGES, random.Random(0))
+
+    baseline = _health_p95_ms(client)
+
+    # Yüklemeler gerçek uç noktadan geçer: dosya kaydı, parse süreçleri, embedding havuzu, kayıt
+    stop = threading.Event()
+    responses = []
+
+    def upload_loop():
+        while not stop.is_set():
+            response = client.post(
+                "/api/cv/upload", headers=headers, files={"file": ("cv.pdf", pdf, "application/pdf")}
+            )
+            responses.append(response.status_code)
+
+    uploaders = [threading.Thread(target=upload_loop) for _ in range(UPLOAD_THREADS)]
+    for thread in uploaders:
+        thread.start()
+    time.sleep(0.2)
+    try:
+        loaded = _health_p95_ms(client)
+    finally:
+        stop.set()
+        for thread in uploaders:
+            thread.join()
+
+    assert responses and set(responses) <= {202, 503}
+    assert 202 in responses
+
+    # Yüklemeler işleme hattının tamamından geçmiş olmalı
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        db.expire_all()
+        statuses = [s for (s,) in db.query(CV.status).filter(CV.user_id == user.id)]
+        if all(s in (CVStatus.READY, CVStatus.FAILED) for s in statuses):
+            break
+        time.sleep(0.1)
+    assert statuses and all(s == CVStatus.READY for s in statuses)
+
+    bound = HEALTH_P95_MULTIPLE * max(baseline, HEALTH_BASELINE_FLOOR_MS)
+    assert loaded <= bound, f"/health p95 {loaded:.1f} ms, sınır {bound:.1f} ms (boşta {baseline:.1f} ms)"
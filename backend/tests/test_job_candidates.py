@@ -0,0 +1,105 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.models.cv import CV, CVStatus
+from app.models.job import Job, CVSkill
+from app.models.user import UserRole
+from app.services.matcher import matcher
+from app.services.nlp_engine import nlp_engine
+from app.services.skill_dictionary import skill_dictionary
+from app.utils.embedding import encode_embedding
+
+
+@pytest.fixture
+def job_id(db):
+    job = Job(
+        title="Python geliştirici", description="açıklama",
+        embedding=encode_embedding(np.ones(32, dtype=np.float32)), embedding_dim=32,
+        embedding_model=nlp_engine.model_version
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_candidates_forbidden_for_candidates(client, make_user, job_id):
+    _, headers = make_user(UserRole.CANDIDATE)
+    response = client.get(f"/api/jobs/{job_id}/candidates", headers=headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("role", [UserRole.EMPLOYER, UserRole.ADMIN])
+def test_candidates_allowed_for_employers_and_admins(client, make_user, job_id, monkeypatch, role):
+    monkeypatch.setattr(settings, "INDEX_REFRESH_INTERVAL", 0)
+    _, headers = make_user(role)
+    response = client.get(f"/api/jobs/{job_id}/candidates", headers=headers)
+    assert response.status_code == 200
+    assert response.json()['job_id'] == job_id
+
+
+def test_candidates_ranking_matches_calculate_match_score(client, db, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "INDEX_REFRESH_INTERVAL", 0)
+    rng = np.random.default_rng(11)
+    prefix = uuid.uuid4().hex[:8]
+    job_skills = [f"{prefix}-beceri-{i}" for i in range(4)]
+
+    job_vector = rng.random(32).astype(np.float32)
+    job = Job(
+        title="Veri mühendisi", description="açıklama",
+        embedding=encode_embedding(job_vector), embedding_dim=32, embedding_model=nlp_engine.model_version
+    )
+    db.add(job)
+    db.flush()
+    skill_dictionary.add_job_skills(db, job.id, [{'name': name, 'confidence': 1.0} for name in job_skills])
+
+    owner, _ = make_user()
+    expected = {}
+
+    def add_cv(skill_count: int, status=CVStatus.READY):
+        vector = (job_vector + rng.random(32).astype(np.float32) * rng.uniform(0.2, 2.0)).astype(np.float32)
+        cv = CV(
+            user_id=owner.id, file_name="cv.pdf", raw_text="cv", status=status,
+            embedding=encode_embedding(vector), embedding_dim=32, embedding_model=nlp_engine.model_version
+        )
+        db.add(cv)
+        db.flush()
+        cv_skills = job_skills[:skill_count] + [f"{prefix}-diger-{cv.id}"]
+        skill_dictionary.add_cv_skills(db, cv.id, [{'name': name, 'confidence': 1.0} for name in cv_skills])
+        expected[cv.id] = matcher.calculate_match_score(vector, job_vector, cv_skills, job_skills)
+        return cv
+
+    ready = [add_cv(count) for count in (0, 1, 2, 3, 4)]
+    pending = add_cv(4, status=CVStatus.PENDING)
+    deleted = add_cv(4)
+    db.commit()
+
+    _, headers = make_user(UserRole.EMPLOYER)
+    url = f"/api/jobs/{job.id}/candidates"
+    # İlk istek indeksin silinecek CV'yi de yüklemesini sağlar
+    assert deleted.id in [c['cv_id'] for c in client.get(url, params={'k': 1000}, headers=headers).json()['candidates']]
+
+    db.query(CVSkill).filter(CVSkill.cv_id == deleted.id).delete()
+    db.delete(deleted)
+    db.commit()
+
+    response = client.get(url, params={'k': 1000}, headers=headers)
+    assert response.status_code == 200
+    candidates = response.json()['candidates']
+    returned_ids = [c['cv_id'] for c in candidates]
+    assert pending.id not in returned_ids
+    assert deleted.id not in returned_ids
+
+    # Başka testlerin CV'leri de indekste olabilir; yalnızca bu testin CV'leri karşılaştırılır
+    ours = [c for c in candidates if c['cv_id'] in expected]
+    ready_ids = {cv.id for cv in ready}
+    assert {c['cv_id'] for c in ours} == ready_ids
+    want = sorted(ready_ids, key=lambda cv_id: -expected[cv_id]['final_score'])
+    assert [c['cv_id'] for c in ours] == want
+    for candidate in ours:
+        score = expected[candidate['cv_id']]
+        assert candidate['final_score'] == pytest.approx(score['final_score'], abs=0.02)
+        assert candidate['embedding_similarity'] == pytest.approx(score['embedding_similarity'], abs=0.02)
+        assert candidate['skill_match'] == pytest.approx(score['skill_match'], abs=0.02)
@@ -0,0 +1,34 @@
+import numpy as np
+
+from app.config import settings
+from app.services.embedding_index import job_index, job_index_sync
+from app.services.job_ingest import JobIngestor
+from app.services.nlp_engine import nlp_engine
+
+DIM = 32
+
+
+def test_ingest_uses_embed_texts_and_reaches_index_via_refresh(client, db, monkeypatch):
+    calls = []
+
+    def fake_embed_texts(texts, batch_size=32):
+        calls.append(len(texts))
+        return np.random.default_rng(len(texts)).normal(size=(len(texts), DIM)).astype(np.float32)
+
+    monkeypatch.setattr(nlp_engine, "embed_texts", fake_embed_texts)
+    records = [
+        {"title": f"Python geliştirici {i}", "description": "Django ve SQL deneyimi"} for i in range(3)
+    ] + [{"title": "Eksik açıklama"}]
+
+    job_index_sync.load(db)
+    before = set(job_index.ids())
+    report = JobIngestor(chunk_size=2).ingest(db, records)
+
+    assert calls == [2, 1]
+    assert (report.inserted, report.invalid) == (3, 1)
+    # İçe aktarma bellek içi indekse dokunmaz; ilanlar yenilemeyle gelir
+    assert set(job_index.ids()) == before
+
+    monkeypatch.setattr(settings, "INDEX_REFRESH_INTERVAL", 0.0)
+    assert job_index_sync.refresh(db)
+    assert len(set(job_index.ids()) - before) == 3
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import engine
+from app.models.cv import CV, CVStatus
+from app.models.job import Job
+from app.routers import job as job_router
+from app.services.match_store import match_store
+from app.services.nlp_engine import nlp_engine
+from app.utils.embedding import encode_embedding
+
+DIM = 32
+N_JOBS = 30
+
+
+@pytest.fixture
+def seeded(client, db, make_user, monkeypatch):
+    """Sahibiyle birlikte READY bir CV ve N_JOBS ilan; indeks ilk istekte yenilenir"""
+    monkeypatch.setattr(settings, "INDEX_REFRESH_INTERVAL", 0)
+    rng = np.random.default_rng(3)
+    user, headers = make_user()
+    cv = CV(
+        user_id=user.id, file_name="cv.pdf", raw_text="cv", status=CVStatus.READY,
+        embedding=encode_embedding(rng.normal(size=DIM).astype(np.float32)), embedding_dim=DIM,
+        embedding_model=nlp_engine.model_version
+    )
+    db.add(cv)
+    db.add_all([Job(
+        title=f"İlan {i}", description="açıklama",
+        embedding=encode_embedding(rng.normal(size=DIM).astype(np.float32)), embedding_dim=DIM,
+        embedding_model=nlp_engine.model_version
+    ) for i in range(N_JOBS)])
+    db.commit()
+    return cv.id, headers
+
+
+def test_match_builds_rows_only_for_persisted_results(client, seeded, monkeypatch):
+    cv_id, headers = seeded
+    monkeypatch.setattr(settings, "MATCH_PERSIST_TOP_K", 5)
+    saved = []
+    original = match_store.save
+
+    def spy(db, cv_id, results, top_k=0):
+        saved.append(len(results))
+        return original(db, cv_id, results, top_k)
+
+    monkeypatch.setattr(match_store, "save", spy)
+    response = client.post(f"/api/jobs/{cv_id}/match", headers=headers)
+    assert response.status_code == 200
+    # top_k verilmediğinde yanıt tüm ilanları içerir, saklanan satırlar yalnızca ilk k'dır
+    assert len(response.json()['matches']) >= N_JOBS
+    assert saved == [5]
+
+
+def test_match_results_load_jobs_in_bounded_chunks(client, seeded, monkeypatch):
+    cv_id, headers = seeded
+    monkeypatch.setattr(job_router, "JOB_LOAD_CHUNK", 7)
+    monkeypatch.setattr(settings, "MATCH_PERSIST_TOP_K", 7)
+    in_lists = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM jobs" in statement and "jobs.id IN" in statement:
+            in_lists.append(len(parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.post(f"/api/jobs/{cv_id}/match", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == 200
+    matches = response.json()['matches']
+    assert len(matches) >= N_JOBS
+    scores = [match['final_score'] for match in matches]
+    assert scores == sorted(scores, reverse=True)
+    # Yanıttaki ilanlar en fazla 7 id'lik parçalarla okunur (sınırsız tek bir IN listesi yok)
+    assert max(in_lists) <= 7
+    assert len(in_lists) >= -(-len(matches) // 7)
@@ -0,0 +1,78 @@
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import engine
+from app.models.cv import CV, CVStatus
+from app.models.job import Job
+from app.services.nlp_engine import nlp_engine
+from app.services.skill_dictionary import skill_dictionary
+from app.utils.embedding import encode_embedding
+
+DIM = 32
+
+
+@contextmanager
+def count_queries():
+    """Blok içinde veritabanına gönderilen SQL ifadelerini topla"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _vector(rng) -> bytes:
+    return encode_embedding(rng.normal(size=DIM).astype(np.float32))
+
+
+def _seed(db, user, n: int):
+    """n yetenekli bir CV ve her biri n yetenekli n ilan oluştur"""
+    rng = np.random.default_rng(n)
+    prefix = uuid.uuid4().hex[:8]
+    skills = [{'name': f"{prefix}-yetenek-{i}", 'confidence': 1.0} for i in range(n)]
+
+    cv = CV(
+        user_id=user.id, file_name="cv.pdf", raw_text="cv", status=CVStatus.READY,
+        embedding=_vector(rng), embedding_dim=DIM, embedding_model=nlp_engine.model_version
+    )
+    db.add(cv)
+    db.flush()
+    skill_dictionary.add_cv_skills(db, cv.id, skills)
+
+    jobs = [Job(
+        title=f"İlan {i}", description="açıklama",
+        embedding=_vector(rng), embedding_dim=DIM, embedding_model=nlp_engine.model_version
+    ) for i in range(n)]
+    db.add_all(jobs)
+    db.flush()
+    skill_dictionary.add_jobs_skills(db, [(job.id, skills) for job in jobs])
+    db.commit()
+    return cv.id, jobs[0].id
+
+
+@pytest.mark.parametrize("path", ["/api/cv/{cv_id}/skills", "/api/jobs/{job_id}/skills", "/api/jobs/{cv_id}/match"])
+def test_skill_loading_uses_constant_number_of_queries(client, db, make_user, monkeypatch, path):
+    monkeypatch.setattr(settings, "INDEX_REFRESH_INTERVAL", 0)
+    counts = []
+    for n in (3, 30):
+        user, headers = make_user()
+        cv_id, job_id = _seed(db, user, n)
+        url = path.format(cv_id=cv_id, job_id=job_id)
+        method = client.post if path.endswith("/match") else client.get
+        # İlk istek indeksin yeni kayıtları almasını sağlar; sayılan ikinci istektir
+        assert method(url, headers=headers).status_code == 200
+        with count_queries() as statements:
+            response = method(url, headers=headers)
+        assert response.status_code == 200
+        counts.append(len(statements))
+    assert counts[0] == counts[1], f"{path}: {counts}"